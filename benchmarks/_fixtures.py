@@ -0,0 +1,23 @@
+"""
+基准测试共用的测试数据 (tests/fixtures 下的接口响应)
+"""
+import json
+from pathlib import Path
+
+FIXTURE_PATH = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def fixture_bytes(name: str) -> bytes:
+    """
+    原始响应体
+    :param name: 文件名 (不含 .json)，如 users_123
+    """
+    return (FIXTURE_PATH / f"{name}.json").read_bytes()
+
+
+def load_fixture(name: str):
+    """
+    解析后的响应
+    :param name: 文件名 (不含 .json)，如 users_123
+    """
+    return json.loads(fixture_bytes(name), strict=False)
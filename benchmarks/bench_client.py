@@ -0,0 +1,50 @@
+#! /usr/bin/env python3
+"""
+比较客户端构造开销 (登录请求由 requests_mock 模拟，不访问网络)
+
+    python benchmarks/bench_client.py [runs]   # 默认 500 次
+"""
+import sys
+import timeit
+from pathlib import Path
+
+import requests_mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _fixtures import load_fixture  # noqa: E402
+
+from zq_auth_sdk.client import ZqAuthClient  # noqa: E402
+
+
+def bench(name, func, number):
+    elapsed = timeit.timeit(func, number=number)
+    print(f"{name:<32}{elapsed / number * 1e6:>14.2f}")
+
+
+def construct(bind_api=False, **kwargs):
+    # 关闭客户端，避免 HTTPPool 的 session 在多次运行间累积
+    client = ZqAuthClient("123", "123", **kwargs)
+    if bind_api:
+        client.app
+    client.close()
+
+
+def main(number=500):
+    print(f"{'case':<32}{'per call (us)':>14}")
+    with requests_mock.Mocker() as mocker:
+        mocker.post(
+            f"{ZqAuthClient.API_BASE_URL}/auth/apps/",
+            json=load_fixture("auth_apps"),
+        )
+        bench("construct (login)", construct, number)
+        bench("construct (lazy=True)", lambda: construct(lazy=True), number)
+        bench(
+            "construct + bind api (lazy)",
+            lambda: construct(bind_api=True, lazy=True),
+            number,
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
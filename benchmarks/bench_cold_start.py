@@ -0,0 +1,80 @@
+#! /usr/bin/env python3
+"""
+冷启动耗时: 每次在新的解释器中依次测量
+import zq_auth_sdk、导入客户端、构造客户端 (lazy) 与首次认证请求 (含登录)。
+HTTP 请求由 requests_mock 模拟，不访问网络。
+
+    python benchmarks/bench_cold_start.py [runs]
+"""
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).parent.parent
+
+_PHASES = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {benchmarks!r})
+timings = {{}}
+
+t = time.perf_counter()
+import zq_auth_sdk
+timings["import zq_auth_sdk"] = time.perf_counter() - t
+
+t = time.perf_counter()
+from zq_auth_sdk import ZqAuthClient
+timings["import ZqAuthClient"] = time.perf_counter() - t
+
+import requests_mock
+from _fixtures import load_fixture
+
+with requests_mock.Mocker() as mocker:
+    base = ZqAuthClient.API_BASE_URL
+    mocker.post(base + "/auth/apps/", json=load_fixture("auth_apps"))
+    mocker.get(base + "/apps/9/", json=load_fixture("apps_9"))
+
+    t = time.perf_counter()
+    client = ZqAuthClient("123", "123", lazy=True)
+    timings["construct client"] = time.perf_counter() - t
+
+    t = time.perf_counter()
+    client.app.app_info()
+    timings["first authenticated call"] = time.perf_counter() - t
+
+print(json.dumps(timings))
+"""
+
+
+def run_once() -> dict[str, float]:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            _PHASES.format(
+                root=str(_ROOT), benchmarks=str(_ROOT / "benchmarks")
+            ),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=_ROOT,
+    ).stdout
+    return json.loads(output)
+
+
+def main(runs=10):
+    results = [run_once() for _ in range(runs)]
+    print(f"{'phase':<28}{'median (ms)':>14}{'min (ms)':>12}")
+    for phase in results[0]:
+        values = [result[phase] for result in results]
+        print(
+            f"{phase:<28}{statistics.median(values) * 1e3:>14.2f}"
+            f"{min(values) * 1e3:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
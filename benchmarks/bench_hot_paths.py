@@ -0,0 +1,242 @@
+#! /usr/bin/env python3
+"""
+热路径微基准测试 (离线，HTTP 由 requests_mock 模拟，redis 使用 fakeredis)
+
+    python benchmarks/bench_hot_paths.py                     # 运行并打印结果
+    python benchmarks/bench_hot_paths.py -o new.json         # 保存为 JSON
+    python benchmarks/bench_hot_paths.py --compare old.json new.json
+
+每项报告 ops/sec (多轮取最好)、单次调用的内存峰值与保留的内存块数 (tracemalloc)。
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import requests
+import requests_mock
+from fakeredis import FakeStrictRedis
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _fixtures import fixture_bytes  # noqa: E402
+
+from zq_auth_sdk.client import ZqAuthClient  # noqa: E402
+from zq_auth_sdk.entities.response import ZqAuthResponse  # noqa: E402
+from zq_auth_sdk.exceptions import ZqAuthClientException  # noqa: E402
+from zq_auth_sdk.metrics import ClientMetrics  # noqa: E402
+from zq_auth_sdk.storage.redisstorage import RedisStorage  # noqa: E402
+from zq_auth_sdk.utils import calculate_signature  # noqa: E402
+
+_USER_URL = f"{ZqAuthClient.API_BASE_URL}/users/123/"
+
+
+def make_response(body: bytes, status_code: int = 200) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response._content = body
+    return response
+
+
+def make_client(**kwargs) -> ZqAuthClient:
+    with requests_mock.Mocker() as mocker:
+        mocker.post(
+            f"{ZqAuthClient.API_BASE_URL}/auth/apps/",
+            content=fixture_bytes("auth_apps"),
+        )
+        return ZqAuthClient("123", "123", **kwargs)
+
+
+def _raises(func: Callable, exception: type[Exception]) -> Callable:
+    def call():
+        try:
+            func()
+        except exception:
+            pass
+
+    return call
+
+
+def build_cases() -> dict[str, Callable[[], object]]:
+    client = make_client()
+    uncached = make_client(token_cache_ttl=0)
+    metered = make_client(metrics=ClientMetrics())
+    redis_client = make_client(
+        storage=RedisStorage(FakeStrictRedis()), token_cache_ttl=0
+    )
+
+    user_body = fixture_bytes("users_123")
+    not_found_body = fixture_bytes("users_123_not_found")
+    sign_params = {
+        "appid": "123",
+        "nonce_str": "5K8264ILTKCH16CQ2502SI8ZNMTM67VS",
+        "body": "test",
+        "total_fee": 1,
+    }
+
+    return {
+        "access_token (hot cache)": lambda: client.access_token,
+        "access_token (MemoryStorage)": lambda: uncached.access_token,
+        "access_token (RedisStorage)": lambda: redis_client.access_token,
+        "ZqAuthResponse parse": lambda: ZqAuthResponse(
+            make_response(user_body), client
+        ),
+        "_handle_result success": lambda: client._handle_result(
+            make_response(user_body), "get", _USER_URL
+        ),
+        "_handle_result (metrics)": lambda: metered._handle_result(
+            make_response(user_body), "get", _USER_URL
+        ),
+        "_handle_result error": _raises(
+            lambda: client._handle_result(
+                make_response(not_found_body, 404), "get", _USER_URL
+            ),
+            ZqAuthClientException,
+        ),
+        "storage key building": lambda: client._session_field_keys(),
+        "calculate_signature": lambda: calculate_signature(sign_params, "key"),
+    }
+
+
+def measure_speed(
+    func: Callable, min_time: float, repeat: int
+) -> tuple[float, int]:
+    """
+    :return: ops/sec (多轮取最好), 每轮调用次数
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / repeat:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return number / best, number
+
+
+def measure_memory(func: Callable, number: int = 100) -> tuple[float, float]:
+    """
+    :return: 单次调用的内存峰值 (bytes), 每次调用保留的内存块数
+    """
+    func()  # 预热，排除首次调用的缓存分配
+    tracemalloc.start()
+    try:
+        peaks = []
+        for _ in range(number):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - base)
+
+        results = []
+        before = tracemalloc.take_snapshot()
+        for _ in range(number):
+            results.append(func())
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "filename")
+        if stat.count_diff > 0
+    )
+    # 减去 results 列表本身
+    return sum(peaks) / len(peaks), max(0, blocks - 1) / number
+
+
+def run(min_time: float = 1.0, repeat: int = 5) -> dict:
+    results = {}
+    for name, func in build_cases().items():
+        ops, number = measure_speed(func, min_time, repeat)
+        peak, blocks = measure_memory(func)
+        results[name] = {
+            "ops_per_sec": ops,
+            "ns_per_op": 1e9 / ops,
+            "peak_bytes_per_call": peak,
+            "blocks_per_call": blocks,
+            "calls_per_round": number,
+        }
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def print_results(report: dict):
+    print(
+        f"{'case':<32}{'ops/sec':>14}{'ns/op':>12}"
+        f"{'peak B/call':>14}{'blocks/call':>13}"
+    )
+    for name, result in report["results"].items():
+        print(
+            f"{name:<32}{result['ops_per_sec']:>14,.0f}"
+            f"{result['ns_per_op']:>12,.0f}"
+            f"{result['peak_bytes_per_call']:>14,.0f}"
+            f"{result['blocks_per_call']:>13.1f}"
+        )
+
+
+def compare(old_path: str, new_path: str):
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)["results"]
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)["results"]
+
+    print(f"{'case':<32}{'old ops/sec':>14}{'new ops/sec':>14}{'change':>10}")
+    for name in new:
+        if name not in old:
+            continue
+        before = old[name]["ops_per_sec"]
+        after = new[name]["ops_per_sec"]
+        print(
+            f"{name:<32}{before:>14,.0f}{after:>14,.0f}"
+            f"{(after / before - 1) * 100:>+9.1f}%"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("-o", "--output", help="保存结果的 JSON 文件")
+    parser.add_argument(
+        "--min-time", type=float, default=1.0, help="每项的最短运行时间 (秒)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="运行轮数")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="比较两个结果文件",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args.min_time, args.repeat)
+    print_results(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#! /usr/bin/env python3
+"""
+比较存储序列化器在真实 user_info 数据上的性能
+
+    python benchmarks/bench_serializers.py
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from _fixtures import load_fixture  # noqa: E402
+
+from zq_auth_sdk.storage.serializers import (  # noqa: E402
+    JSONSerializer,
+    MsgpackSerializer,
+    OrjsonSerializer,
+)
+
+
+def load_payloads():
+    return {
+        name: load_fixture(name)["data"]
+        for name in ("users_123", "users_123_no_detail", "auth_apps")
+    }
+
+
+def bench(serializer, payload, number):
+    encoded = serializer.encode(payload)
+    encode_time = timeit.timeit(
+        lambda: serializer.encode(payload), number=number
+    )
+    decode_time = timeit.timeit(
+        lambda: serializer.decode(encoded), number=number
+    )
+    return len(encoded), encode_time / number, decode_time / number
+
+
+def main(number=100_000):
+    payloads = load_payloads()
+    print(
+        f"{'payload':<22}{'serializer':<20}{'size':>6}"
+        f"{'encode (us)':>14}{'decode (us)':>14}"
+    )
+    for serializer_class in (
+        JSONSerializer,
+        OrjsonSerializer,
+        MsgpackSerializer,
+    ):
+        try:
+            serializer = serializer_class()
+        except ImportError:
+            print(f"{serializer_class.__name__}: not installed, skipped")
+            continue
+        for name, payload in payloads.items():
+            size, encode, decode = bench(serializer, payload, number)
+            print(
+                f"{name:<22}{serializer_class.__name__:<20}{size:>6}"
+                f"{encode * 1e6:>14.2f}{decode * 1e6:>14.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
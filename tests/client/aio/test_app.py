@@ -0,0 +1,101 @@
+import uuid
+
+import pytest
+
+from tests.conftest import load_fixture
+from zq_auth_sdk.exceptions import (
+    ThirdLoginFailedException,
+    UserNotFoundException,
+)
+
+
+@pytest.mark.asyncio
+async def test_test(async_zq_client, async_api_mock):
+    async_api_mock("GET", "/")
+
+    res = await async_zq_client.app.test()
+    assert res == {
+        "user": {
+            "id": 9,
+            "username": "zq_test",
+            "type": 2,
+            "is_active": True,
+            "is_superuser": False,
+        },
+        "time": "2023-03-06T18:26:53.713365+08:00",
+    }
+
+
+@pytest.mark.asyncio
+async def test_app_info(async_zq_client, async_api_mock):
+    async_api_mock("GET", "/apps/9/")
+    res = await async_zq_client.app.app_info()
+
+    assert res == {
+        "id": 9,
+        "username": "zq_test",
+        "name": "测试项目",
+        "is_active": True,
+    }
+
+
+@pytest.mark.asyncio
+async def test_sso(async_zq_client, async_api_mock):
+    async_api_mock("POST", "/sso/union-id/", data={"code": "12345"})
+
+    res = await async_zq_client.app.sso("12345")
+
+    assert res == {"union_id": "678574dd4a274d3cbfac10666b7613ef"}
+
+
+@pytest.mark.asyncio
+async def test_sso_failed(async_zq_client, async_api_mock):
+    async_api_mock("POST", "/sso/union-id/", "failed", data={"code": "12345"})
+
+    with pytest.raises(ThirdLoginFailedException):
+        await async_zq_client.app.sso("12345")
+
+
+@pytest.mark.asyncio
+async def test_user_info(async_zq_client, async_api_mock):
+    async_api_mock("GET", "/users/123/")
+
+    res = await async_zq_client.app.user_info("123")
+
+    assert res == {
+        "name": "测试",
+        "student_id": "2020302111311",
+        "phone": "18312341233",
+        "is_certified": True,
+        "certify_time": "2023-03-04T20:42:00+08:00",
+        "update_time": "2023-03-06T10:49:07.976501+08:00",
+    }
+
+
+@pytest.mark.asyncio
+async def test_user_info_not_found(async_zq_client, async_api_mock):
+    async_api_mock("GET", "/users/123/", "not_found")
+
+    with pytest.raises(UserNotFoundException):
+        await async_zq_client.app.user_info("123")
+
+
+@pytest.mark.asyncio
+async def test_user_info_many(async_zq_client, respx_mock):
+    union_id = uuid.UUID("678574dd4a274d3cbfac10666b7613ef")
+    found = load_fixture("/users/123/")
+    respx_mock.get(
+        f"https://api.cas.ziqiang.net.cn/users/{union_id.hex}/"
+    ).respond(json=found)
+    not_found = respx_mock.get(
+        "https://api.cas.ziqiang.net.cn/users/456/"
+    ).respond(json=load_fixture("/users/123/", "not_found"))
+
+    res = await async_zq_client.app.user_info_many(
+        [union_id, "456", str(union_id), "456"], concurrency=2
+    )
+
+    assert set(res) == {union_id.hex, "456"}
+    assert res[union_id.hex] == found["data"]
+    assert isinstance(res["456"], UserNotFoundException)
+    assert not_found.call_count == 1
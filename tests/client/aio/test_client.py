@@ -0,0 +1,258 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+import pytest
+
+from tests.conftest import load_fixture
+from zq_auth_sdk.client.aio import AsyncZqAuthClient
+from zq_auth_sdk.client.aio.http import AsyncHTTPPool
+from zq_auth_sdk.client.breaker import CircuitBreaker
+from zq_auth_sdk.client.ratelimit import RateLimiter
+from zq_auth_sdk.client.retry import RetryPolicy
+from zq_auth_sdk.entities import UserInfo
+from zq_auth_sdk.exceptions import (
+    AppLoginFailedException,
+    ZqAuthClientException,
+)
+
+
+@pytest.mark.asyncio
+async def test_async_client__login_success(async_api_mock):
+    async_api_mock("POST", "/auth/apps/")
+
+    client = AsyncZqAuthClient(appid="123", secret="123")
+
+    assert await client.get_access_token() == "access_token"
+    assert client.access_token == "access_token"
+    assert client.refresh_token == "refresh_token"
+    assert client.id == 9
+    assert client.username == "zq_test"
+    assert client.name == "测试项目"
+    assert client.expire_time == datetime.fromisoformat(
+        "2123-03-07T09:16:15.844900Z"
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_client__lazy_login(async_api_mock):
+    route = async_api_mock("POST", "/auth/apps/")
+
+    client = AsyncZqAuthClient(appid="123", secret="123")
+    assert route.call_count == 0
+
+    assert await client.get_id() == 9
+    assert route.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_async_client__refresh_success(async_api_mock):
+    async_api_mock("POST", "/auth/apps/", "expired")
+    async_api_mock("POST", "/auth/refresh/", data={"refresh": "refresh_token"})
+
+    client = AsyncZqAuthClient(appid="123", secret="123")
+    await client.refresh_access_token()  # login here, but expired
+
+    assert await client.get_access_token() == "access_token_new"
+    assert client.expire_time == datetime.fromisoformat(
+        "2123-03-07T10:37:39.081249Z"
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_client__refresh_token_expired(respx_mock):
+    login = respx_mock.post("https://api.cas.ziqiang.net.cn/auth/apps/").mock(
+        side_effect=[
+            httpx.Response(200, json=load_fixture("/auth/apps/", "expired")),
+            httpx.Response(200, json=load_fixture("/auth/apps/")),
+        ]
+    )
+    refresh = respx_mock.post(
+        "https://api.cas.ziqiang.net.cn/auth/refresh/"
+    ).respond(401, json=load_fixture("/auth/refresh/", "invalid"))
+
+    client = AsyncZqAuthClient(appid="123", secret="123")
+    await client.refresh_access_token()  # login here, but expired
+
+    # refresh token 过期时重新登录，而不是在持有刷新锁时重入刷新
+    token = await asyncio.wait_for(client.get_access_token(), timeout=5)
+
+    assert token == "access_token"
+    assert refresh.call_count == 1
+    assert login.call_count == 2
+    assert client.refresh_token == "refresh_token"
+
+
+@pytest.mark.asyncio
+async def test_async_client__login_failed(async_api_mock):
+    async_api_mock("POST", "/auth/apps/", "failed")
+
+    client = AsyncZqAuthClient(appid="123", secret="123")
+    with pytest.raises(AppLoginFailedException):
+        await client.refresh_access_token()
+
+
+@pytest.mark.asyncio
+async def test_async_client__single_flight_refresh(async_api_mock, respx_mock):
+    async_api_mock("POST", "/auth/apps/", "expired")
+
+    async def _refresh(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=load_fixture("/auth/refresh/"))
+
+    refresh = respx_mock.post(
+        "https://api.cas.ziqiang.net.cn/auth/refresh/"
+    ).mock(side_effect=_refresh)
+
+    client = AsyncZqAuthClient(appid="123", secret="123")
+    await client.refresh_access_token()  # login here, but expired
+
+    tokens = await asyncio.gather(
+        *(client.get_access_token() for _ in range(50))
+    )
+
+    assert set(tokens) == {"access_token_new"}
+    assert refresh.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_async_client__shared_http_pool(async_api_mock):
+    async_api_mock("POST", "/auth/apps/")
+
+    async with AsyncHTTPPool(max_connections=20) as pool:
+        async with AsyncZqAuthClient("1", "1", http_pool=pool) as client_a:
+            client_b = AsyncZqAuthClient("2", "2", http_pool=pool)
+            assert client_a._http is client_b._http is pool.session
+            assert await client_b.get_access_token() == "access_token"
+
+        assert not pool.closed
+
+    assert pool.closed
+
+
+@pytest.mark.asyncio
+async def test_async_client__close_own_http_pool():
+    async with AsyncZqAuthClient(appid="123", secret="123") as client:
+        pass
+
+    assert client.http_pool.closed
+
+
+@pytest.mark.asyncio
+async def test_async_http_pool__stats_fail_soft(monkeypatch):
+    async with AsyncHTTPPool() as pool:
+        assert pool.stats() == {"in_use": 0, "idle": 0}
+
+        # httpx 内部结构变化时不影响指标采集
+        with monkeypatch.context() as m:
+            m.setattr(pool.session, "_transport", object())
+            assert pool.stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_async_client__retry(async_api_mock, respx_mock):
+    async_api_mock("POST", "/auth/apps/")
+    route = respx_mock.get("https://api.cas.ziqiang.net.cn/users/123/")
+    route.side_effect = [
+        httpx.ConnectError("reset"),
+        httpx.Response(
+            429,
+            json={"code": "A0512", "msg": "", "detail": "", "data": None},
+            headers={"Retry-After": "0"},
+        ),
+        httpx.Response(200, json=load_fixture("/users/123/")),
+    ]
+    client = AsyncZqAuthClient(
+        appid="123",
+        secret="123",
+        retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.01),
+    )
+
+    assert (await client.app.user_info("123"))["name"] == "测试"
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_async_client__rate_limiter_queue():
+    limiter = RateLimiter(rate=20, burst=1, max_wait=1)
+
+    tasks = [asyncio.create_task(limiter.acquire_async()) for _ in range(4)]
+    await asyncio.sleep(0.01)
+    assert limiter.queue_depth == 3
+
+    await asyncio.gather(*tasks)
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_async_client__coalesce_get(async_api_mock, respx_mock):
+    async_api_mock("POST", "/auth/apps/")
+
+    async def _slow(request):
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json=load_fixture("/users/123/"))
+
+    route = respx_mock.get("https://api.cas.ziqiang.net.cn/users/123/")
+    route.side_effect = _slow
+    client = AsyncZqAuthClient(
+        appid="123", secret="123", coalesce_requests=True
+    )
+    await client.get_access_token()
+
+    results = await asyncio.gather(
+        *(client.app.user_info("123") for _ in range(16))
+    )
+
+    assert route.call_count == 1
+    assert all(result == results[0] for result in results)
+    assert client.coalescer.stats() == {
+        "requests": 1,
+        "saved": 15,
+        "in_flight": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_async_client__typed_entities(async_api_mock):
+    async_api_mock("POST", "/auth/apps/")
+    async_api_mock("GET", "/apps/9/")
+    async_api_mock("GET", "/users/123/")
+    client = AsyncZqAuthClient(appid="123", secret="123", typed_entities=True)
+
+    assert (await client.app.app_info()).username == "zq_test"
+    user = await client.app.user_info("123")
+    assert isinstance(user, UserInfo)
+    assert user.union_id == "123"
+
+
+@pytest.mark.asyncio
+async def test_async_client__circuit_breaker_probe_error(
+    async_api_mock, respx_mock
+):
+    now = [100.0]
+    async_api_mock("POST", "/auth/apps/")
+    respx_mock.get("https://api.cas.ziqiang.net.cn/apps/9/").mock(
+        side_effect=[
+            httpx.Response(
+                500, json={"code": "B0000", "msg": "", "data": None}
+            ),
+            httpx.Response(502, json={"error": "bad gateway"}),
+            httpx.Response(200, json=load_fixture("/apps/9/")),
+        ]
+    )
+    breaker = CircuitBreaker(
+        failure_threshold=1, recovery_timeout=10, timer=lambda: now[0]
+    )
+    client = AsyncZqAuthClient(
+        appid="123", secret="123", circuit_breaker=breaker
+    )
+
+    with pytest.raises(ZqAuthClientException):
+        await client.app.app_info()
+    now[0] += 10
+    with pytest.raises(KeyError):
+        await client.app.app_info()  # 半开探测收到缺少 code 的网关错误
+    now[0] += 10
+
+    assert (await client.app.app_info())["id"] == 9  # 半开探测未被占用
+    await client.close()
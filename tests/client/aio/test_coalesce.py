@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from zq_auth_sdk.client.aio.coalesce import AsyncRequestCoalescer
+
+
+@pytest.mark.asyncio
+async def test_async_coalescer__leader_cancelled():
+    coalescer = AsyncRequestCoalescer()
+    calls = []
+
+    async def _request():
+        calls.append(len(calls))
+        await asyncio.sleep(0.05)
+        return {"call": len(calls)}
+
+    leader = asyncio.create_task(coalescer.do(("k",), _request))
+    await asyncio.sleep(0)
+    followers = [
+        asyncio.create_task(coalescer.do(("k",), _request)) for _ in range(4)
+    ]
+    await asyncio.sleep(0.01)
+
+    leader.cancel()
+    results = await asyncio.gather(*followers)
+
+    assert leader.cancelled()
+    # 其中一个等待方接替发起请求，其余等待方共享结果
+    assert results == [{"call": 2}] * 4
+    assert coalescer.stats() == {"requests": 2, "saved": 3, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_async_coalescer__follower_cancelled():
+    coalescer = AsyncRequestCoalescer()
+
+    async def _request():
+        await asyncio.sleep(0.05)
+        return 1
+
+    leader = asyncio.create_task(coalescer.do(("k",), _request))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(coalescer.do(("k",), _request))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(follower, 0)
+
+    assert await leader == 1
@@ -0,0 +1,27 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from zq_auth_sdk.utils import now
+
+
+@pytest.mark.asyncio
+async def test_async_refresher(async_zq_client, async_api_mock):
+    refresh = async_api_mock(
+        "POST", "/auth/refresh/", data={"refresh": "refresh_token"}
+    )
+    await async_zq_client.refresh_access_token()
+    async_zq_client.expire_time = now() + timedelta(seconds=0.2)
+
+    refresher = async_zq_client.start_token_refresher(margin=300, jitter=0)
+    assert refresher.running
+    for _ in range(200):
+        if refresh.called:
+            break
+        await asyncio.sleep(0.01)
+    await async_zq_client.stop_token_refresher()
+
+    assert refresh.call_count == 1
+    assert async_zq_client.access_token == "access_token_new"
+    assert not refresher.running
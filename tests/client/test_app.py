@@ -1,5 +1,10 @@
+import re
+import uuid
+
 import pytest
 
+from tests.conftest import load_fixture
+from zq_auth_sdk.cache import UserInfoCache
 from zq_auth_sdk.exceptions import (
     ThirdLoginFailedException,
     UserNotFoundException,
@@ -77,3 +82,65 @@ def test_user_info_not_found(zq_client, get_mock):
 
     with pytest.raises(UserNotFoundException):
         zq_client.app.user_info("123")
+
+
+def test_user_info_many(zq_client, requests_mock):
+    union_id = uuid.UUID("678574dd4a274d3cbfac10666b7613ef")
+    found = load_fixture("/users/123/")
+    requests_mock.get(
+        f"https://api.cas.ziqiang.net.cn/users/{union_id.hex}/", json=found
+    )
+    requests_mock.get(
+        "https://api.cas.ziqiang.net.cn/users/456/",
+        json=load_fixture("/users/123/", "not_found"),
+    )
+
+    res = zq_client.app.user_info_many(
+        [union_id, "456", str(union_id), union_id.hex], concurrency=2
+    )
+
+    assert set(res) == {union_id.hex, "456"}
+    assert res[union_id.hex] == found["data"]
+    assert isinstance(res["456"], UserNotFoundException)
+    # 重复 union id 只请求一次
+    assert requests_mock.call_count == 3  # login + 2 users
+
+
+def test_iter_user_info_bounded(zq_client, requests_mock):
+    requests_mock.get(
+        re.compile(r"https://api\.cas\.ziqiang\.net\.cn/users/\w+/"),
+        json=load_fixture("/users/123/"),
+    )
+    union_ids = (str(i) for i in range(50))
+
+    results = zq_client.app.iter_user_info(union_ids, concurrency=4)
+
+    assert next(results)[1]["name"] == "测试"
+    results.close()
+    # 提前结束时不会请求全部用户
+    assert requests_mock.call_count <= 1 + 4
+
+
+def test_user_info_cache(get_client, get_mock, requests_mock):
+    client = get_client()
+    client.user_cache = UserInfoCache()
+    get_mock("/users/123/")
+
+    res = client.app.user_info("123")
+    assert client.app.user_info("123") == res
+    assert client.app.user_info("123", detail=False) == {
+        "certify_time": "2023-03-04T20:42:00+08:00"
+    }
+    assert requests_mock.call_count == 2  # login + 1 user
+    assert client.user_cache.stats()["hits"] == 2
+
+
+def test_user_info_cache_not_found(get_client, get_mock, requests_mock):
+    client = get_client()
+    client.user_cache = UserInfoCache()
+    get_mock("/users/123/", "not_found")
+
+    for _ in range(3):
+        with pytest.raises(UserNotFoundException):
+            client.app.user_info("123")
+    assert requests_mock.call_count == 2  # login + 1 user
@@ -0,0 +1,241 @@
+import pytest
+import requests
+
+from tests.conftest import load_fixture
+from zq_auth_sdk.cache import UserInfoCache
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.breaker import CircuitBreaker
+from zq_auth_sdk.client.ratelimit import RateLimiter
+from zq_auth_sdk.exceptions import (
+    CircuitOpenException,
+    RateLimitExceededException,
+    ZqAuthClientException,
+)
+
+_USER_URL = "https://api.cas.ziqiang.net.cn/users/123/"
+_SERVER_ERROR = {"code": "B0000", "msg": "", "detail": "", "data": None}
+
+
+def test_breaker__circuit_key():
+    key = CircuitBreaker.circuit_key
+
+    assert key("get", "https://api.cas.ziqiang.net.cn/apps/9/") == (
+        "GET https://api.cas.ziqiang.net.cn/apps/:id/"
+    )
+    assert key(
+        "get",
+        "https://api.cas.ziqiang.net.cn/users/"
+        "b2b6d5a0-4f8e-4c1e-9c3d-2f1e0a9b8c7d/",
+    ) == key("GET", "https://api.cas.ziqiang.net.cn/users/123/")
+    assert key("post", "https://a.com/sso/union-id/") == (
+        "POST https://a.com/sso/union-id/"
+    )
+
+
+def test_breaker__consecutive_failures(clock):
+    breaker = CircuitBreaker(
+        failure_threshold=3, error_rate=None, recovery_timeout=10, timer=clock
+    )
+
+    for _ in range(2):
+        breaker.before("k")
+        breaker.record("k", False)
+    breaker.record("k", True)  # 成功后重新计数
+    for _ in range(3):
+        breaker.before("k")
+        breaker.record("k", False)
+
+    assert breaker.state("k") == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenException):
+        breaker.before("k")
+    breaker.before("other")  # 其他接口不受影响
+
+
+def test_breaker__error_rate():
+    breaker = CircuitBreaker(
+        failure_threshold=100, error_rate=0.5, window=10, min_calls=10
+    )
+
+    for i in range(9):
+        breaker.record("k", i % 2 == 0)
+    assert breaker.state("k") == CircuitBreaker.CLOSED
+    breaker.record("k", False)  # 5 / 10
+
+    assert breaker.state("k") == CircuitBreaker.OPEN
+
+
+def test_breaker__half_open(clock):
+    breaker = CircuitBreaker(
+        failure_threshold=1, recovery_timeout=10, timer=clock
+    )
+    breaker.record("k", False)
+
+    clock.now += 10
+    breaker.before("k")  # 探测请求
+    assert breaker.state("k") == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenException):
+        breaker.before("k")  # 探测期间其余请求仍被拒绝
+
+    breaker.record("k", False)  # 探测失败，重新打开
+    assert breaker.state("k") == CircuitBreaker.OPEN
+
+    clock.now += 10
+    breaker.before("k")
+    breaker.record("k", True)
+    assert breaker.state("k") == CircuitBreaker.CLOSED
+
+
+def test_client__circuit_breaker(zq_client, requests_mock):
+    zq_client.circuit_breaker = CircuitBreaker(failure_threshold=2)
+    route = requests_mock.get(
+        _USER_URL,
+        [
+            {"json": _SERVER_ERROR, "status_code": 500},
+            {"exc": requests.ConnectionError},
+        ],
+    )
+
+    with pytest.raises(ZqAuthClientException):
+        zq_client.app.user_info("123")
+    with pytest.raises(requests.ConnectionError):
+        zq_client.app.user_info("123")
+    with pytest.raises(CircuitOpenException):
+        zq_client.app.user_info("456")
+
+    assert route.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "response, exception",
+    [
+        ({"json": {"error": "bad gateway"}, "status_code": 502}, KeyError),
+        (
+            {"exc": requests.exceptions.ChunkedEncodingError},
+            requests.exceptions.ChunkedEncodingError,
+        ),
+    ],
+)
+def test_client__circuit_breaker_probe_error(
+    zq_client, requests_mock, response, exception, clock
+):
+    zq_client.circuit_breaker = CircuitBreaker(
+        failure_threshold=1, recovery_timeout=10, timer=clock
+    )
+    requests_mock.get(
+        _USER_URL,
+        [
+            {"json": _SERVER_ERROR, "status_code": 500},
+            response,
+            {"json": load_fixture("/users/123/")},
+        ],
+    )
+    key = CircuitBreaker.circuit_key("get", _USER_URL)
+    with pytest.raises(ZqAuthClientException):
+        zq_client.app.user_info("123")
+
+    clock.now += 10
+    with pytest.raises(exception):
+        zq_client.app.user_info("123")  # 半开探测产生非预期异常
+    assert zq_client.circuit_breaker.state(key) == CircuitBreaker.OPEN
+
+    clock.now += 10
+    assert zq_client.app.user_info("123")["name"] == "测试"  # 探测名额已释放
+    assert zq_client.circuit_breaker.state(key) == CircuitBreaker.CLOSED
+
+
+def test_client__circuit_open_fails_fast(requests_mock):
+    login = requests_mock.post(
+        "https://api.cas.ziqiang.net.cn/auth/apps/",
+        json=load_fixture("/auth/apps/"),
+    )
+    breaker = CircuitBreaker(failure_threshold=1)
+    breaker.record(CircuitBreaker.circuit_key("get", _USER_URL), False)
+    limiter = RateLimiter(rate=1, max_wait=0)
+    client = ZqAuthClient(
+        "123", "123", lazy=True, circuit_breaker=breaker, rate_limiter=limiter
+    )
+
+    for _ in range(3):
+        with pytest.raises(CircuitOpenException):
+            client.app.user_info("123")
+
+    # 熔断时不占用限流令牌，也不登录
+    limiter.acquire()
+    assert login.call_count == 0
+
+
+def test_client__circuit_half_open_probe_not_sent(
+    zq_client, requests_mock, clock
+):
+    limiter = RateLimiter(rate=1, max_wait=0)
+    zq_client.rate_limiter = limiter
+    zq_client.circuit_breaker = CircuitBreaker(
+        failure_threshold=1, recovery_timeout=10, timer=clock
+    )
+    key = CircuitBreaker.circuit_key("get", _USER_URL)
+    zq_client.circuit_breaker.record(key, False)
+    requests_mock.get(_USER_URL, json=load_fixture("/users/123/"))
+    limiter.acquire()
+
+    clock.now += 10
+    with pytest.raises(RateLimitExceededException):
+        zq_client.app.user_info("123")  # 探测请求被限流，未发出
+
+    zq_client.rate_limiter = None
+    assert zq_client.app.user_info("123")["name"] == "测试"  # 探测名额已归还
+    assert zq_client.circuit_breaker.state(key) == CircuitBreaker.CLOSED
+
+
+def test_client__circuit_breaker_fallback_processed(zq_client):
+    zq_client.circuit_breaker = CircuitBreaker(
+        failure_threshold=1, fallback=lambda method, url, params: {"id": 1}
+    )
+    zq_client.circuit_breaker.record(
+        CircuitBreaker.circuit_key("get", _USER_URL), False
+    )
+
+    result = zq_client.get(_USER_URL, result_processor=lambda data: data["id"])
+
+    assert result == 1
+
+
+def test_client__circuit_breaker_fallback(zq_client, requests_mock):
+    calls = []
+
+    def _fallback(method, url, params):
+        calls.append((method, url, params))
+        return {"fallback": True}
+
+    zq_client.circuit_breaker = CircuitBreaker(
+        failure_threshold=1, fallback=_fallback
+    )
+    requests_mock.get(_USER_URL, json=_SERVER_ERROR, status_code=500)
+
+    with pytest.raises(ZqAuthClientException):
+        zq_client.app.user_info("123")
+    assert zq_client.app.user_info("123", detail=False) == {"fallback": True}
+    assert calls == [("get", _USER_URL, {"detail": False})]
+
+
+def test_client__circuit_breaker_stale_user_cache(
+    zq_client, requests_mock, clock
+):
+    zq_client.user_cache = UserInfoCache(ttl=10, stale_ttl=60, timer=clock)
+    zq_client.circuit_breaker = CircuitBreaker(failure_threshold=1)
+    requests_mock.get(
+        _USER_URL,
+        [
+            {"json": load_fixture("/users/123/")},
+            {"json": _SERVER_ERROR, "status_code": 500},
+        ],
+    )
+
+    user = zq_client.app.user_info("123")
+    clock.now += 20  # 缓存过期
+    with pytest.raises(ZqAuthClientException):
+        zq_client.app.user_info("123")
+
+    assert zq_client.app.user_info("123") == user  # 熔断时读取过期缓存
+    clock.now += 60
+    with pytest.raises(CircuitOpenException):
+        zq_client.app.user_info("123")
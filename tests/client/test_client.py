@@ -1,9 +1,18 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 import pytest
+from fakeredis import FakeStrictRedis
 
+from tests.conftest import load_fixture
 from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.api import ZqAuthApp
 from zq_auth_sdk.exceptions import AppLoginFailedException
+from zq_auth_sdk.storage.memorystorage import MemoryStorage
+from zq_auth_sdk.storage.redisstorage import RedisStorage
 
 
 def test_client__login_success(post_mock):
@@ -16,6 +25,11 @@ def test_client__login_success(post_mock):
     assert client.id == 9
     assert client.username == "zq_test"
     assert client.name == "测试项目"
+    assert client.identity == {
+        "id": 9,
+        "name": "测试项目",
+        "username": "zq_test",
+    }
     assert client.expire_time == datetime.fromisoformat(
         "2123-03-07T09:16:15.844900Z"
     )
@@ -38,3 +52,300 @@ def test_client__login_failed(post_mock):
 
     with pytest.raises(AppLoginFailedException):
         ZqAuthClient(appid="123", secret="123")
+
+
+def _mock_slow_refresh(requests_mock):
+    counter = itertools.count(1)
+
+    def _refresh(request, context):
+        time.sleep(0.05)
+        response = load_fixture("/auth/refresh/")
+        response["data"]["access"] = f"access_token_{next(counter)}"
+        return response
+
+    return requests_mock.post(
+        "https://api.cas.ziqiang.net.cn/auth/refresh/", json=_refresh
+    )
+
+
+def _run_concurrently(func, n=32):
+    barrier = threading.Barrier(n)
+
+    def _worker(i):
+        barrier.wait()
+        return func(i)
+
+    with ThreadPoolExecutor(max_workers=n) as executor:
+        return list(executor.map(_worker, range(n)))
+
+
+def test_client__single_flight_refresh(post_mock, requests_mock):
+    post_mock("/auth/apps/", "expired")
+    client = ZqAuthClient(appid="123", secret="123")  # login here, but expired
+    refresh = _mock_slow_refresh(requests_mock)
+
+    tokens = _run_concurrently(lambda _: client.access_token)
+
+    assert set(tokens) == {"access_token_1"}
+    assert refresh.call_count == 1
+
+
+def test_client__single_flight_token_invalid(post_mock, requests_mock):
+    post_mock("/auth/apps/")
+    client = ZqAuthClient(appid="123", secret="123")
+    refresh = _mock_slow_refresh(requests_mock)
+
+    # 所有线程的请求都因同一个 token 失效而触发刷新
+    _run_concurrently(
+        lambda _: client.refresh_access_token(stale_token="access_token")
+    )
+
+    assert client.access_token == "access_token_1"
+    assert refresh.call_count == 1
+
+
+def test_client__refresh_lease_shared_storage(post_mock, requests_mock):
+    storage = RedisStorage(FakeStrictRedis())
+    post_mock("/auth/apps/")
+    refresh = _mock_slow_refresh(requests_mock)
+    # 每个客户端模拟一个独立的 worker 进程
+    clients = [
+        ZqAuthClient(appid="123", secret="123", storage=storage)
+        for _ in range(8)
+    ]
+    refresh_count = refresh.call_count
+    storage.set(
+        clients[0].access_token_expire_time_key, "2023-03-07T09:16:15+00:00"
+    )
+
+    tokens = _run_concurrently(lambda i: clients[i].access_token, n=8)
+
+    assert len(set(tokens)) == 1
+    assert refresh.call_count == refresh_count + 1
+
+
+def test_client__refresh_lease_wait_other_worker(post_mock, requests_mock):
+    storage = RedisStorage(FakeStrictRedis())
+    post_mock("/auth/apps/", "expired")
+    client = ZqAuthClient(appid="123", secret="123", storage=storage)
+    refresh = _mock_slow_refresh(requests_mock)
+
+    lease = storage.acquire_lease(client.refresh_lease_key, 30)
+    assert storage.acquire_lease(client.refresh_lease_key, 30) is None
+
+    def _other_worker():
+        time.sleep(0.2)
+        storage.set(client.access_token_key, "access_token_other")
+        storage.set(
+            client.access_token_expire_time_key, "2123-03-07T10:37:39.081249Z"
+        )
+        storage.release_lease(client.refresh_lease_key, lease)
+
+    worker = threading.Thread(target=_other_worker)
+    worker.start()
+
+    assert client.access_token == "access_token_other"
+    worker.join()
+    assert refresh.call_count == 0
+
+
+def test_client__refresh_token_expired(requests_mock):
+    login = requests_mock.post(
+        "https://api.cas.ziqiang.net.cn/auth/apps/",
+        [
+            {"json": load_fixture("/auth/apps/", "expired")},
+            {"json": load_fixture("/auth/apps/")},
+        ],
+    )
+    refresh = requests_mock.post(
+        "https://api.cas.ziqiang.net.cn/auth/refresh/",
+        status_code=401,
+        json=load_fixture("/auth/refresh/", "invalid"),
+    )
+    storage = RedisStorage(FakeStrictRedis())
+    client = ZqAuthClient(appid="123", secret="123", storage=storage)
+
+    start = time.monotonic()
+    assert client.access_token == "access_token"  # refresh 失败后重新登录
+
+    assert time.monotonic() - start < client.REFRESH_LEASE_WAIT
+    assert refresh.call_count == 1
+    assert login.call_count == 2
+    assert storage.acquire_lease(client.refresh_lease_key, 30) is not None
+
+
+def test_client__refresh_lease_reentrant(post_mock):
+    storage = RedisStorage(FakeStrictRedis())
+    post_mock("/auth/apps/")
+    client = ZqAuthClient(appid="123", secret="123", storage=storage)
+    calls = []
+
+    def _outer():
+        calls.append("outer")
+        client._with_refresh_lease(lambda: calls.append("inner"), lambda: False)
+
+    start = time.monotonic()
+    with client._refresh_lock:
+        client._with_refresh_lease(_outer, lambda: False)
+
+    assert calls == ["outer", "inner"]
+    assert time.monotonic() - start < client.REFRESH_LEASE_WAIT
+    assert storage.acquire_lease(client.refresh_lease_key, 30) is not None
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.get_count = 0
+
+    def get(self, key, default=None):
+        self.get_count += 1
+        return super().get(key, default)
+
+    def get_many(self, keys, default=None):
+        self.get_count += 1
+        return super().get_many(keys, default)
+
+    def set_many(self, mapping, ttl=None):
+        self.set_many_count = getattr(self, "set_many_count", 0) + 1
+        return super().set_many(mapping, ttl)
+
+
+def test_client__token_cache(post_mock):
+    post_mock("/auth/apps/")
+    storage = CountingStorage()
+    client = ZqAuthClient(appid="123", secret="123", storage=storage)
+
+    assert client.access_token == "access_token"
+    storage.get_count = 0
+    for _ in range(100):
+        assert client.access_token == "access_token"
+
+    assert storage.get_count == 0
+
+
+def test_client__token_cache_stale(post_mock):
+    post_mock("/auth/apps/")
+    storage = CountingStorage()
+    client = ZqAuthClient(
+        appid="123", secret="123", storage=storage, token_cache_ttl=0.05
+    )
+    assert client.access_token == "access_token"
+
+    # 其他 worker 更新了 token
+    storage.set(client.access_token_key, "access_token_other")
+    assert client.access_token == "access_token"
+    time.sleep(0.06)
+    assert client.access_token == "access_token_other"
+
+
+def test_client__token_cache_disabled(post_mock):
+    post_mock("/auth/apps/")
+    storage = CountingStorage()
+    client = ZqAuthClient(
+        appid="123", secret="123", storage=storage, token_cache_ttl=0
+    )
+
+    storage.get_count = 0
+    client.access_token
+
+    assert storage.get_count == 1  # access token + expire time
+
+
+def test_client__login_single_write(post_mock):
+    post_mock("/auth/apps/")
+    storage = CountingStorage()
+    ZqAuthClient(appid="123", secret="123", storage=storage)
+
+    assert storage.set_many_count == 1
+
+
+def test_client__session_record(post_mock):
+    post_mock("/auth/apps/", "expired")
+    post_mock("/auth/refresh/", data={"refresh": "refresh_token"})
+    storage = CountingStorage()
+    client = ZqAuthClient(
+        appid="123", secret="123", storage=storage, session_record=True
+    )
+
+    assert len(storage) == 1
+    assert client.session_version == 1
+    assert client.refresh_token == "refresh_token"
+    assert client.identity == {
+        "id": 9,
+        "name": "测试项目",
+        "username": "zq_test",
+    }
+
+    assert client.access_token == "access_token_new"  # refresh here
+    assert client.session_version == 2
+    assert client.expire_time == datetime.fromisoformat(
+        "2123-03-07T10:37:39.081249Z"
+    )
+    assert storage.get(client.session_key) == {
+        "version": 2,
+        "id": 9,
+        "name": "测试项目",
+        "username": "zq_test",
+        "access": "access_token_new",
+        "refresh": "refresh_token",
+        "expire_time": "2123-03-07T10:37:39.081249+00:00",
+    }
+
+
+@pytest.mark.parametrize(
+    "storage_factory",
+    [MemoryStorage, lambda: RedisStorage(FakeStrictRedis())],
+    ids=["memory", "redis"],
+)
+def test_client__session_record_shared_storage(post_mock, storage_factory):
+    post_mock("/auth/apps/")
+    storage = storage_factory()
+    clients = [
+        ZqAuthClient(
+            appid="123",
+            secret="123",
+            storage=storage,
+            session_record=True,
+            lazy=True,
+        )
+        for _ in range(2)
+    ]
+    assert clients[0].access_token == "access_token"
+    version = clients[1].session_version
+
+    def _write(i):
+        client = clients[i % 2]
+        for j in range(10):
+            client._session_set(name=f"{i}_{j}", worker=i)
+
+    _run_concurrently(_write, n=8)
+
+    record = storage.get(clients[0].session_key)
+    # 每次写入都基于最新记录，版本号不重复，字段不丢失
+    assert record["version"] == version + 80
+    assert clients[1].session_version == version + 80
+    assert record["access"] == "access_token"
+    assert record["name"] == f"{record['worker']}_9"
+
+
+def test_client__api_binding(post_mock):
+    post_mock("/auth/apps/")
+    client_a = ZqAuthClient(appid="1", secret="1")
+    client_b = ZqAuthClient(appid="2", secret="2")
+
+    assert isinstance(ZqAuthClient.app, ZqAuthApp)
+    assert ZqAuthClient.app._client is None
+    assert client_a.app is client_a.app
+    assert client_a.app._client is client_a
+    assert client_b.app._client is client_b
+
+
+def test_client__lazy_login(post_mock, requests_mock):
+    post_mock("/auth/apps/")
+
+    client = ZqAuthClient(appid="123", secret="123", lazy=True)
+    assert requests_mock.call_count == 0
+
+    assert client.access_token == "access_token"
+    assert requests_mock.call_count == 1
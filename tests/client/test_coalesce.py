@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+from tests.client.test_client import _run_concurrently
+from tests.conftest import load_fixture
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.coalesce import RequestCoalescer, request_key
+from zq_auth_sdk.exceptions import UserNotFoundException
+
+_USER_URL = "https://api.cas.ziqiang.net.cn/users/123/"
+
+
+@pytest.fixture
+def coalesce_client(post_mock):
+    post_mock("/auth/apps/")
+    return ZqAuthClient(appid="123", secret="123", coalesce_requests=True)
+
+
+def _slow(file_suffix=None):
+    def _response(request, context):
+        time.sleep(0.05)
+        return load_fixture("/users/123/", file_suffix)
+
+    return _response
+
+
+def test_request_key():
+    assert request_key("get", "/u/", {"b": 1, "a": True}) == request_key(
+        "GET", "/u/", {"a": "True", "b": "1"}
+    )
+    assert request_key("get", "/u/", {"a": 1}) != request_key(
+        "get", "/u/", {"a": 2}
+    )
+
+
+def test_coalescer__sequential_not_merged():
+    coalescer = RequestCoalescer()
+
+    assert coalescer.do(("k",), lambda: 1) == 1
+    assert coalescer.do(("k",), lambda: 2) == 2
+    assert coalescer.stats() == {"requests": 2, "saved": 0, "in_flight": 0}
+
+
+def test_coalescer__leader_interrupted():
+    coalescer = RequestCoalescer()
+    started = threading.Event()
+    calls = []
+
+    def _interrupted():
+        calls.append("leader")
+        started.set()
+        time.sleep(0.2)
+        raise KeyboardInterrupt
+
+    def _request():
+        calls.append("follower")
+        time.sleep(0.05)
+        return {"ok": True}
+
+    def _leader():
+        with pytest.raises(KeyboardInterrupt):
+            coalescer.do(("k",), _interrupted)
+
+    leader = threading.Thread(target=_leader)
+    leader.start()
+    started.wait()
+    results = _run_concurrently(lambda _: coalescer.do(("k",), _request), n=4)
+    leader.join()
+
+    # 中断不会传给等待方，由其中一个等待方接替发起请求
+    assert results == [{"ok": True}] * 4
+    assert calls == ["leader", "follower"]
+    assert coalescer.stats()["in_flight"] == 0
+
+
+def test_client__coalesce_get(coalesce_client, requests_mock):
+    route = requests_mock.get(_USER_URL, json=_slow())
+
+    results = _run_concurrently(lambda _: coalesce_client.app.user_info("123"))
+
+    assert route.call_count == 1
+    assert all(result == results[0] for result in results)
+    # 每个调用方得到独立的结果
+    assert len({id(result) for result in results}) == len(results)
+    assert coalesce_client.coalescer.saved == len(results) - 1
+
+
+def test_client__coalesce_different_params(coalesce_client, requests_mock):
+    route = requests_mock.get(_USER_URL, json=_slow())
+
+    _run_concurrently(
+        lambda i: coalesce_client.app.user_info("123", detail=i % 2 == 0), n=8
+    )
+
+    assert route.call_count == 2
+
+
+def test_client__coalesce_exception(coalesce_client, requests_mock):
+    route = requests_mock.get(_USER_URL, json=_slow("not_found"))
+
+    def _call(_):
+        with pytest.raises(UserNotFoundException):
+            coalesce_client.app.user_info("123")
+
+    _run_concurrently(_call, n=8)
+
+    assert route.call_count == 1
+
+
+def test_client__coalesce_disabled(zq_client, requests_mock):
+    route = requests_mock.get(_USER_URL, json=_slow())
+
+    _run_concurrently(lambda _: zq_client.app.user_info("123"), n=4)
+
+    assert zq_client.coalescer is None
+    assert route.call_count == 4
@@ -0,0 +1,47 @@
+import socket
+
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.http import HTTPPool
+
+
+def test_http_pool__adapter_settings():
+    pool = HTTPPool(pool_connections=4, pool_maxsize=32, pool_block=True)
+    adapter = pool.session.get_adapter("https://api.cas.ziqiang.net.cn")
+
+    assert adapter is pool.adapter
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert adapter._pool_block is True
+    socket_options = adapter.poolmanager.connection_pool_kw["socket_options"]
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in socket_options
+
+
+def test_http_pool__keepalive_disabled():
+    pool = HTTPPool(tcp_keepalive=False)
+
+    assert "socket_options" not in pool.adapter.poolmanager.connection_pool_kw
+
+
+def test_client__shared_http_pool(post_mock):
+    post_mock("/auth/apps/")
+    pool = HTTPPool(pool_maxsize=20)
+
+    with ZqAuthClient(appid="1", secret="1", http_pool=pool) as client_a:
+        client_b = ZqAuthClient(appid="2", secret="2", http_pool=pool)
+        assert client_a._http is client_b._http is pool.session
+
+    # 共享的连接池不随客户端关闭
+    assert not pool.closed
+    client_b.access_token
+    pool.close()
+    assert pool.closed
+
+
+def test_client__close_own_http_pool(post_mock):
+    post_mock("/auth/apps/")
+
+    with ZqAuthClient(appid="123", secret="123") as client:
+        client.start_token_refresher()
+
+    assert client.http_pool.closed
+    assert client._token_refresher is None
@@ -0,0 +1,95 @@
+import pytest
+from fakeredis import FakeStrictRedis
+
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.ratelimit import RateLimiter, RedisRateLimiter
+from zq_auth_sdk.exceptions import (
+    APILimitedException,
+    RateLimitExceededException,
+)
+
+_USER_URL = "https://api.cas.ziqiang.net.cn/users/123/"
+_THROTTLED = {"code": "A0512", "msg": "", "detail": "", "data": None}
+
+
+def test_rate_limiter__token_bucket(clock):
+    limiter = RateLimiter(rate=2, burst=2, max_wait=1, timer=clock)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.5)  # 排队等待
+    assert limiter.reserve() == pytest.approx(1)
+    assert limiter.reserve() is None  # 本地拒绝
+    assert limiter.rejected == 1
+
+    clock.now += 2
+    assert limiter.reserve() == 0
+
+
+def test_rate_limiter__aimd(clock):
+    limiter = RateLimiter(
+        rate=10, min_rate=1, increase=1, decrease=0.5, timer=clock
+    )
+
+    limiter.record(throttled=True)
+    assert limiter.rate == 5
+    limiter.record(throttled=True)  # 同一批限流响应只缩减一次
+    assert limiter.rate == 5
+
+    clock.now += 1
+    for _ in range(4):
+        limiter.record(throttled=True)
+        clock.now += 1
+    assert limiter.rate == 1  # 不低于 min_rate
+
+    for _ in range(20):
+        limiter.record(throttled=False)
+    assert limiter.rate == 10  # 不高于 max_rate
+
+
+def test_rate_limiter__reject_raises():
+    limiter = RateLimiter(rate=1, burst=1, max_wait=0)
+    limiter.acquire()
+
+    with pytest.raises(RateLimitExceededException) as e:
+        limiter.acquire()
+    assert isinstance(e.value, APILimitedException)
+
+
+def test_redis_rate_limiter__shared(clock):
+    redis = FakeStrictRedis()
+    worker_a = RedisRateLimiter(redis, rate=2, max_wait=0, timer=clock)
+    worker_b = RedisRateLimiter(redis, rate=2, max_wait=0, timer=clock)
+
+    assert worker_a.reserve() == 0
+    assert worker_b.reserve() == 0
+    assert worker_a.reserve() is None
+
+    worker_b.record(throttled=True)
+    clock.now += 1
+    assert worker_a.reserve() == 0
+    assert worker_a.rate == 1
+
+
+def test_client__rate_limiter(zq_client, requests_mock, clock):
+    zq_client.rate_limiter = RateLimiter(rate=4, max_wait=0, timer=clock)
+    route = requests_mock.get(_USER_URL, json=_THROTTLED, status_code=429)
+
+    with pytest.raises(APILimitedException):
+        zq_client.app.user_info("123")
+    assert zq_client.rate_limiter.rate == 2
+
+    # 限流后令牌清空，本地直接拒绝
+    with pytest.raises(RateLimitExceededException):
+        zq_client.app.user_info("123")
+    assert route.call_count == 1
+
+
+def test_client__rate_limiter_ctor(post_mock):
+    post_mock("/auth/apps/")
+    limiter = RateLimiter(rate=5)
+
+    client = ZqAuthClient(appid="123", secret="123", rate_limiter=limiter)
+
+    assert client.rate_limiter is limiter
+    assert limiter.stats() == {"rate": 5, "queue_depth": 0, "rejected": 0}
@@ -0,0 +1,69 @@
+import time
+from datetime import timedelta
+
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.refresher import TokenRefresher
+from zq_auth_sdk.utils import now
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_refresher_next_delay(zq_client):
+    refresher = TokenRefresher(zq_client, margin=300, jitter=60)
+    zq_client.expire_time = now() + timedelta(seconds=1000)
+
+    for _ in range(20):
+        assert 1000 - 360 - 1 <= refresher.next_delay() <= 1000 - 300
+
+    # 有效期短于 margin 时最多提前一半
+    zq_client.expire_time = now() + timedelta(seconds=200)
+    assert 99 <= refresher.next_delay() <= 100
+
+
+def test_refresher_next_delay__short_lifetime(zq_client):
+    refresher = TokenRefresher(zq_client, margin=300, jitter=60)
+    margin = zq_client.TOKEN_REFRESH_MARGIN.total_seconds()
+
+    # 有效期的一半短于 TOKEN_REFRESH_MARGIN 时，至少提前 TOKEN_REFRESH_MARGIN
+    zq_client.expire_time = now() + timedelta(seconds=margin * 1.5)
+    assert margin / 2 - 1 <= refresher.next_delay() <= margin / 2
+
+    zq_client.expire_time = now() + timedelta(seconds=margin / 2)
+    assert refresher.next_delay() == 0
+
+
+def test_refresher_refresh_before_expire(post_mock):
+    post_mock("/auth/apps/")
+    post_mock("/auth/refresh/", data={"refresh": "refresh_token"})
+    client = ZqAuthClient(appid="123", secret="123")
+    client.expire_time = now() + timedelta(seconds=0.2)
+
+    refresher = client.start_token_refresher(margin=300, jitter=0)
+    try:
+        assert refresher.running
+        assert _wait_for(
+            lambda: client.storage.get(client.access_token_key)
+            == "access_token_new"
+        )
+    finally:
+        client.stop_token_refresher()
+
+    assert not refresher.running
+
+
+def test_refresher_stop_promptly(zq_client):
+    refresher = TokenRefresher(zq_client, margin=0, jitter=0)
+    refresher.start()
+
+    started = time.monotonic()
+    refresher.stop(timeout=1)
+
+    assert time.monotonic() - started < 1
+    assert not refresher.running
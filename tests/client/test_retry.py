@@ -0,0 +1,116 @@
+import pytest
+import requests
+
+from tests.conftest import load_fixture
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.retry import RetryPolicy
+from zq_auth_sdk.exceptions import APILimitedException, ZqAuthClientException
+
+_USER_URL = "https://api.cas.ziqiang.net.cn/users/123/"
+
+
+def _error(code):
+    return {"code": code, "msg": "", "detail": "", "data": None}
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def retry_client(post_mock, sleeps):
+    post_mock("/auth/apps/")
+    policy = RetryPolicy(max_attempts=3, sleep=sleeps.append)
+    return ZqAuthClient(appid="123", secret="123", retry_policy=policy)
+
+
+def test_retry_policy__backoff_full_jitter():
+    policy = RetryPolicy(backoff_base=1, backoff_max=5)
+
+    for attempt, cap in ((1, 1), (2, 2), (3, 4), (4, 5), (10, 5)):
+        delays = [policy.backoff(attempt) for _ in range(100)]
+        assert all(0 <= delay <= cap for delay in delays)
+
+
+def test_retry_policy__parse_retry_after():
+    assert RetryPolicy.parse_retry_after("3") == 3
+    assert RetryPolicy.parse_retry_after(None) is None
+    assert RetryPolicy.parse_retry_after("invalid") is None
+    assert RetryPolicy.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+def test_retry_policy__total_budget():
+    clock = [0.0]
+    policy = RetryPolicy(
+        max_attempts=10,
+        backoff_base=1,
+        total_timeout=5,
+        timer=lambda: clock[0],
+    )
+    state = policy.start("GET")
+
+    assert state.next_delay(retry_after="4") == 4
+    clock[0] = 4
+    assert state.next_delay(retry_after="2") is None
+
+
+def test_client__retry_throttled(retry_client, requests_mock, sleeps):
+    requests_mock.get(
+        _USER_URL,
+        [
+            {
+                "json": _error("A0512"),
+                "status_code": 429,
+                "headers": {"Retry-After": "2"},
+            },
+            {"json": load_fixture("/users/123/")},
+        ],
+    )
+
+    assert retry_client.app.user_info("123")["name"] == "测试"
+    assert sleeps == [2]
+
+
+def test_client__retry_exhausted(retry_client, requests_mock, sleeps):
+    route = requests_mock.get(_USER_URL, json=_error("A0512"), status_code=429)
+
+    with pytest.raises(APILimitedException):
+        retry_client.app.user_info("123")
+    assert route.call_count == 3
+    assert len(sleeps) == 2
+
+
+def test_client__retry_server_error(retry_client, requests_mock, sleeps):
+    requests_mock.get(
+        _USER_URL,
+        [
+            {"json": _error("B0100"), "status_code": 500},
+            {"exc": requests.ConnectionError},
+            {"json": load_fixture("/users/123/")},
+        ],
+    )
+
+    assert retry_client.app.user_info("123")["name"] == "测试"
+    assert len(sleeps) == 2
+
+
+def test_client__no_retry_non_idempotent(retry_client, requests_mock, sleeps):
+    route = requests_mock.post(
+        "https://api.cas.ziqiang.net.cn/sso/union-id/",
+        json=_error("B0000"),
+        status_code=500,
+    )
+
+    with pytest.raises(ZqAuthClientException):
+        retry_client.app.sso("code")
+    assert route.call_count == 1
+    assert sleeps == []
+
+
+def test_client__retry_disabled_by_default(zq_client, requests_mock):
+    route = requests_mock.get(_USER_URL, json=_error("A0512"), status_code=429)
+
+    with pytest.raises(APILimitedException):
+        zq_client.app.user_info("123")
+    assert route.call_count == 1
@@ -50,6 +50,41 @@ def match_params_and_data(request, params, data):
     return match_params(request, params) and match_data(request, data)
 
 
+def load_fixture(url: str, file_suffix: str | None = None):
+    path = url.replace("/", "_")
+    if path.startswith("_"):
+        path = path[1:]
+    if path.endswith("_"):
+        path = path[:-1]
+
+    if file_suffix is not None and file_suffix != "":
+        file_suffix = "_" + file_suffix
+    else:
+        file_suffix = ""
+
+    file = _FIXTURE_PATH / f"{path}{file_suffix}.json"
+
+    with open(file, "r", encoding="utf-8") as f:
+        return json.load(f, strict=False)
+
+
+class FakeClock:
+    """
+    手动推进的计时函数，用于 timer 参数
+    """
+
+    def __init__(self, now: float = 100.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
 @pytest.fixture
 def api_mock(requests_mock: Mocker):
     def _api_mock(
@@ -60,21 +95,7 @@ def api_mock(requests_mock: Mocker):
         data: dict | None = None,
         *kwargs,
     ):
-        path = url.replace("/", "_")
-        if path.startswith("_"):
-            path = path[1:]
-        if path.endswith("_"):
-            path = path[:-1]
-
-        if file_suffix is not None and file_suffix != "":
-            file_suffix = "_" + file_suffix
-        else:
-            file_suffix = ""
-
-        file = _FIXTURE_PATH / f"{path}{file_suffix}.json"
-
-        with open(file, "r", encoding="utf-8") as f:
-            response = json.load(f, strict=False)
+        response = load_fixture(url, file_suffix)
         requests_mock.register_uri(
             method,
             f"https://api.cas.ziqiang.net.cn{url}",
@@ -131,3 +152,47 @@ def get_client(post_mock):
 @pytest.fixture
 def zq_client(get_client):
     return get_client()
+
+
+@pytest.fixture
+def async_api_mock(respx_mock):
+    def _async_api_mock(
+        method: str,
+        url: str,
+        file_suffix: str | None = None,
+        params: dict | None = None,
+        data: dict | None = None,
+    ):
+        response = load_fixture(url, file_suffix)
+        lookups = {}
+        if params:
+            lookups["params__contains"] = params
+        if data:
+            lookups["data__contains"] = data
+        return respx_mock.route(
+            method=method,
+            url=f"https://api.cas.ziqiang.net.cn{url}",
+            **lookups,
+        ).respond(json=response)
+
+    return _async_api_mock
+
+
+@pytest.fixture
+def async_get_client(async_api_mock):
+    def _async_get_client(
+        appid: str = "123",
+        secret: str = "123",
+        storage: SessionStorage | None = None,
+    ):
+        from zq_auth_sdk.client.aio import AsyncZqAuthClient
+
+        async_api_mock("POST", "/auth/apps/")
+        return AsyncZqAuthClient(appid=appid, secret=secret, storage=storage)
+
+    return _async_get_client
+
+
+@pytest.fixture
+def async_zq_client(async_get_client):
+    return async_get_client()
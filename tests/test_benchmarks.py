@@ -0,0 +1,31 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+_BENCHMARKS_PATH = Path(__file__).parent.parent / "benchmarks"
+
+
+def test_bench_hot_paths__json_output(tmp_path):
+    output = tmp_path / "result.json"
+    subprocess.run(
+        [
+            sys.executable,
+            str(_BENCHMARKS_PATH / "bench_hot_paths.py"),
+            "--min-time",
+            "0.001",
+            "--repeat",
+            "1",
+            "-o",
+            str(output),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+    results = json.loads(output.read_text(encoding="utf-8"))["results"]
+    assert "access_token (hot cache)" in results
+    assert "calculate_signature" in results
+    for result in results.values():
+        assert result["ops_per_sec"] > 0
+        assert result["peak_bytes_per_call"] >= 0
@@ -0,0 +1,85 @@
+import pytest
+
+from zq_auth_sdk.cache import UserInfoCache
+from zq_auth_sdk.exceptions import UserNotFoundException
+
+USER = {
+    "name": "测试",
+    "student_id": "2020302111311",
+    "certify_time": "2023-03-04T20:42:00+08:00",
+}
+
+
+def test_cache_hit_and_expire(clock):
+    cache = UserInfoCache(ttl=10, timer=clock)
+
+    assert cache.get("u1") is None
+    cache.set("u1", True, USER)
+    assert cache.get("u1") == USER
+
+    clock.now += 11
+    assert cache.get("u1") is None
+    assert cache.stats() == {"hits": 1, "misses": 2, "evictions": 0, "size": 0}
+
+
+def test_cache_returns_copy():
+    cache = UserInfoCache()
+    cache.set("u1", True, USER)
+
+    cache.get("u1")["name"] = "changed"
+
+    assert cache.get("u1")["name"] == "测试"
+
+
+def test_cache_detail_answers_brief():
+    cache = UserInfoCache()
+    cache.set("u1", True, USER)
+
+    assert cache.get("u1", detail=False) == {
+        "certify_time": "2023-03-04T20:42:00+08:00"
+    }
+
+    cache.set("u2", False, {"certify_time": None})
+    assert cache.get("u2", detail=True) is None
+
+
+def test_cache_negative(clock):
+    cache = UserInfoCache(ttl=100, negative_ttl=5, timer=clock)
+    cache.set_not_found("u1", True, UserNotFoundException("A0514", "not found"))
+
+    with pytest.raises(UserNotFoundException):
+        cache.get("u1")
+    with pytest.raises(UserNotFoundException):
+        cache.get("u1", detail=False)
+
+    clock.now += 6
+    assert cache.get("u1") is None
+
+
+def test_cache_lru_eviction():
+    cache = UserInfoCache(maxsize=2)
+    cache.set("u1", True, USER)
+    cache.set("u2", True, USER)
+    cache.get("u1")
+    cache.set("u3", True, USER)
+
+    assert cache.get("u2") is None
+    assert cache.get("u1") is not None
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_cache_stale(clock):
+    cache = UserInfoCache(ttl=10, stale_ttl=20, timer=clock)
+    cache.set("u1", True, USER)
+
+    clock.now += 15
+    assert cache.get("u1") is None
+    assert cache.get("u1", stale=True) == USER
+    assert cache.get("u1", detail=False, stale=True) == {
+        "certify_time": USER["certify_time"]
+    }
+
+    clock.now += 16
+    assert cache.get("u1", stale=True) is None
+    assert len(cache) == 0
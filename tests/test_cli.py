@@ -0,0 +1,136 @@
+import json
+import uuid
+
+import pytest
+from fakeredis import FakeStrictRedis
+
+from zq_auth_sdk import cli
+from zq_auth_sdk.cache import UserInfoCache
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.storage.redisstorage import RedisStorage
+from zq_auth_sdk.testing.server import ZqAuthStandInServer
+
+
+@pytest.fixture
+def server():
+    with ZqAuthStandInServer() as server:
+        yield server
+
+
+@pytest.fixture
+def storage(mocker):
+    storage = RedisStorage(FakeStrictRedis())
+    mocker.patch.object(cli, "create_storage", return_value=storage)
+    return storage
+
+
+@pytest.fixture
+def run(server, storage):
+    def run(*argv, secret=True):
+        common = ["--appid", "123", "--api-base-url", server.url]
+        if secret:
+            common += ["--secret", "123"]
+        return cli.main([*argv, *common])
+
+    return run
+
+
+def test_cli__token_refresh_and_show(run, capsys):
+    assert run("token", "refresh") == 0
+    refreshed = json.loads(capsys.readouterr().out)
+
+    assert run("token", "show", secret=False) == 0
+    shown = json.loads(capsys.readouterr().out)
+
+    assert shown == refreshed
+    assert shown["username"] == "app_1"
+    assert shown["access_token"].endswith("...")
+    assert shown["expires_in"] > 0
+
+    assert run("token", "show", "--show-tokens", secret=False) == 0
+    full = json.loads(capsys.readouterr().out)
+    assert full["access_token"].startswith(shown["access_token"][:-3])
+    assert len(full["access_token"]) > len(shown["access_token"])
+
+
+def test_cli__token_show_empty(run, capsys):
+    assert run("token", "show", secret=False) == 1
+    assert json.loads(capsys.readouterr().out)["access_token"] is None
+
+
+def test_cli__session_record(run, server, storage, capsys, monkeypatch):
+    # 应用使用单条记录模式保存 session
+    client = ZqAuthClient(
+        "123",
+        "123",
+        storage=storage,
+        api_base_url=server.url,
+        session_record=True,
+    )
+    access_token = client.access_token
+    version = client.session_version
+
+    assert run("token", "show", "--show-tokens", secret=False) == 1
+    capsys.readouterr()
+
+    monkeypatch.setenv("ZQ_AUTH_SESSION_RECORD", "1")
+    assert run("token", "show", "--show-tokens", secret=False) == 0
+    shown = json.loads(capsys.readouterr().out)
+    assert shown["access_token"] == access_token
+    assert shown["session_version"] == version
+
+    assert run("token", "refresh", "--show-tokens", "--session-record") == 0
+    refreshed = json.loads(capsys.readouterr().out)
+    assert refreshed["session_version"] > version
+    assert refreshed["access_token"] != access_token
+    # 应用的 session 记录中是刷新后的 token
+    stored = client._session_get("access")["access"]
+    assert stored == refreshed["access_token"]
+    assert storage.get(client.access_token_key) is None  # 没有写入分字段 key
+
+
+def test_cli__secret_required(run):
+    with pytest.raises(SystemExit):
+        run("token", "refresh", secret=False)
+
+
+def test_cli__warm_cache(run, tmp_path, capsys):
+    union_ids = [uuid.uuid4().hex for _ in range(5)]
+    source = tmp_path / "union_ids.txt"
+    source.write_text("\n".join(["# comment", *union_ids, "not-a-uuid", ""]))
+    output = tmp_path / "users.jsonl"
+
+    assert run("warm-cache", str(source), "-o", str(output), "-c", "3") == 0
+    assert "warmed 6 users (1 not found)" in capsys.readouterr().err
+
+    cache = UserInfoCache()
+    with open(output, encoding="utf-8") as f:
+        assert cache.load(f) == 5
+    for union_id in union_ids:
+        assert cache.get(union_id, True)["is_certified"] is True
+    assert cache.get("not-a-uuid", True) is None
+
+
+def test_cli__probe(run, capsys):
+    assert run("probe", "--json", "-n", "20", "-c", "4") == 0
+    report = json.loads(capsys.readouterr().out)
+
+    assert report["requests"] == 20
+    assert report["errors"] == 0
+    latency = report["latency_ms"]
+    assert set(latency) == {"p50", "p90", "p99", "max"}
+    assert latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+
+
+def test_cli__probe_user_info_requires_union_id(run):
+    assert run("probe", "--endpoint", "user_info") == 2
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+
+    assert cli.percentile(values, 50) == 50
+    assert cli.percentile(values, 99) == 99
+    assert cli.percentile(values, 100) == 100
+    assert cli.percentile([3.0], 90) == 3.0
+    assert cli.percentile([], 50) != cli.percentile([], 50)  # nan
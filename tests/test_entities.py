@@ -0,0 +1,132 @@
+import json
+import tracemalloc
+import uuid
+from datetime import datetime
+
+import pytest
+
+from tests.conftest import load_fixture
+from zq_auth_sdk.cache import UserInfoCache
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.entities import AppInfo, UserInfo
+
+_UNION_ID = "678574dd4a274d3cbfac10666b7613ef"
+
+
+def test_user_info__from_dict():
+    data = load_fixture("/users/123/")["data"]
+
+    user = UserInfo.from_dict(data, uuid.UUID(_UNION_ID))
+
+    assert user.union_id_bytes == uuid.UUID(_UNION_ID).bytes
+    assert user.union_id == _UNION_ID
+    assert user.uuid == uuid.UUID(_UNION_ID)
+    assert user.name == "测试"
+    assert user.certified_at == datetime.fromisoformat(
+        "2023-03-04T20:42:00+08:00"
+    )
+    assert user.to_dict() == data
+    with pytest.raises(AttributeError):
+        user.name = "x"
+
+
+def test_user_info__brief():
+    user = UserInfo.from_dict(load_fixture("/users/123/")["data"], "123")
+
+    brief = user.brief(["certify_time"])
+
+    assert brief.union_id == "123"  # 不是 uuid 时原样保存
+    assert brief.uuid is None
+    assert brief.to_dict() == load_fixture("/users/123/", "no_detail")["data"]
+    assert brief.updated_at is None
+
+
+def test_user_info__round_trip():
+    data = dict(
+        load_fixture("/users/123/")["data"],
+        certify_time=None,
+        avatar="https://example.com/a.png",  # 未知字段
+    )
+
+    user = UserInfo.from_dict(data, _UNION_ID)
+
+    assert user.certify_time is None
+    assert user.extra == {"avatar": "https://example.com/a.png"}
+    assert user.to_dict() == data
+    assert list(user.to_dict()) == list(data)
+    assert "certify_time" in user.brief(["certify_time"]).to_dict()
+    # 相同结构的响应共享 key 元组
+    other = UserInfo.from_dict(dict(data), _UNION_ID)
+    assert other.payload_keys is user.payload_keys
+
+
+def test_app_info():
+    data = load_fixture("/apps/9/")["data"]
+
+    app = AppInfo.from_dict(data)
+
+    assert app.id == 9
+    assert app.to_dict() == data
+
+
+def test_entities__client(zq_client, get_mock, requests_mock):
+    get_mock("/apps/9/")
+    requests_mock.get(
+        f"{ZqAuthClient.API_BASE_URL}/users/{_UNION_ID}/",
+        json=load_fixture("/users/123/"),
+    )
+    zq_client.typed_entities = True
+    zq_client.user_cache = UserInfoCache()
+
+    assert zq_client.app.app_info() == AppInfo(9, "zq_test", "测试项目", True)
+    user = zq_client.app.user_info(_UNION_ID)
+    assert isinstance(user, UserInfo)
+    assert zq_client.app.user_info(_UNION_ID) is user  # 缓存直接共享
+    assert zq_client.app.user_info(_UNION_ID, detail=False).to_dict() == {
+        "certify_time": "2023-03-04T20:42:00+08:00"
+    }
+
+    zq_client.typed_entities = False
+    assert zq_client.app.user_info(_UNION_ID) == user.to_dict()
+
+
+def test_entities__default_dict(zq_client, get_mock):
+    get_mock("/users/123/")
+
+    assert isinstance(zq_client.app.user_info("123"), dict)
+
+
+def _traced_size(build) -> int:
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert result
+    return size
+
+
+def test_entities__memory():
+    data = load_fixture("/users/123/")["data"]
+    union_ids = [uuid.uuid4().hex for _ in range(2000)]
+    # 模拟逐个响应解析，每个 dict 都有独立的 key 字符串
+    bodies = [
+        json.dumps(dict(data, name=f"用户{i}")).encode()
+        for i in range(len(union_ids))
+    ]
+
+    dict_size = _traced_size(
+        lambda: {
+            union_id: json.loads(body)
+            for union_id, body in zip(union_ids, bodies)
+        }
+    )
+    entity_size = _traced_size(
+        lambda: [
+            UserInfo.from_dict(json.loads(body), union_id)
+            for union_id, body in zip(union_ids, bodies)
+        ]
+    )
+
+    assert entity_size < dict_size * 0.6
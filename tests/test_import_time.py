@@ -0,0 +1,54 @@
+import subprocess
+import sys
+from pathlib import Path
+
+_ROOT = Path(__file__).parent.parent
+
+# import zq_auth_sdk 与 import requests 的耗时比上限，
+# 实测约 0.012 秒对 0.2 秒；用相对值避免受 CI 机器速度影响
+IMPORT_TIME_RATIO = 0.5
+
+
+def _run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=_ROOT,
+    ).stdout.strip()
+
+
+def test_import__lazy_dependencies():
+    output = _run(
+        "import sys, zq_auth_sdk; "
+        "print(sorted(m for m in ('requests', 'urllib3', 'httpx', 'inspect') "
+        "if m in sys.modules))"
+    )
+
+    assert output == "[]"
+
+
+def test_import__lazy_attributes():
+    output = _run(
+        "import sys, zq_auth_sdk; "
+        "print(zq_auth_sdk.ZqAuthClient.__name__, 'requests' in sys.modules)"
+    )
+
+    assert output == "ZqAuthClient True"
+
+
+def _import_time(module: str) -> float:
+    code = (
+        f"import time; t = time.perf_counter(); import {module}; "
+        "print(time.perf_counter() - t)"
+    )
+    # 取多次运行的最小值，减少机器负载的影响
+    return min(float(_run(code)) for _ in range(5))
+
+
+def test_import__time_budget():
+    # 与直接加载 requests (延迟导入前的行为) 比较
+    assert _import_time("zq_auth_sdk") < (
+        _import_time("requests") * IMPORT_TIME_RATIO
+    )
@@ -0,0 +1,197 @@
+import socket
+
+import httpx
+import pytest
+import requests
+
+from tests.conftest import load_fixture
+from zq_auth_sdk.cache import UserInfoCache
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.aio import AsyncZqAuthClient
+from zq_auth_sdk.client.retry import RetryPolicy
+from zq_auth_sdk.metrics import (
+    CallbackSink,
+    ClientMetrics,
+    Histogram,
+    PrometheusSink,
+    StatsdSink,
+    endpoint_key,
+    render_prometheus,
+)
+
+_API = "https://api.cas.ziqiang.net.cn"
+_TOKEN_INVALID = {"code": "A0221", "msg": "", "detail": "", "data": None}
+
+
+def test_endpoint_key():
+    assert endpoint_key("get", f"{_API}/users/123/") == "GET /users/:id/"
+    assert endpoint_key("post", f"{_API}/auth/apps/") == "POST /auth/apps/"
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value)
+
+    assert histogram.snapshot() == {
+        "count": 4,
+        "sum": 3.65,
+        "buckets": {0.1: 2, 1: 3},
+    }
+
+
+def test_metrics__client(requests_mock):
+    requests_mock.post(f"{_API}/auth/apps/", json=load_fixture("/auth/apps/"))
+    requests_mock.post(
+        f"{_API}/auth/refresh/", json=load_fixture("/auth/refresh/")
+    )
+    requests_mock.get(
+        f"{_API}/users/123/",
+        [
+            {"status_code": 401, "json": _TOKEN_INVALID},
+            {"json": load_fixture("/users/123/")},
+        ],
+    )
+    events = []
+    metrics = ClientMetrics(sinks=[CallbackSink(lambda *e: events.append(e))])
+    client = ZqAuthClient(
+        appid="123", secret="123", metrics=metrics, user_cache=UserInfoCache()
+    )
+
+    client.app.user_info("123")
+    client.app.user_info("123")  # 缓存命中
+
+    stats = client.stats()
+    users = stats["requests"]["GET /users/:id/"]
+    assert users["latency"]["count"] == 2
+    assert users["codes"] == {"A0221": 1, "00000": 1}
+    assert users["retries"] == {"token": 1}
+    assert stats["requests"]["POST /auth/refresh/"]["codes"] == {"00000": 1}
+    assert stats["auth"]["login"]["success"] == 1
+    assert stats["auth"]["refresh"]["success"] == 1
+    assert stats["auth"]["refresh"]["failure"] == 0
+    assert stats["user_cache"]["hit_ratio"] == 0.5
+    assert stats["pool"]["requests"] == 0  # requests_mock 不经过连接池
+    assert ("increment", "retry", 1) in [e[:3] for e in events]
+
+
+def test_metrics__connection_error(requests_mock):
+    requests_mock.post(f"{_API}/auth/apps/", json=load_fixture("/auth/apps/"))
+    requests_mock.get(
+        f"{_API}/users/123/",
+        [
+            {"exc": requests.ConnectionError},
+            {"json": load_fixture("/users/123/")},
+        ],
+    )
+    client = ZqAuthClient(
+        appid="123",
+        secret="123",
+        metrics=ClientMetrics(),
+        retry_policy=RetryPolicy(sleep=lambda _: None),
+    )
+
+    client.app.user_info("123")
+
+    users = client.stats()["requests"]["GET /users/:id/"]
+    assert users["codes"] == {"connection_error": 1, "00000": 1}
+    assert users["retries"] == {"connection_error": 1}
+
+
+def test_metrics__disabled(zq_client):
+    assert zq_client.metrics is None
+    assert zq_client.stats()["requests"] == {}
+    zq_client.flush_metrics()
+
+
+def test_metrics__prometheus(tmp_path):
+    metrics = ClientMetrics(buckets=(0.1,))
+    metrics.observe_request("GET /users/:id/", 0.05)
+    metrics.observe_code("GET /users/:id/", "00000")
+    metrics.observe_auth("login", 0.2, True)
+    path = tmp_path / "zqauth.prom"
+    sink = PrometheusSink(path=str(path))
+    metrics.sinks.append(sink)
+
+    metrics.flush()
+
+    text = path.read_text(encoding="utf-8")
+    assert text == sink.text == render_prometheus(metrics.snapshot())
+    assert (
+        'zqauth_request_duration_seconds_bucket{method="GET",'
+        'endpoint="/users/:id/",le="+Inf"} 1'
+    ) in text
+    assert (
+        'zqauth_responses_total{method="GET",endpoint="/users/:id/",'
+        'code="00000"} 1'
+    ) in text
+    assert 'zqauth_auth_total{kind="login",result="success"} 1' in text
+    assert "# TYPE zqauth_auth_duration_seconds summary" in text
+    assert 'zqauth_auth_duration_seconds_sum{kind="login"} 0.2' in text
+    assert 'zqauth_auth_duration_seconds_count{kind="login"} 1' in text
+
+
+def test_metrics__prometheus_counters():
+    snapshot = {
+        "pool": {"hosts": 1, "connections": 2, "in_use": 1, "requests": 5},
+        "user_cache": {"hits": 3, "misses": 1, "hit_ratio": 0.75},
+        "rate_limiter": {"queue_depth": 0, "rejected": 4},
+    }
+
+    text = render_prometheus(snapshot)
+
+    # 累计值按 counter 导出，带 _total 后缀
+    assert "# TYPE zqauth_pool_connections_total counter" in text
+    assert "zqauth_pool_connections_total 2" in text
+    assert "zqauth_pool_requests_total 5" in text
+    assert "zqauth_user_cache_hits_total 3" in text
+    assert "zqauth_rate_limiter_rejected_total 4" in text
+    # 当前值仍为 gauge
+    assert "# TYPE zqauth_pool_in_use gauge" in text
+    assert "# TYPE zqauth_pool_hosts gauge" in text
+    assert "# TYPE zqauth_user_cache_hit_ratio gauge" in text
+    assert "zqauth_rate_limiter_queue_depth 0" in text
+    assert "zqauth_pool_requests " not in text
+
+
+def test_metrics__statsd():
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    server.bind(("127.0.0.1", 0))
+    server.settimeout(1)
+    sink = StatsdSink(port=server.getsockname()[1])
+    try:
+        ClientMetrics(sinks=[sink]).observe_code("GET /users/:id/", "00000")
+        assert server.recv(1024) == (
+            b"zqauth.response:1|c|#endpoint:GET /users/:id/,code:00000"
+        )
+    finally:
+        sink.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_metrics__async_client(respx_mock):
+    respx_mock.post(f"{_API}/auth/apps/").respond(
+        json=load_fixture("/auth/apps/")
+    )
+    respx_mock.post(f"{_API}/auth/refresh/").respond(
+        json=load_fixture("/auth/refresh/")
+    )
+    respx_mock.get(f"{_API}/users/123/").side_effect = [
+        httpx.Response(401, json=_TOKEN_INVALID),
+        httpx.Response(200, json=load_fixture("/users/123/")),
+    ]
+    client = AsyncZqAuthClient(
+        appid="123", secret="123", metrics=ClientMetrics()
+    )
+
+    await client.app.user_info("123")
+
+    stats = client.stats()
+    assert stats["requests"]["GET /users/:id/"]["codes"] == {
+        "A0221": 1,
+        "00000": 1,
+    }
+    assert stats["auth"]["refresh"]["success"] == 1
+    assert stats["pool"] == {"in_use": 0, "idle": 0}
+    await client.close()
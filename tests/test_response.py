@@ -0,0 +1,69 @@
+import json
+
+import pytest
+import requests
+
+from zq_auth_sdk.entities.response import (
+    CODE_TYPES,
+    ZqAuthResponse,
+    ZqAuthResponseType,
+)
+from zq_auth_sdk.exceptions import (
+    APILimitedException,
+    UserNotFoundException,
+    ZqAuthClientException,
+)
+
+
+def make_response(body: dict | bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    if isinstance(body, dict):
+        body = json.dumps(body).encode()
+    response._content = body
+    return response
+
+
+def _body(code: str, data=None) -> dict:
+    return {"code": code, "msg": "msg", "detail": "detail", "data": data}
+
+
+def test_response__fields():
+    response = ZqAuthResponse(make_response(_body("00000", {"id": 9})))
+
+    assert not hasattr(response, "__dict__")
+    assert response.code == "00000"
+    assert response.msg == "msg"
+    assert response.detail == "detail"
+    assert response.data == {"id": 9}
+    assert response.type is ZqAuthResponseType.Success
+    assert response == ZqAuthResponse(make_response(_body("00000", {"id": 9})))
+
+
+def test_response__not_json():
+    with pytest.raises(ValueError):
+        ZqAuthResponse(make_response(b"<html>Bad Gateway</html>"))
+
+
+def test_response__code_table():
+    # A0221 同时用于 TokenInvalid 与 RefreshTokenInvalid
+    assert CODE_TYPES["A0221"] is ZqAuthResponseType.TokenInvalid
+    assert ZqAuthResponseType.RefreshTokenInvalid.code == "A0221"
+    assert len(CODE_TYPES) == len(ZqAuthResponseType) - 1
+
+
+def test_response__exception_class():
+    throttled = ZqAuthResponse(make_response(_body("A0512")))
+    not_found = ZqAuthResponse(make_response(_body("A0514")))
+    exceptions = {"A0514": UserNotFoundException}
+
+    assert throttled.exception_class() is APILimitedException
+    assert throttled.exception_class(exceptions) is APILimitedException
+    assert not_found.exception_class() is ZqAuthClientException
+    assert not_found.exception_class(exceptions) is UserNotFoundException
+
+    with pytest.raises(APILimitedException):
+        throttled.check_exception()
+    with pytest.raises(UserNotFoundException) as e:
+        not_found.check_exception(UserNotFoundException)
+    assert e.value.errcode == "A0514"
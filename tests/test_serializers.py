@@ -0,0 +1,54 @@
+import pytest
+from fakeredis import FakeStrictRedis
+
+from tests.conftest import load_fixture
+from zq_auth_sdk.storage.redisstorage import RedisStorage
+from zq_auth_sdk.storage.serializers import (
+    JSONSerializer,
+    MsgpackSerializer,
+    OrjsonSerializer,
+    get_serializer,
+)
+
+USER_INFO = load_fixture("/users/123/")["data"]
+
+
+def _serializer_or_skip(serializer_class):
+    try:
+        return serializer_class()
+    except ImportError:
+        pytest.skip(f"{serializer_class.__name__} dependency not installed")
+
+
+@pytest.mark.parametrize(
+    "serializer_class", [JSONSerializer, OrjsonSerializer, MsgpackSerializer]
+)
+def test_serializer_roundtrip(serializer_class):
+    serializer = _serializer_or_skip(serializer_class)
+
+    for value in (USER_INFO, "access_token", 9, [1, "a"], True):
+        assert serializer.decode(serializer.encode(value)) == value
+
+
+def test_serializer_switch_without_flush():
+    msgpack = _serializer_or_skip(MsgpackSerializer)
+    redis = FakeStrictRedis()
+    json_storage = RedisStorage(redis)
+    msgpack_storage = RedisStorage(redis, serializer=msgpack)
+
+    json_storage.set("legacy", USER_INFO)
+    msgpack_storage.set("new", USER_INFO)
+
+    assert redis.get(json_storage.key_name("new"))[:2] == b"\x00m"
+    assert msgpack_storage.get("legacy") == USER_INFO
+    assert json_storage.get_many(["legacy", "new"]) == {
+        "legacy": USER_INFO,
+        "new": USER_INFO,
+    }
+
+
+def test_serializer_unknown_tag():
+    with pytest.raises(ValueError):
+        get_serializer(b"?")
+    with pytest.raises(ValueError):
+        JSONSerializer().decode(b"\x00?abc")
@@ -0,0 +1,143 @@
+import time
+import uuid
+
+import pytest
+import requests
+
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.retry import RetryPolicy
+from zq_auth_sdk.exceptions import (
+    APILimitedException,
+    AppLoginFailedException,
+    ThirdLoginFailedException,
+    UserNotFoundException,
+    ZqAuthClientException,
+)
+from zq_auth_sdk.testing.server import (
+    ZqAuthStandInServer,
+    constant,
+    parse_latency,
+)
+
+UNION_ID = uuid.uuid4().hex
+
+
+@pytest.fixture
+def server():
+    with ZqAuthStandInServer() as server:
+        yield server
+
+
+def _client(server, **kwargs):
+    return ZqAuthClient("123", "123", api_base_url=server.url, **kwargs)
+
+
+def test_server__login_and_api(server):
+    client = _client(server)
+
+    assert client.identity == {"id": 1, "name": "测试项目 1", "username": "app_1"}
+    assert client.app.app_info()["is_active"] is True
+    assert client.app.user_info(UNION_ID)["is_certified"] is True
+    assert client.app.user_info(UNION_ID, detail=False) == {
+        "certify_time": "2023-03-04T20:42:00+08:00"
+    }
+    assert client.app.test() is None
+
+
+def test_server__login_failed(server):
+    with pytest.raises(AppLoginFailedException):
+        ZqAuthClient("123", "wrong", api_base_url=server.url)
+
+
+def test_server__sso_code_single_use(server):
+    client = _client(server)
+
+    union_id = client.app.sso("code")["union_id"]
+    assert client.app.user_info(union_id)
+    with pytest.raises(ThirdLoginFailedException):
+        client.app.sso("code")
+
+
+def test_server__user_not_found():
+    with ZqAuthStandInServer(users={UNION_ID: {"name": "测试"}}) as server:
+        client = _client(server)
+
+        assert client.app.user_info(UNION_ID) == {"name": "测试"}
+        with pytest.raises(UserNotFoundException):
+            client.app.user_info(uuid.uuid4().hex)
+
+
+def test_server__token_expired_refresh(server):
+    client = _client(server)
+    token = client.access_token
+
+    server.expire_access_tokens()
+    client.app.app_info()  # A0221 后刷新并重试
+
+    assert client.access_token != token
+    assert server.stats["A0221"] == 1
+
+
+def test_server__short_token_lifetime():
+    with ZqAuthStandInServer(access_lifetime=0.2) as server:
+        login = requests.post(
+            f"{server.url}/auth/apps/",
+            data={"app_key": "123", "app_secret": "123"},
+        ).json()["data"]
+        headers = {"Authorization": f"Bearer {login['access']}"}
+
+        assert requests.get(f"{server.url}/", headers=headers).ok
+        time.sleep(0.3)
+        response = requests.get(f"{server.url}/", headers=headers)
+
+        assert response.status_code == 401
+        assert response.json()["code"] == "A0221"
+
+
+def test_server__throttling():
+    with ZqAuthStandInServer(rate_limit=1, burst=2) as server:
+        client = _client(server)  # login 使用一个令牌
+
+        client.app.app_info()
+        with pytest.raises(APILimitedException) as e:
+            client.app.app_info()
+        assert e.value.response.headers["Retry-After"] == "1"
+
+
+def test_server__error_injection():
+    with ZqAuthStandInServer() as server:
+        client = _client(
+            server,
+            retry_policy=RetryPolicy(max_attempts=5, backoff_base=0.01),
+        )
+        server.error_rate = 1.0
+
+        with pytest.raises(ZqAuthClientException) as e:
+            client.app.user_info(UNION_ID)
+        assert e.value.errcode == "B0000"
+        assert server.stats["B0000"] == 5
+
+
+def test_server__connection_reset():
+    with ZqAuthStandInServer() as server:
+        client = _client(server)
+        server.reset_rate = 1.0
+
+        with pytest.raises(requests.ConnectionError):
+            client.app.user_info(UNION_ID)
+
+
+def test_server__latency():
+    with ZqAuthStandInServer(latency=constant(0.05)) as server:
+        start = time.perf_counter()
+        _client(server)
+
+        assert time.perf_counter() - start >= 0.05
+
+
+def test_parse_latency():
+    assert parse_latency("constant:0.5")() == 0.5
+    assert 0.1 <= parse_latency("uniform:0.1,0.2")() <= 0.2
+    assert parse_latency("lognormal:0.05,0.5")() > 0
+    with pytest.raises(ValueError):
+        parse_latency("unknown:1")
@@ -2,6 +2,7 @@ import os
 from datetime import datetime
 
 import pytest
+from pymemcache.test.utils import MockMemcacheClient
 
 _TESTS_PATH = os.path.abspath(os.path.dirname(__file__))
 _FIXTURE_PATH = os.path.join(_TESTS_PATH, "fixtures")
@@ -64,3 +65,234 @@ def test_memcached_storage_init(get_client):
     assert client.expire_time == datetime.fromisoformat(
         "2123-03-07T09:16:15.844900Z"
     )
+
+
+def test_memory_session_storage_lease():
+    from zq_auth_sdk.storage.memorystorage import MemoryStorage
+
+    storage = MemoryStorage()
+    lease = storage.acquire_lease("lease", 30)
+
+    assert lease is not None
+    assert storage.acquire_lease("lease", 30) is None
+    storage.release_lease("lease", "other")
+    assert storage.acquire_lease("lease", 30) is None
+    storage.release_lease("lease", lease)
+    assert storage.acquire_lease("lease", 30) is not None
+
+
+def test_redis_session_storage_lease():
+    from fakeredis import FakeStrictRedis
+
+    from zq_auth_sdk.storage.redisstorage import RedisStorage
+
+    redis = FakeStrictRedis()
+    storage = RedisStorage(redis)
+    lease = storage.acquire_lease("lease", 30)
+
+    assert lease is not None
+    assert storage.acquire_lease("lease", 30) is None
+    assert 0 < redis.ttl(storage.key_name("lease")) <= 30
+    storage.release_lease("lease", "other")
+    assert storage.acquire_lease("lease", 30) is None
+    storage.release_lease("lease", lease)
+    assert storage.acquire_lease("lease", 30) is not None
+
+
+def test_redis_session_storage_many():
+    from fakeredis import FakeStrictRedis
+
+    from zq_auth_sdk.storage.redisstorage import RedisStorage
+
+    redis = FakeStrictRedis()
+    storage = RedisStorage(redis)
+    storage.set_many({"a": 1, "b": "2", "c": None}, ttl={"a": 30})
+
+    assert storage.get_many(["a", "b", "c"], default=0) == {
+        "a": 1,
+        "b": "2",
+        "c": 0,
+    }
+    assert 0 < redis.ttl(storage.key_name("a")) <= 30
+    assert redis.ttl(storage.key_name("b")) == -1
+
+    storage.delete_many(["a", "b"])
+    assert storage.get_many(["a", "b"]) == {"a": None, "b": None}
+
+
+def test_memcached_storage_many():
+    from pymemcache.test.utils import MockMemcacheClient
+
+    from zq_auth_sdk.storage.memcachedstorage import MemcachedStorage
+
+    storage = MemcachedStorage(MockMemcacheClient())
+    storage.set_many({"a": 1, "b": "2"}, ttl={"a": 30})
+
+    assert storage.get_many(["a", "b", "c"]) == {"a": 1, "b": "2", "c": None}
+
+    storage.delete_many(["a"])
+    assert storage.get("a") is None
+
+
+def test_memory_session_storage_ttl():
+    import time
+    from datetime import timedelta
+
+    from zq_auth_sdk.storage.memorystorage import MemoryStorage
+
+    storage = MemoryStorage()
+    storage.set("a", 1, ttl=0.05)
+    storage.set("b", 2, ttl=timedelta(seconds=60))
+    storage.set("c", 3)
+
+    assert storage.get("a") == 1
+    time.sleep(0.06)
+    assert storage.get("a") is None
+    assert storage.get("b") == 2
+    assert storage.get("c") == 3
+    # 过期后可再次获取租约
+    storage.add("lease", "x", ttl=0.01)
+    time.sleep(0.02)
+    assert storage.add("lease", "y", ttl=30)
+
+
+def test_memory_session_storage_sweep():
+    import time
+
+    from zq_auth_sdk.storage.memorystorage import MemoryStorage
+
+    storage = MemoryStorage()
+    storage.set_many({f"k{i}": i for i in range(100)}, ttl=0.01)
+    storage.set("keep", 1)
+    time.sleep(0.02)
+
+    storage.sweep()
+    assert len(storage) == 1
+    assert storage.get("keep") == 1
+
+
+def test_memory_session_storage_max_entries():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from zq_auth_sdk.storage.memorystorage import MemoryStorage
+
+    storage = MemoryStorage(max_entries=3)
+    storage.set("a", 1)
+    storage.set("b", 2)
+    storage.set("c", 3)
+    storage.get("a")
+    storage.set("d", 4)
+
+    assert storage.get("b") is None  # 最久未使用
+    assert storage.get_many(["a", "c", "d"]) == {"a": 1, "c": 3, "d": 4}
+
+    storage = MemoryStorage(max_entries=50)
+
+    def _worker(n):
+        for i in range(500):
+            storage.set(f"{n}_{i}", i, ttl=1)
+            storage.get(f"{n}_{i - 1}")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(_worker, range(8)))
+
+    assert len(storage) == 50
+
+
+class CasMemcacheClient(MockMemcacheClient):
+    """支持 gets/cas 的 MockMemcacheClient"""
+
+    def __init__(self):
+        super().__init__()
+        self.versions = {}
+
+    def set(self, key, value, expire=0, noreply=True, flags=None):
+        self.versions[key] = self.versions.get(key, 0) + 1
+        return super().set(key, value, expire, noreply, flags)
+
+    def gets(self, key):
+        value = self.get(key)
+        if value is None:
+            return None, None
+        return value, str(self.versions[key]).encode()
+
+    def cas(self, key, value, cas, expire=0, noreply=False):
+        if self.get(key) is None:
+            return None
+        if str(self.versions[key]).encode() != cas:
+            return False
+        return self.set(key, value, expire, noreply)
+
+
+def _increment(record):
+    record = dict(record or {})
+    record["n"] = record.get("n", 0) + 1
+    return record, 30
+
+
+def test_redis_session_storage_update():
+    from fakeredis import FakeStrictRedis
+
+    from zq_auth_sdk.storage.redisstorage import RedisStorage
+
+    redis = FakeStrictRedis()
+    storage = RedisStorage(redis)
+    calls = []
+
+    def _conflict(record):
+        calls.append(record)
+        if len(calls) == 1:
+            storage.set("r", {"n": 10, "other": True})  # 其他进程在读写之间写入
+        return _increment(record)
+
+    assert storage.update("r", _increment) == {"n": 1}
+    assert storage.update("r", _conflict) == {"n": 11, "other": True}
+    assert len(calls) == 2  # 冲突后重新读取
+    assert 0 < redis.ttl(storage.key_name("r")) <= 30
+
+
+def test_memcached_storage_update():
+    from zq_auth_sdk.storage.memcachedstorage import MemcachedStorage
+
+    storage = MemcachedStorage(CasMemcacheClient())
+    calls = []
+
+    def _conflict(record):
+        calls.append(record)
+        if len(calls) == 1:
+            storage.set("r", {"n": 10})
+        return _increment(record)
+
+    assert storage.update("r", _increment) == {"n": 1}
+    assert storage.update("r", _conflict) == {"n": 11}
+    assert len(calls) == 2
+    assert storage.get("r") == {"n": 11}
+
+
+def test_memcached_storage_release_lease():
+    from zq_auth_sdk.storage.memcachedstorage import MemcachedStorage
+
+    mc = CasMemcacheClient()
+    storage = MemcachedStorage(mc)
+    lease = storage.acquire_lease("lease", 30)
+    assert storage.acquire_lease("lease", 30) is None
+
+    storage.release_lease("lease", lease)
+    other = storage.acquire_lease("lease", 30)
+    assert other is not None
+
+    # 旧租约过期后被其他进程获取，不删除其他进程的租约
+    storage.release_lease("lease", lease)
+    assert storage.get("lease") == other
+
+    # 读取 token 与删除之间租约被其他进程获取时 cas 失败
+    gets = mc.gets
+
+    def _gets_then_taken(key):
+        result = gets(key)
+        mc.set(key, storage.serializer.encode("taken"))
+        return result
+
+    mc.gets = _gets_then_taken
+    storage.release_lease("lease", other)
+    assert storage.get("lease") == "taken"
@@ -0,0 +1,194 @@
+from contextlib import contextmanager
+
+import pytest
+import requests
+
+from tests.conftest import load_fixture
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.aio import AsyncZqAuthClient
+from zq_auth_sdk.client.retry import RetryPolicy
+from zq_auth_sdk.exceptions import UserNotFoundException
+from zq_auth_sdk.tracing import Span, Tracer
+
+_API = "https://api.cas.ziqiang.net.cn"
+_TOKEN_INVALID = {"code": "A0221", "msg": "", "detail": "", "data": None}
+
+
+class RecordedSpan(Span):
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.exception = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, exception):
+        self.exception = exception
+
+
+class RecordingTracer(Tracer):
+    def __init__(self):
+        self.spans = []
+        self._stack = []
+
+    @contextmanager
+    def start_span(self, name, attributes=None):
+        parent = self._stack[-1].name if self._stack else None
+        span = RecordedSpan(name, attributes, parent)
+        self.spans.append(span)
+        self._stack.append(span)
+        try:
+            yield span
+        except Exception as e:
+            span.record_exception(e)
+            raise
+        finally:
+            self._stack.pop()
+
+    def inject(self, headers):
+        headers["traceparent"] = f"span-{len(self.spans)}"
+
+    def tree(self):
+        return [(span.name, span.parent) for span in self.spans]
+
+
+def test_tracing__login_and_refresh_retry(requests_mock):
+    requests_mock.post(f"{_API}/auth/apps/", json=load_fixture("/auth/apps/"))
+    requests_mock.post(
+        f"{_API}/auth/refresh/", json=load_fixture("/auth/refresh/")
+    )
+    users = requests_mock.get(
+        f"{_API}/users/123/",
+        [
+            {"status_code": 401, "json": _TOKEN_INVALID},
+            {"json": load_fixture("/users/123/")},
+        ],
+    )
+    tracer = RecordingTracer()
+    client = ZqAuthClient(appid="123", secret="123", tracer=tracer)
+
+    client.app.user_info("123")
+
+    assert tracer.tree() == [
+        ("zqauth.refresh", None),
+        ("zqauth.login", "zqauth.refresh"),
+        ("zqauth.request", "zqauth.login"),
+        ("zqauth.request", None),
+        ("zqauth.access_token", "zqauth.request"),
+        ("zqauth.retry", "zqauth.request"),
+        ("zqauth.refresh", "zqauth.retry"),
+        ("zqauth.request", "zqauth.refresh"),
+        ("zqauth.access_token", "zqauth.retry"),
+    ]
+    request = tracer.spans[3]
+    assert request.attributes == {
+        "http.method": "GET",
+        "http.url": f"{_API}/users/123/",
+        "zqauth.endpoint": "GET /users/:id/",
+        "zqauth.code": "00000",
+    }
+    assert tracer.spans[5].attributes["zqauth.retry.reason"] == "token"
+    # 每次发出的请求都注入当前的 trace context
+    assert users.request_history[0].headers["traceparent"] == "span-5"
+    assert users.request_history[1].headers["traceparent"] == "span-9"
+
+
+def test_tracing__connection_retry_and_error(requests_mock):
+    requests_mock.post(f"{_API}/auth/apps/", json=load_fixture("/auth/apps/"))
+    requests_mock.get(
+        f"{_API}/users/123/",
+        [
+            {"exc": requests.ConnectionError},
+            {
+                "status_code": 404,
+                "json": load_fixture("/users/123/", "not_found"),
+            },
+        ],
+    )
+    tracer = RecordingTracer()
+    client = ZqAuthClient(
+        appid="123",
+        secret="123",
+        tracer=tracer,
+        retry_policy=RetryPolicy(sleep=lambda _: None),
+    )
+    tracer.spans.clear()
+
+    with pytest.raises(UserNotFoundException):
+        client.app.user_info("123")
+
+    request, retry = tracer.spans[0], tracer.spans[2]
+    assert retry.name == "zqauth.retry"
+    assert retry.attributes["zqauth.retry.reason"] == "connection_error"
+    assert request.attributes["zqauth.code"] == "A0514"
+    assert request.exception is not None
+
+
+def test_tracing__disabled(zq_client, get_mock):
+    get_mock("/users/123/")
+
+    zq_client.app.user_info("123")
+
+    assert zq_client.tracer is None
+
+
+@pytest.mark.asyncio
+async def test_tracing__async_client(respx_mock):
+    respx_mock.post(f"{_API}/auth/apps/").respond(
+        json=load_fixture("/auth/apps/")
+    )
+    users = respx_mock.get(f"{_API}/users/123/").respond(
+        json=load_fixture("/users/123/")
+    )
+    tracer = RecordingTracer()
+    client = AsyncZqAuthClient(appid="123", secret="123", tracer=tracer)
+
+    await client.app.user_info("123")
+
+    assert tracer.tree() == [
+        ("zqauth.request", None),
+        ("zqauth.access_token", "zqauth.request"),
+        ("zqauth.refresh", "zqauth.access_token"),
+        ("zqauth.login", "zqauth.refresh"),
+        ("zqauth.request", "zqauth.login"),
+    ]
+    assert "traceparent" in users.calls.last.request.headers
+    await client.close()
+
+
+def test_tracing__opentelemetry(requests_mock):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+        InMemorySpanExporter,
+    )
+
+    from zq_auth_sdk.tracing import OpenTelemetryTracer
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    requests_mock.post(f"{_API}/auth/apps/", json=load_fixture("/auth/apps/"))
+    users = requests_mock.get(
+        f"{_API}/users/123/", json=load_fixture("/users/123/")
+    )
+    client = ZqAuthClient(
+        appid="123",
+        secret="123",
+        tracer=OpenTelemetryTracer(provider.get_tracer("test")),
+    )
+    exporter.clear()
+
+    client.app.user_info("123")
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    request = spans["zqauth.request"]
+    assert spans["zqauth.access_token"].parent.span_id == (
+        request.context.span_id
+    )
+    assert request.attributes["zqauth.code"] == "00000"
+    traceparent = users.last_request.headers["traceparent"]
+    assert f"{request.context.trace_id:032x}" in traceparent
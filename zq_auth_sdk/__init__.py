@@ -1,17 +1,60 @@
 import logging
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-from zq_auth_sdk.client import ZqAuthClient  # noqa
 from zq_auth_sdk.exceptions import (  # noqa
     APILimitedException,
     AppLoginFailedException,
+    CircuitOpenException,
+    RateLimitExceededException,
     ThirdLoginFailedException,
     UserNotFoundException,
     ZqAuthClientException,
     ZqAuthException,
 )
 
+if TYPE_CHECKING:
+    from zq_auth_sdk.cache import UserInfoCache  # noqa
+    from zq_auth_sdk.client import ZqAuthClient  # noqa
+    from zq_auth_sdk.client.breaker import CircuitBreaker  # noqa
+    from zq_auth_sdk.client.http import HTTPPool  # noqa
+    from zq_auth_sdk.client.ratelimit import (  # noqa
+        RateLimiter,
+        RedisRateLimiter,
+    )
+    from zq_auth_sdk.client.retry import RetryPolicy  # noqa
+    from zq_auth_sdk.metrics import ClientMetrics  # noqa
+    from zq_auth_sdk.tracing import OpenTelemetryTracer  # noqa
+
 __version__ = "0.1.0"
 __author__ = "Nagico"
 
+# 按需导入，避免 import zq_auth_sdk 时加载 requests 等依赖
+_LAZY_ATTRS = {
+    "UserInfoCache": "zq_auth_sdk.cache",
+    "ZqAuthClient": "zq_auth_sdk.client",
+    "CircuitBreaker": "zq_auth_sdk.client.breaker",
+    "HTTPPool": "zq_auth_sdk.client.http",
+    "RateLimiter": "zq_auth_sdk.client.ratelimit",
+    "RedisRateLimiter": "zq_auth_sdk.client.ratelimit",
+    "RetryPolicy": "zq_auth_sdk.client.retry",
+    "ClientMetrics": "zq_auth_sdk.metrics",
+    "OpenTelemetryTracer": "zq_auth_sdk.tracing",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value  # 之后的访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
+
 # Set default logging handler to avoid "No handler found" warnings.
 logging.getLogger(__name__).addHandler(logging.NullHandler())
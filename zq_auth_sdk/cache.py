@@ -0,0 +1,201 @@
+"""
+    zq_auth_sdk.cache
+    ~~~~~~~~~~~~~~~~~
+
+    进程内用户信息缓存
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, NamedTuple
+
+from zq_auth_sdk.entities.info import UserInfo
+from zq_auth_sdk.entities.types import JSONVal
+from zq_auth_sdk.exceptions import UserNotFoundException
+
+
+class _CacheEntry(NamedTuple):
+    value: JSONVal | UserInfo | UserNotFoundException
+    expires_at: float
+
+
+class UserInfoCache:
+    """
+    线程安全的用户信息 LRU 缓存
+
+    以 (union_id, detail) 为 key，用户不存在的结果单独设置较短的有效期（负缓存）。
+    detail=True 的缓存可直接回答 detail=False 的查询。
+    设置 stale_ttl 后，过期的用户信息会再保留 stale_ttl 秒，供接口不可用时降级读取。
+    UserInfo 不可修改，直接共享，不复制。
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        ttl: float = 300,
+        negative_ttl: float = 60,
+        brief_fields: Iterable[str] = ("certify_time",),
+        stale_ttl: float = 0,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param maxsize: 最大缓存条目数，超出时淘汰最久未使用的条目
+        :param ttl: 用户信息有效期 (秒)
+        :param negative_ttl: 用户不存在结果的有效期 (秒)
+        :param brief_fields: detail=False 时接口返回的字段
+        :param stale_ttl: 过期后仍可降级读取的时间 (秒)
+        :param timer: 时钟函数
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.brief_fields = tuple(brief_fields)
+        self.stale_ttl = stale_ttl
+        self._timer = timer
+
+        self._data: OrderedDict[tuple[str, bool], _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _lookup(
+        self, key: tuple[str, bool], now: float, stale: bool = False
+    ) -> _CacheEntry | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            if entry.expires_at + self.stale_ttl <= now:
+                del self._data[key]
+                return None
+            if not stale:
+                return None
+        self._data.move_to_end(key)
+        return entry
+
+    def get(
+        self, union_id: str, detail: bool = True, stale: bool = False
+    ) -> JSONVal | UserInfo | None:
+        """
+        读取缓存
+        :param union_id: 用户 union id
+        :param detail: 是否为详细信息
+        :param stale: 是否允许读取已过期 (stale_ttl 内) 的缓存
+        :return: 用户信息，未命中时返回 None
+
+        :raise UserNotFoundException: 命中负缓存
+        """
+        now = self._timer()
+        brief = False
+        with self._lock:
+            entry = self._lookup((union_id, detail), now, stale)
+            if entry is None:
+                # 详细信息可回答简略查询，用户不存在的结果与 detail 无关
+                other = self._lookup((union_id, not detail), now, stale)
+                if other is not None:
+                    if isinstance(other.value, UserNotFoundException):
+                        entry = other
+                    elif not detail:
+                        entry = other
+                        brief = True
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        value = entry.value
+        if isinstance(value, UserNotFoundException):
+            raise UserNotFoundException(
+                value.errcode,
+                value.errmsg,
+                value.client,
+                value.request,
+                value.response,
+            )
+        if isinstance(value, UserInfo):
+            return value.brief(self.brief_fields) if brief else value
+        if brief:
+            return {k: value[k] for k in self.brief_fields if k in value}
+        return dict(value)
+
+    def set(self, union_id: str, detail: bool, value: JSONVal | UserInfo):
+        """
+        写入用户信息
+        """
+        if not isinstance(value, UserInfo):
+            value = dict(value)
+        self._set((union_id, detail), value, self.ttl)
+
+    def load(self, lines: Iterable[str], typed: bool = False) -> int:
+        """
+        预加载 `zq-auth warm-cache` 输出的 JSON Lines
+        :param lines: 文件对象或行迭代器
+        :param typed: 是否保存为 UserInfo
+        :return: 加载的用户数
+        """
+        count = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("not_found"):
+                continue
+            value = record["data"]
+            if typed:
+                value = UserInfo.from_dict(value, record["union_id"])
+            self.set(record["union_id"], record.get("detail", True), value)
+            count += 1
+        return count
+
+    def set_not_found(
+        self, union_id: str, detail: bool, exception: UserNotFoundException
+    ):
+        """
+        写入用户不存在的结果
+        """
+        self._set((union_id, detail), exception, self.negative_ttl)
+
+    def _set(self, key: tuple[str, bool], value, ttl: float):
+        if ttl <= 0:
+            return
+        entry = _CacheEntry(value, self._timer() + ttl)
+        with self._lock:
+            self._data[key] = entry
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, union_id: str):
+        """
+        删除用户的所有缓存
+        """
+        with self._lock:
+            self._data.pop((union_id, True), None)
+            self._data.pop((union_id, False), None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        缓存统计
+        :return: hits / misses / evictions / size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+            }
@@ -0,0 +1,361 @@
+"""
+    zq_auth_sdk.cli
+    ~~~~~~~~~~~~~~~
+
+    zq-auth 命令行工具
+
+    zq-auth token show --appid KEY --storage redis://localhost:6379/0
+    zq-auth token refresh --appid KEY --secret SECRET --storage redis://...
+    zq-auth warm-cache union_ids.txt -o users.jsonl --concurrency 20
+    zq-auth probe --endpoint user_info --union-id ID -n 200 -c 8
+
+凭证与存储也可通过环境变量 ZQ_AUTH_APPID / ZQ_AUTH_SECRET / ZQ_AUTH_STORAGE /
+ZQ_AUTH_API_BASE_URL / ZQ_AUTH_SESSION_RECORD 指定。
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.exceptions import UserNotFoundException, ZqAuthClientException
+from zq_auth_sdk.storage import SessionStorage
+from zq_auth_sdk.storage.memorystorage import MemoryStorage
+from zq_auth_sdk.utils import now
+
+
+def create_storage(url: str, prefix: str | None = None) -> SessionStorage:
+    """
+    根据 url 创建存储后端
+    :param url: memory:// / redis://host:port/db / memcached://host:port
+    :param prefix: key 前缀，默认使用存储后端的默认前缀
+    """
+    parts = urlsplit(url)
+    kwargs = {} if prefix is None else {"prefix": prefix}
+    if parts.scheme in ("", "memory"):
+        return MemoryStorage()
+    if parts.scheme in ("redis", "rediss", "unix"):
+        import redis
+
+        from zq_auth_sdk.storage.redisstorage import RedisStorage
+
+        return RedisStorage(redis.Redis.from_url(url), **kwargs)
+    if parts.scheme == "memcached":
+        from pymemcache.client.base import Client
+
+        from zq_auth_sdk.storage.memcachedstorage import MemcachedStorage
+
+        return MemcachedStorage(
+            Client((parts.hostname, parts.port or 11211)), **kwargs
+        )
+    raise ValueError(f"Unsupported storage url: {url}")
+
+
+def create_client(args: argparse.Namespace, **kwargs) -> ZqAuthClient:
+    """
+    根据命令行参数创建延迟登录的客户端
+    """
+    return ZqAuthClient(
+        args.appid,
+        args.secret,
+        storage=create_storage(args.storage, args.prefix),
+        api_base_url=args.api_base_url,
+        lazy=True,
+        session_record=args.session_record,
+        **kwargs,
+    )
+
+
+def _mask(value: str | None, show: bool) -> str | None:
+    if value is None or show:
+        return value
+    return f"{value[:8]}..." if len(value) > 8 else "***"
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """
+    最近秩百分位数
+    :param sorted_values: 升序排列的数据
+    :param p: 百分位 (0-100)
+    """
+    if not sorted_values:
+        return math.nan
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _print_json(value):
+    print(json.dumps(value, ensure_ascii=False, indent=2, default=str))
+
+
+# region commands
+def token_info(client: ZqAuthClient, show_tokens: bool = False) -> dict:
+    """
+    存储中的 token 信息，不触发登录
+    """
+    values = client._session_get(
+        "access", "expire_time", "refresh", "id", "name", "username"
+    )
+    expire_time = client._parse_expire_time(values["expire_time"])
+    return {
+        "appid": client.appid,
+        "id": values["id"],
+        "name": values["name"],
+        "username": values["username"],
+        "access_token": _mask(values["access"], show_tokens),
+        "refresh_token": _mask(values["refresh"], show_tokens),
+        "expire_time": expire_time.isoformat() if expire_time else None,
+        "expires_in": (
+            round((expire_time - now()).total_seconds())
+            if expire_time
+            else None
+        ),
+        "session_version": client.session_version,
+    }
+
+
+def cmd_token_show(args: argparse.Namespace) -> int:
+    if urlsplit(args.storage).scheme in ("", "memory"):
+        print("warning: memory:// storage holds no tokens", file=sys.stderr)
+    client = create_client(args)
+    try:
+        info = token_info(client, args.show_tokens)
+    finally:
+        client.close()
+    _print_json(info)
+    return 0 if info["access_token"] else 1
+
+
+def cmd_token_refresh(args: argparse.Namespace) -> int:
+    client = create_client(args)
+    try:
+        if args.login:
+            client.refresh_token = None  # 丢弃 refresh token，重新登录
+        client.refresh_access_token()
+        _print_json(token_info(client, args.show_tokens))
+    finally:
+        client.close()
+    return 0
+
+
+def _read_union_ids(path: str):
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def cmd_warm_cache(args: argparse.Namespace) -> int:
+    client = create_client(args)
+    out = (
+        sys.stdout
+        if args.output == "-"
+        else open(args.output, "w", encoding="utf-8")
+    )
+    fetched = not_found = 0
+    start = time.perf_counter()
+    try:
+        for union_id, result in client.app.iter_user_info(
+            _read_union_ids(args.file), args.detail, args.concurrency
+        ):
+            record = {"union_id": union_id, "detail": args.detail}
+            if isinstance(result, UserNotFoundException):
+                record["not_found"] = True
+                not_found += 1
+            else:
+                record["data"] = result
+                fetched += 1
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        client.close()
+
+    elapsed = time.perf_counter() - start
+    total = fetched + not_found
+    print(
+        f"warmed {total} users ({not_found} not found) in {elapsed:.2f}s, "
+        f"{total / elapsed if elapsed else 0:.1f} users/s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _probe_call(client: ZqAuthClient, args: argparse.Namespace):
+    if args.endpoint == "user_info":
+        return lambda: client.app.user_info(args.union_id, args.detail)
+    if args.endpoint == "app_info":
+        return client.app.app_info
+    return client.app.test
+
+
+def probe(client: ZqAuthClient, args: argparse.Namespace) -> dict:
+    """
+    发起 args.requests 个请求，统计吞吐量与延迟
+    """
+    call = _probe_call(client, args)
+    client.access_token  # 预先登录，不计入延迟
+
+    def timed(_):
+        start = time.perf_counter()
+        try:
+            call()
+        except ZqAuthClientException:
+            ok = False
+        else:
+            ok = True
+        return time.perf_counter() - start, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(timed, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    latency_ms = {
+        name: percentile(latencies, p) * 1000
+        for name, p in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+    }
+    return {
+        "requests": len(results),
+        "errors": sum(1 for _, ok in results if not ok),
+        "elapsed": elapsed,
+        "throughput": len(results) / elapsed if elapsed else 0.0,
+        "latency_ms": latency_ms,
+    }
+
+
+def cmd_probe(args: argparse.Namespace) -> int:
+    if args.endpoint == "user_info" and not args.union_id:
+        print("--union-id is required for user_info", file=sys.stderr)
+        return 2
+    client = create_client(args)
+    try:
+        report = probe(client, args)
+    finally:
+        client.close()
+
+    if args.json:
+        _print_json(report)
+    else:
+        latency = report["latency_ms"]
+        print(
+            f"{report['requests']} requests, {report['errors']} errors "
+            f"in {report['elapsed']:.2f}s ({report['throughput']:.1f} req/s)"
+        )
+        print(
+            "latency (ms): "
+            + "  ".join(
+                f"{name} {value:.1f}" for name, value in latency.items()
+            )
+        )
+    return 1 if report["errors"] else 0
+
+
+# endregion
+
+
+def build_parser() -> argparse.ArgumentParser:
+    env = os.environ.get
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--appid", default=env("ZQ_AUTH_APPID"), help="APP_KEY_ID"
+    )
+    common.add_argument(
+        "--secret", default=env("ZQ_AUTH_SECRET"), help="APP_KEY_SECRET"
+    )
+    common.add_argument(
+        "--storage",
+        default=env("ZQ_AUTH_STORAGE", "memory://"),
+        help="存储后端 memory:// / redis://host:port/db / memcached://host:port",
+    )
+    common.add_argument("--prefix", help="存储 key 前缀，默认使用存储后端的默认值")
+    common.add_argument(
+        "--api-base-url", default=env("ZQ_AUTH_API_BASE_URL"), help="API 地址"
+    )
+    common.add_argument(
+        "--session-record",
+        action="store_true",
+        default=env("ZQ_AUTH_SESSION_RECORD", "").lower() in ("1", "true"),
+        help="session 保存为单条记录 (与应用的 session_record 设置一致)",
+    )
+
+    parser = argparse.ArgumentParser(prog="zq-auth", description="自强统一认证命令行工具")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    token = commands.add_parser("token", help="查看或刷新存储中的 token")
+    token_commands = token.add_subparsers(dest="token_command", required=True)
+    show = token_commands.add_parser(
+        "show", parents=[common], help="查看存储中的 token (不会登录)"
+    )
+    show.set_defaults(func=cmd_token_show)
+    refresh = token_commands.add_parser(
+        "refresh", parents=[common], help="强制刷新 access token"
+    )
+    refresh.add_argument(
+        "--login", action="store_true", help="丢弃 refresh token，重新登录"
+    )
+    refresh.set_defaults(func=cmd_token_refresh)
+    for command in (show, refresh):
+        command.add_argument(
+            "--show-tokens", action="store_true", help="显示完整 token"
+        )
+
+    warm = commands.add_parser(
+        "warm-cache",
+        parents=[common],
+        help="批量获取用户信息，输出可由 UserInfoCache.load 预加载的 JSON Lines",
+    )
+    warm.add_argument("file", help="union id 文件，每行一个，- 为标准输入")
+    warm.add_argument("-o", "--output", default="-", help="输出文件，默认标准输出")
+    warm.add_argument("-c", "--concurrency", type=int, default=10)
+    warm.add_argument(
+        "--brief", dest="detail", action="store_false", help="只获取简略信息"
+    )
+    warm.set_defaults(func=cmd_warm_cache)
+
+    probe_parser = commands.add_parser(
+        "probe", parents=[common], help="测试接口吞吐量与延迟"
+    )
+    probe_parser.add_argument(
+        "--endpoint",
+        choices=("test", "app_info", "user_info"),
+        default="test",
+    )
+    probe_parser.add_argument("--union-id", help="user_info 使用的 union id")
+    probe_parser.add_argument(
+        "--brief", dest="detail", action="store_false", help="只获取简略信息"
+    )
+    probe_parser.add_argument("-n", "--requests", type=int, default=100)
+    probe_parser.add_argument("-c", "--concurrency", type=int, default=4)
+    probe_parser.add_argument("--json", action="store_true", help="输出 JSON")
+    probe_parser.set_defaults(func=cmd_probe)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.appid:
+        parser.error("--appid (or ZQ_AUTH_APPID) is required")
+    if args.func is not cmd_token_show and not args.secret:
+        parser.error("--secret (or ZQ_AUTH_SECRET) is required")
+
+    try:
+        return args.func(args)
+    except ZqAuthClientException as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,6 +25,19 @@ class ZqAuthClient(BaseWeChatClient):
         storage=None,
         timeout=None,
         auto_retry=True,
+        user_cache=None,
+        token_cache_ttl=None,
+        session_record=False,
+        http_pool=None,
+        retry_policy=None,
+        rate_limiter=None,
+        circuit_breaker=None,
+        coalesce_requests=False,
+        api_base_url=None,
+        lazy=False,
+        metrics=None,
+        tracer=None,
+        typed_entities=False,
     ):
         """
         zq auth api 访问
@@ -37,15 +50,49 @@ class ZqAuthClient(BaseWeChatClient):
         :param storage: 存储后端
         :param timeout: 请求超时时长
         :param auto_retry: token过期后是否刷新后重试(默认开启)
-
-        :raise AppLoginFailedException: appid 与 secret 错误
+        :param user_cache: 用户信息缓存 UserInfoCache (可选)
+        :param token_cache_ttl: 进程内 access token 缓存时长 (秒)，0 为不缓存
+        :param session_record: 是否将 session 保存为单条带版本号的记录
+        :param http_pool: 共享的 http 连接池 (可选)，默认创建独立的连接池
+        :param retry_policy: 重试策略 RetryPolicy (可选)，默认不重试
+        :param rate_limiter: 客户端限流 RateLimiter (可选)，可在多个客户端间共享
+        :param circuit_breaker: 熔断器 CircuitBreaker (可选)，可在多个客户端间共享
+        :param coalesce_requests: 是否合并相同的进行中 GET 请求
+        :param api_base_url: API 地址 (可选)，如本地模拟服务器地址
+        :param lazy: 是否延迟到首次使用时再登录 (默认在构造时登录)
+        :param metrics: 指标收集 ClientMetrics (可选)，可在多个客户端间共享
+        :param tracer: 链路追踪 Tracer (可选)，如 OpenTelemetryTracer
+        :param typed_entities: user_info / app_info 是否返回 UserInfo / AppInfo，
+            默认返回 dict
+
+        :raise AppLoginFailedException: appid 与 secret 错误 (lazy=False)
 
         """
-        super().__init__(appid, access_token, storage, timeout, auto_retry)
+        if api_base_url is not None:
+            self.API_BASE_URL = api_base_url
+        super().__init__(
+            appid,
+            access_token,
+            storage,
+            timeout,
+            auto_retry,
+            token_cache_ttl,
+            session_record,
+            http_pool,
+            retry_policy,
+            rate_limiter,
+            circuit_breaker,
+            coalesce_requests,
+            metrics,
+            tracer,
+        )
         self.appid = appid
         self.secret = secret
+        self.user_cache = user_cache
+        self.typed_entities = typed_entities
 
-        self.refresh_access_token()
+        if not lazy:
+            self.refresh_access_token()
 
     def login(self) -> JSONVal:
         """
@@ -60,6 +107,8 @@ class ZqAuthClient(BaseWeChatClient):
                 "app_secret": self.secret,
             },
             auth=False,
+            auto_retry=False,
+            idempotent=True,
         )
 
     def refresh(self) -> JSONVal:
@@ -74,4 +123,6 @@ class ZqAuthClient(BaseWeChatClient):
                 "refresh": self.refresh_token,
             },
             auth=False,
+            auto_retry=False,
+            idempotent=True,
         )
@@ -0,0 +1,122 @@
+from zq_auth_sdk.client import ZqAuthClient
+from zq_auth_sdk.client.aio import api
+from zq_auth_sdk.client.aio.base import AsyncBaseWeChatClient
+from zq_auth_sdk.entities.types import JSONVal
+
+
+class AsyncZqAuthClient(AsyncBaseWeChatClient):
+
+    """
+    zq auth API asyncio 操作类
+    需要安装 httpx: `pip install zq-auth-sdk[async]`
+    """
+
+    API_BASE_URL = ZqAuthClient.API_BASE_URL
+
+    ACCESS_LIFETIME = ZqAuthClient.ACCESS_LIFETIME
+    REFRESH_LIFETIME = ZqAuthClient.REFRESH_LIFETIME
+
+    app = api.AsyncZqAuthApp()
+
+    def __init__(
+        self,
+        appid,
+        secret,
+        access_token=None,
+        storage=None,
+        timeout=None,
+        auto_retry=True,
+        user_cache=None,
+        token_cache_ttl=None,
+        session_record=False,
+        http_pool=None,
+        retry_policy=None,
+        rate_limiter=None,
+        circuit_breaker=None,
+        coalesce_requests=False,
+        api_base_url=None,
+        metrics=None,
+        tracer=None,
+        typed_entities=False,
+    ):
+        """
+        zq auth api asyncio 访问
+
+        与 ZqAuthClient 不同，构造时不会登录，
+        首次请求或调用 `await client.refresh_access_token()` 时才会登录
+
+        :param appid: APP_KEY_ID
+        :param secret: APP_KEY_SECRET
+        :param access_token: access token (可选)
+        :param storage: 存储后端
+        :param timeout: 请求超时时长
+        :param auto_retry: token过期后是否刷新后重试(默认开启)
+        :param user_cache: 用户信息缓存 UserInfoCache (可选)
+        :param token_cache_ttl: 进程内 access token 缓存时长 (秒)，0 为不缓存
+        :param session_record: 是否将 session 保存为单条带版本号的记录
+        :param http_pool: 共享的 http 连接池 (可选)，默认创建独立的连接池
+        :param retry_policy: 重试策略 RetryPolicy (可选)，默认不重试
+        :param rate_limiter: 客户端限流 RateLimiter (可选)，可在多个客户端间共享
+        :param circuit_breaker: 熔断器 CircuitBreaker (可选)，可在多个客户端间共享
+        :param coalesce_requests: 是否合并相同的进行中 GET 请求
+        :param api_base_url: API 地址 (可选)，如本地模拟服务器地址
+        :param metrics: 指标收集 ClientMetrics (可选)，可在多个客户端间共享
+        :param tracer: 链路追踪 Tracer (可选)，如 OpenTelemetryTracer
+        :param typed_entities: user_info / app_info 是否返回 UserInfo / AppInfo，
+            默认返回 dict
+        """
+        if api_base_url is not None:
+            self.API_BASE_URL = api_base_url
+        super().__init__(
+            appid,
+            access_token,
+            storage,
+            timeout,
+            auto_retry,
+            token_cache_ttl,
+            session_record,
+            http_pool,
+            retry_policy,
+            rate_limiter,
+            circuit_breaker,
+            coalesce_requests,
+            metrics,
+            tracer,
+        )
+        self.appid = appid
+        self.secret = secret
+        self.user_cache = user_cache
+        self.typed_entities = typed_entities
+
+    async def login(self) -> JSONVal:
+        """
+        app 登录
+
+        https://console-docs.apipost.cn/preview/7abdc86c0ce49501/bf92b4d8832fa312?target_id=f3dd4470-fee8-4bcf-a9f1-7570c4392068
+        """
+        return await self.post(
+            url="/auth/apps/",
+            data={
+                "app_key": self.appid,
+                "app_secret": self.secret,
+            },
+            auth=False,
+            auto_retry=False,
+            idempotent=True,
+        )
+
+    async def refresh(self) -> JSONVal:
+        """
+        刷新 token
+
+        https://console-docs.apipost.cn/preview/7abdc86c0ce49501/bf92b4d8832fa312?target_id=07dafe85-2142-4b00-8477-47d8350a9a54
+        """
+        return await self.post(
+            url="/auth/refresh/",
+            data={
+                "refresh": self.refresh_token,
+            },
+            auth=False,
+            auto_retry=False,
+            idempotent=True,
+        )
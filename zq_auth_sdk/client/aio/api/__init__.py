@@ -0,0 +1 @@
+from zq_auth_sdk.client.aio.api.app import AsyncZqAuthApp  # noqa
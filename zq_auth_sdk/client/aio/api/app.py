@@ -0,0 +1,171 @@
+import asyncio
+import uuid
+from typing import AsyncIterator, Iterable
+
+from zq_auth_sdk.client.api.app import (
+    DEFAULT_CONCURRENCY,
+    SSO_EXCEPTIONS,
+    USER_INFO_EXCEPTIONS,
+    app_result,
+    normalize_union_id,
+    unique_union_ids,
+    user_result,
+)
+from zq_auth_sdk.client.api.base import BaseZqAuthAPI
+from zq_auth_sdk.entities.types import JSONVal
+from zq_auth_sdk.exceptions import CircuitOpenException, UserNotFoundException
+
+
+class AsyncZqAuthApp(BaseZqAuthAPI):
+    """ZqAuthApp 的 asyncio 版本，所有方法均需 await"""
+
+    async def test(self):
+        """
+        测试接口
+
+        https://console-docs.apipost.cn/preview/7abdc86c0ce49501/bf92b4d8832fa312?target_id=ca539c47-8e3e-4314-a560-2913a36294b0  # noqa
+        """
+        return await self._get("/")
+
+    async def app_info(self):
+        """
+        获取 app 信息
+
+        https://console-docs.apipost.cn/preview/7abdc86c0ce49501/bf92b4d8832fa312?target_id=b66a33e6-ae37-4841-a540-69c1c07c133d  # noqa
+        """
+        app_id = await self._client.get_id()
+        return app_result(
+            await self._get(f"/apps/{app_id}/"), self.typed_entities
+        )
+
+    async def sso(self, code: str):
+        """
+        sso 单点登录 获取用户 union id
+
+        https://console-docs.apipost.cn/preview/7abdc86c0ce49501/bf92b4d8832fa312?target_id=b66a33e6-ae37-4841-a540-69c1c07c133d  # noqa
+
+        :param code: 临时 code
+
+        :raise ThirdLoginFailedException: code 无效
+        """
+        return await self._post(
+            url="/sso/union-id/",
+            data={"code": code},
+            idempotent=False,  # code 只能使用一次
+            exceptions=SSO_EXCEPTIONS,
+        )
+
+    async def user_info(self, union_id: uuid.UUID | str, detail: bool = True):
+        """
+        获取用户信息
+
+        https://console-docs.apipost.cn/preview/7abdc86c0ce49501/bf92b4d8832fa312?target_id=1fad0fc0-12f9-4dc2-8ed6-cdffa2b2fd4e  # noqa
+
+        :param union_id: 用户 union id
+        :param detail: 是否返回详细信息
+
+        :return: 用户信息，typed_entities 时为 UserInfo
+
+        :raise UserNotFountException: union-id 无效 (用户解除绑定)
+
+        启用 user_cache 时优先从缓存读取
+        """
+        if isinstance(union_id, uuid.UUID):
+            union_id = union_id.hex
+
+        cache = self.user_cache
+        if cache is not None:
+            cache_key = normalize_union_id(union_id)
+            result = cache.get(cache_key, detail)
+            if result is not None:
+                return user_result(result, cache_key, self.typed_entities)
+
+        try:
+            result = await self._get(
+                f"/users/{union_id}/",
+                params={"detail": detail},
+                exceptions=USER_INFO_EXCEPTIONS,
+            )
+        except CircuitOpenException:
+            # 接口熔断时降级读取已过期的缓存
+            if cache is not None:
+                result = cache.get(cache_key, detail, stale=True)
+                if result is not None:
+                    return user_result(result, cache_key, self.typed_entities)
+            raise
+        except UserNotFoundException as e:
+            if cache is not None:
+                cache.set_not_found(cache_key, detail, e)
+            raise
+
+        result = user_result(result, union_id, self.typed_entities)
+        if cache is not None:
+            cache.set(cache_key, detail, result)
+        return result
+
+    async def iter_user_info(
+        self,
+        union_ids: Iterable[uuid.UUID | str],
+        detail: bool = True,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> AsyncIterator[tuple[str, JSONVal | UserNotFoundException]]:
+        """
+        并发批量获取用户信息，按完成顺序逐个返回
+
+        :param union_ids: 用户 union id 列表，重复项只请求一次
+        :param detail: 是否返回详细信息
+        :param concurrency: 最大并发请求数
+        :return: (union id hex, 用户信息或 UserNotFoundException) 异步迭代器
+
+        :raise ZqAuthClientException: 除用户不存在外的其他错误
+        """
+        union_ids = unique_union_ids(union_ids)
+        await self._client.get_access_token()  # 预先登录
+
+        async def fetch(union_id: str):
+            try:
+                return union_id, await self.user_info(union_id, detail)
+            except UserNotFoundException as e:
+                return union_id, e
+
+        pending = set()
+        try:
+            while True:
+                for union_id in union_ids:
+                    pending.add(asyncio.ensure_future(fetch(union_id)))
+                    if len(pending) >= concurrency:
+                        break
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def user_info_many(
+        self,
+        union_ids: Iterable[uuid.UUID | str],
+        detail: bool = True,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> dict[str, JSONVal | UserNotFoundException]:
+        """
+        并发批量获取用户信息
+
+        :param union_ids: 用户 union id 列表，重复项只请求一次
+        :param detail: 是否返回详细信息
+        :param concurrency: 最大并发请求数
+        :return: union id hex -> 用户信息，用户不存在时为 UserNotFoundException
+
+        :raise ZqAuthClientException: 除用户不存在外的其他错误
+        """
+        return {
+            union_id: result
+            async for union_id, result in self.iter_user_info(
+                union_ids, detail, concurrency
+            )
+        }
@@ -0,0 +1,631 @@
+import asyncio
+import logging
+import time
+from functools import partial
+from typing import Awaitable, Callable
+
+import httpx
+
+from zq_auth_sdk.client.aio.coalesce import AsyncRequestCoalescer
+from zq_auth_sdk.client.aio.http import AsyncHTTPPool
+from zq_auth_sdk.client.aio.refresher import AsyncTokenRefresher
+from zq_auth_sdk.client.base import BaseWeChatClient
+from zq_auth_sdk.client.coalesce import request_key
+from zq_auth_sdk.client.retry import RetryPolicy, RetryState
+from zq_auth_sdk.entities.response import (
+    SUCCESS_CODE,
+    THROTTLED_CODE,
+    TOKEN_INVALID_CODE,
+    ZqAuthResponse,
+    ZqAuthResponseType,
+)
+from zq_auth_sdk.entities.types import JSONVal
+from zq_auth_sdk.exceptions import CircuitOpenException, ZqAuthClientException
+from zq_auth_sdk.metrics import endpoint_key
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBaseWeChatClient(BaseWeChatClient):
+    """
+    asyncio 客户端基类
+
+    请求通过 httpx.AsyncClient 发出，所有请求方法均为协程。
+    存储后端仍为同步调用。
+    """
+
+    _http: httpx.AsyncClient
+    http_pool: AsyncHTTPPool
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._refresh_lock = asyncio.Lock()
+
+    def _create_http_pool(self) -> AsyncHTTPPool:
+        """
+        创建 http 连接池
+        """
+        return AsyncHTTPPool()
+
+    def _create_coalescer(self) -> AsyncRequestCoalescer:
+        """
+        创建请求合并器
+        """
+        return AsyncRequestCoalescer()
+
+    async def close(self):
+        """
+        停止后台刷新任务，关闭客户端创建的 http 连接池
+        """
+        await self.stop_token_refresher()
+        if self._owns_http_pool:
+            await self.http_pool.close()
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' for AsyncZqAuthClient")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    # region storage
+    @property
+    def access_token(self) -> str | None:
+        """
+        已保存的 access token
+
+        不会自动刷新，获取有效 token 请使用 `await client.get_access_token()`
+        """
+        return self._stored_access_token()
+
+    @access_token.setter
+    def access_token(self, value):
+        if value is not None:
+            self._session_set(access=value)
+
+    async def get_access_token(self) -> str:
+        """
+        获取有效的 access token，即将过期时自动刷新
+        """
+        access_token = self._get_valid_access_token()
+        if access_token:
+            return access_token
+
+        async with self._refresh_lock:
+            # 等待期间可能已被其他协程刷新
+            access_token = self._get_valid_access_token()
+            if access_token:
+                return access_token
+
+            logger.info("Fetching access token")
+            stale_token = self._stored_access_token()
+            await self._with_refresh_lease(
+                self._refresh, lambda: self._token_refreshed(stale_token)
+            )
+            return self._stored_access_token()
+
+    @property
+    def id(self) -> int | None:
+        """ZqAuth id (不会自动登录)"""
+        return self._session_get("id")["id"]
+
+    @id.setter
+    def id(self, value: int):
+        if value is not None:
+            self._session_set(id=value)
+
+    @property
+    def name(self) -> str | None:
+        """ZqAuth name (不会自动登录)"""
+        return self._session_get("name")["name"]
+
+    @name.setter
+    def name(self, value: str):
+        if value is not None:
+            self._session_set(name=value)
+
+    @property
+    def username(self) -> str | None:
+        """ZqAuth username (不会自动登录)"""
+        return self._session_get("username")["username"]
+
+    @username.setter
+    def username(self, value: str):
+        if value is not None:
+            self._session_set(username=value)
+
+    @property
+    def identity(self) -> dict:
+        """
+        APP 信息 (id, name, username)，不会自动登录
+        """
+        return self._session_get("id", "name", "username")
+
+    async def get_identity(self) -> dict:
+        """
+        APP 信息 (id, name, username)，不存在时自动登录
+        """
+        values = self.identity
+        if any(value is None for value in values.values()):
+            await self._get_or_login("id")
+            values = self.identity
+        return values
+
+    async def _get_or_login(self, field: str):
+        res = self._session_get(field)[field]
+        if res is None:
+            async with self._refresh_lock:
+                res = self._session_get(field)[field]
+                if res is None:
+                    await self._with_refresh_lease(
+                        self._login,
+                        lambda: self._session_get(field)[field] is not None,
+                    )
+                    res = self._session_get(field)[field]
+        return res
+
+    async def _with_refresh_lease(
+        self,
+        action: Callable[[], Awaitable[None]],
+        done: Callable[[], bool],
+    ):
+        """
+        跨进程单飞刷新
+
+        只有获取到存储后端租约的进程执行 action，
+        其余进程轮询存储直到 done() 成立，超时后自行执行 action
+
+        :param action: 刷新/登录操作
+        :param done: 判断其他进程是否已完成刷新
+        """
+        lease = self.storage.acquire_lease(
+            self.refresh_lease_key, self.REFRESH_LEASE_TTL
+        )
+        if lease is None:
+            logger.info("Another worker is refreshing access token, waiting")
+            deadline = time.monotonic() + self.REFRESH_LEASE_WAIT
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.REFRESH_LEASE_POLL_INTERVAL)
+                if done():
+                    return
+            logger.warning("Waiting for refresh lease timed out, refresh now")
+            await action()
+            return
+
+        try:
+            if not done():
+                await action()
+        finally:
+            self.storage.release_lease(self.refresh_lease_key, lease)
+
+    async def get_id(self) -> int:
+        """ZqAuth id，不存在时自动登录"""
+        return await self._get_or_login("id")
+
+    async def get_name(self) -> str:
+        """ZqAuth name，不存在时自动登录"""
+        return await self._get_or_login("name")
+
+    async def get_username(self) -> str:
+        """ZqAuth username，不存在时自动登录"""
+        return await self._get_or_login("username")
+
+    # endregion
+
+    async def _request(
+        self,
+        method: str,
+        url_or_endpoint: str,
+        auth: bool = True,
+        params: dict | None = None,
+        data: str | bytes | dict | None = None,
+        timeout: int | None = None,
+        result_processor: Callable[[JSONVal], JSONVal] = None,
+        auto_retry: bool | None = None,
+        retry_policy: RetryPolicy | None = None,
+        idempotent: bool | None = None,
+        exceptions: dict[str, type[ZqAuthClientException]] | None = None,
+        retry_state: RetryState | None = None,
+        **kwargs,
+    ) -> JSONVal:
+        """
+        发起请求
+        :param method: 请求方法
+        :param url_or_endpoint: 请求地址
+        :param auth: 是否使用token认证（默认开启）
+        :param params: 请求query参数
+        :param data: 请求体
+        :param timeout: 超时时长
+        :param result_processor: 结果处理函数
+        :param auto_retry: token过期是否自动重试
+        :param retry_policy: 该请求的重试策略，默认使用客户端的重试策略
+        :param idempotent: 请求是否可以安全重试，默认根据请求方法判断
+        :param exceptions: 该接口 code -> 异常类型，优先于默认映射
+        :param retry_state: 重试状态 (重试时内部传递)
+        :param kwargs:
+        :return: JSON 返回
+        """
+        url = self._build_url(url_or_endpoint, kwargs)
+        self._build_kwargs(params, data, timeout, kwargs)
+
+        if retry_state is None:
+            policy = (
+                retry_policy if retry_policy is not None else self.retry_policy
+            )
+            retry_state = policy.start(method, idempotent)
+
+            coalesce = self.coalescer is not None and method.upper() == "GET"
+            if coalesce or self.tracer is not None:
+                send = partial(
+                    self._request,
+                    method=method,
+                    url_or_endpoint=url,
+                    auth=auth,
+                    result_processor=result_processor,
+                    auto_retry=auto_retry,
+                    retry_state=retry_state,
+                    exceptions=exceptions,
+                    **kwargs,
+                )
+                if coalesce:
+                    # 合并相同的进行中 GET 请求
+                    key = request_key(
+                        method, url, kwargs["params"], auth, result_processor
+                    )
+                    send = partial(self.coalescer.do, key, send)
+                if self.tracer is None:
+                    return await send()
+                return await self._traced_request(method, url, send)
+
+        # 熔断时快速失败，不占用限流令牌，也不触发登录/刷新
+        if self.circuit_breaker is not None:
+            try:
+                self.circuit_breaker.before(
+                    self.circuit_breaker.circuit_key(method, url)
+                )
+            except CircuitOpenException:
+                result = self._circuit_fallback(method, url, kwargs)
+                if result is None:
+                    raise
+                # 降级结果与接口 data 格式相同，同样经过 result_processor
+                return result_processor(result) if result_processor else result
+
+        await self._prepare_send(method, url, auth, kwargs)
+
+        if isinstance(kwargs["data"], (str, bytes)):
+            # httpx 中原始请求体使用 content 传入
+            kwargs["content"] = kwargs.pop("data")
+
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        try:
+            response = await self._http.request(
+                method=method, url=url, **kwargs
+            )  # 发起请求
+        except httpx.TransportError as e:
+            self._record_circuit(method, url, False)
+            delay = retry_state.retry_error()
+            if metrics is not None:
+                self._record_error_metrics(method, url, start, delay)
+            if delay is None:
+                raise
+            logger.warning(f"Request failed: {e!r}, retry in {delay:.2f}s")
+            with self._retry_span("connection_error", retry_state):
+                await asyncio.sleep(delay)
+                return await self._request(
+                    method=method,
+                    url_or_endpoint=url,
+                    auth=auth,
+                    result_processor=result_processor,
+                    auto_retry=auto_retry,
+                    retry_state=retry_state,
+                    exceptions=exceptions,
+                    **kwargs,
+                )
+        except BaseException:
+            # 其他异常 (如响应解码失败) 也要记录，否则半开探测名额不会释放
+            self._record_circuit(method, url, False)
+            raise
+
+        if metrics is not None:
+            metrics.observe_request(
+                endpoint_key(method, url), time.perf_counter() - start
+            )
+        logger.debug(f"Request: {method} {url}")
+
+        return await self._handle_result(
+            response,
+            method,
+            url,
+            result_processor,
+            auto_retry,
+            retry_state,
+            exceptions,
+            **kwargs,
+        )
+
+    async def _prepare_send(
+        self, method: str, url: str, auth: bool, kwargs: dict
+    ):
+        """
+        获取限流令牌并准备请求头，失败时归还熔断器的半开探测名额
+        """
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+
+            await self._prepare_headers(auth, kwargs)
+        except BaseException:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.release(
+                    self.circuit_breaker.circuit_key(method, url)
+                )
+            raise
+
+    async def _prepare_headers(self, auth: bool, kwargs: dict):
+        """
+        设置认证请求头，注入 trace context
+        """
+        headers = kwargs.setdefault("headers", {})
+        if self.tracer is None:
+            if auth:
+                headers[
+                    "Authorization"
+                ] = f"Bearer {await self.get_access_token()}"
+            return
+
+        if auth:
+            # 包含读取存储与可能的刷新
+            with self.tracer.start_span("zqauth.access_token"):
+                access_token = await self.get_access_token()
+            headers["Authorization"] = f"Bearer {access_token}"
+        self.tracer.inject(headers)
+
+    async def _traced_request(
+        self, method: str, url: str, send: Callable[[], Awaitable[JSONVal]]
+    ) -> JSONVal:
+        """
+        在请求 span 内发起请求 (包括重试)
+        """
+        with self._request_span(method, url) as span:
+            try:
+                result = await send()
+            except ZqAuthClientException as e:
+                self._set_span_result(span, e)
+                raise
+            self._set_span_result(span)
+            return result
+
+    async def _handle_result(
+        self,
+        response: httpx.Response,
+        method: str | None = None,
+        url: str | None = None,
+        result_processor: Callable[[JSONVal], JSONVal] = None,
+        auto_retry: bool | None = None,
+        retry_state: RetryState | None = None,
+        exceptions: dict[str, type[ZqAuthClientException]] | None = None,
+        **kwargs,
+    ) -> JSONVal:
+        try:
+            response = ZqAuthResponse(response, self)
+        except BaseException:
+            # 非 JSON 或缺少 code 的响应 (如网关错误页)，同时释放半开探测名额
+            self._record_circuit(method, url, False)
+            raise
+        code = response.code
+        if self.circuit_breaker is not None:
+            self._record_circuit(method, url, not code.startswith(("B", "C")))
+        if self.metrics is not None and url is not None:
+            self.metrics.observe_code(endpoint_key(method or "get", url), code)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record(code == THROTTLED_CODE)
+
+        if code != SUCCESS_CODE:
+            if auto_retry is None:
+                auto_retry = self.auto_retry
+            if auto_retry and code == TOKEN_INVALID_CODE:
+                logger.info(
+                    "Access token expired, fetch a new one and retry request"
+                )
+                self._record_retry_metrics(method, url, "token")
+                with self._retry_span("token", retry_state):
+                    # 刷新 access token
+                    await self.refresh_access_token(
+                        stale_token=self._get_request_token(kwargs)
+                    )
+                    # 重试请求
+                    return await self._request(
+                        method=method,
+                        url_or_endpoint=url,
+                        result_processor=result_processor,
+                        auto_retry=False,
+                        retry_state=retry_state,
+                        exceptions=exceptions,
+                        **kwargs,
+                    )
+
+            delay = self._get_retry_delay(response, retry_state)
+            if delay is not None:
+                self._record_retry_metrics(method, url, code)
+                with self._retry_span(code, retry_state):
+                    await asyncio.sleep(delay)
+                    return await self._request(
+                        method=method,
+                        url_or_endpoint=url,
+                        auth=self._get_request_token(kwargs) is not None,
+                        result_processor=result_processor,
+                        auto_retry=auto_retry,
+                        retry_state=retry_state,
+                        exceptions=exceptions,
+                        **kwargs,
+                    )
+
+            self._check_response(response, exceptions)
+
+        return self._process_result(response, result_processor)
+
+    async def get(
+        self,
+        url: str,
+        auth: bool = True,
+        params: dict | None = None,
+        data: str | bytes | dict | None = None,
+        timeout: int | None = None,
+        result_processor: Callable[[JSONVal], JSONVal] = None,
+        auto_retry: bool | None = None,
+        **kwargs,
+    ):
+        """
+        GET 请求
+        :param url: 请求地址
+        :param auth: 是否使用token认证（默认开启）
+        :param params: 请求query参数
+        :param data: 请求体
+        :param timeout: 超时时长
+        :param result_processor: 结果处理函数
+        :param auto_retry: token过期是否自动重试
+        :param kwargs:
+        :return: JSON 返回
+        """
+        return await self._request(
+            method="get",
+            url_or_endpoint=url,
+            auth=auth,
+            params=params,
+            data=data,
+            timeout=timeout,
+            result_processor=result_processor,
+            auto_retry=auto_retry,
+            **kwargs,
+        )
+
+    async def post(
+        self,
+        url: str,
+        auth: bool = True,
+        params: dict | None = None,
+        data: str | bytes | dict | None = None,
+        timeout: int | None = None,
+        result_processor: Callable[[JSONVal], JSONVal] = None,
+        auto_retry: bool | None = None,
+        **kwargs,
+    ):
+        """
+        POST 请求
+        :param url: 请求地址
+        :param auth: 是否使用token认证（默认开启）
+        :param params: 请求query参数
+        :param data: 请求体
+        :param timeout: 超时时长
+        :param result_processor: 结果处理函数
+        :param auto_retry: token过期是否自动重试
+        :param kwargs:
+        :return: JSON 返回
+        """
+        return await self._request(
+            method="post",
+            url_or_endpoint=url,
+            auth=auth,
+            params=params,
+            data=data,
+            timeout=timeout,
+            result_processor=result_processor,
+            auto_retry=auto_retry,
+            **kwargs,
+        )
+
+    async def refresh_access_token(self, stale_token: str | None = None):
+        """
+        fetch access token
+
+        同一客户端内同时只有一个协程刷新，其余协程等待并复用新的 token；
+        存储后端支持租约时，多个进程间同时也只有一个进程刷新
+
+        :param stale_token: 已失效的 access token，
+            若等待期间 token 已被其他协程更新则不再重复刷新
+        """
+        async with self._refresh_lock:
+            self._token_cache = None
+            if stale_token is None:
+                stale_token = self._stored_access_token()
+            elif self._token_refreshed(stale_token):
+                return
+
+            logger.info("Fetching access token")
+            await self._with_refresh_lease(
+                self._refresh, lambda: self._token_refreshed(stale_token)
+            )
+
+    def start_token_refresher(
+        self, margin: float = 300, jitter: float = 60
+    ) -> AsyncTokenRefresher:
+        """
+        启动后台 token 刷新任务，需在事件循环中调用
+        :param margin: 提前刷新时间 (秒)
+        :param jitter: 随机提前的最大时间 (秒)
+        :return: 后台刷新器
+        """
+        if self._token_refresher is None:
+            self._token_refresher = AsyncTokenRefresher(self, margin, jitter)
+        self._token_refresher.start()
+        return self._token_refresher
+
+    async def stop_token_refresher(self):
+        """
+        停止后台 token 刷新任务
+        """
+        if self._token_refresher is not None:
+            await self._token_refresher.stop()
+            self._token_refresher = None
+
+    async def login(self) -> JSONVal:
+        """
+        登录接口，用于获取 access_token 和 refresh_token (可选)
+        :return: 响应
+        """
+        raise NotImplementedError()
+
+    async def _login(self):
+        """
+        登录，完善APP信息
+        :return:
+        """
+        logger.info("login using credentials")
+        with self._span("zqauth.login", {"zqauth.appid": self.appid}):
+            try:
+                with self._time_auth("login"):
+                    result = await self.login()
+            except ZqAuthClientException as e:
+                self._raise_login_exception(e)
+
+            self._save_login_result(result)
+
+    async def refresh(self) -> JSONVal:
+        """
+        刷新 access_token
+        """
+        raise NotImplementedError()
+
+    async def _refresh(self):
+        logger.info("refresh access_token")
+        with self._span("zqauth.refresh", {"zqauth.appid": self.appid}):
+            if self.refresh_token is None:
+                await self._login()
+                return
+
+            try:
+                with self._time_auth("refresh"):
+                    result = await self.refresh()
+                self._save_refresh_result(result)
+            except ZqAuthClientException as e:
+                if (
+                    e.errcode == ZqAuthResponseType.RefreshTokenInvalid.code
+                ):  # refresh token 过期
+                    self.refresh_token = None
+                    await self._login()
+                else:
+                    raise e
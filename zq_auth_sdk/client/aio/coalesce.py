@@ -0,0 +1,60 @@
+import asyncio
+import copy
+from typing import Awaitable, Callable
+
+from zq_auth_sdk.client.coalesce import _RETRY, RequestCoalescer
+from zq_auth_sdk.entities.types import JSONVal
+
+
+class AsyncRequestCoalescer(RequestCoalescer):
+    """
+    合并相同的进行中请求 (asyncio)
+
+    相同 key 的请求同时进行时只有第一个协程真正发出请求，
+    其余协程等待并共享其结果或异常。仅应用于幂等请求。
+    发起方被取消时由一个等待方接替重新发起请求。
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._calls: dict[tuple, asyncio.Future] = {}
+
+    async def do(
+        self, key: tuple, func: Callable[[], Awaitable[JSONVal]]
+    ) -> JSONVal:
+        """
+        执行请求，相同 key 的请求进行中时等待其结果
+        :param key: 请求 key
+        :param func: 发出请求的协程函数
+        :return: 请求结果 (合并的请求得到结果的副本)
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                break
+            self.saved += 1
+            # shield: 等待方被取消时不影响发起方
+            result = await asyncio.shield(future)
+            if result is not _RETRY:
+                return copy.deepcopy(result)
+            self.saved -= 1  # 由其中一个等待方接替发起请求
+
+        future = self._calls[key] = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            # 发起方被取消 (如 wait_for 超时) 不代表请求失败，
+            # 不取消共享的 future，等待方重新发起请求
+            future.set_result(_RETRY)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 没有等待方时避免 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
@@ -0,0 +1,61 @@
+import httpx
+
+
+class AsyncHTTPPool:
+    """
+    asyncio HTTP 连接池
+
+    基于 httpx.AsyncClient，可在同一事件循环的多个客户端间共享。
+    由客户端创建的连接池在客户端 close 时关闭；
+    传入客户端的共享连接池需由调用方关闭。
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = 100,
+        max_keepalive_connections: int | None = 20,
+        keepalive_expiry: float | None = 5.0,
+        http2: bool = False,
+    ):
+        """
+        :param max_connections: 最大连接数
+        :param max_keepalive_connections: 最大空闲 keep-alive 连接数
+        :param keepalive_expiry: 空闲 keep-alive 连接保留时长 (秒)
+        :param http2: 是否启用 HTTP/2 (需要安装 httpx[http2])
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.session = httpx.AsyncClient(limits=self.limits, http2=http2)
+
+    @property
+    def closed(self) -> bool:
+        return self.session.is_closed
+
+    def stats(self) -> dict[str, int]:
+        """
+        连接池统计
+        :return: in_use (使用中的连接数) / idle (空闲连接数)；
+            httpx 内部结构变化导致无法读取时返回空字典
+        """
+        # httpx 未公开连接池状态，只能读取 httpcore 连接池，读取失败时不报错
+        try:
+            connections = list(self.session._transport._pool.connections)
+            idle = sum(1 for c in connections if c.is_idle())
+        except (AttributeError, TypeError):
+            return {}
+        return {"in_use": len(connections) - idle, "idle": idle}
+
+    async def close(self):
+        """
+        关闭连接池，释放所有连接
+        """
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,75 @@
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING
+
+from zq_auth_sdk.client.refresher import TokenRefresher
+
+if TYPE_CHECKING:
+    from zq_auth_sdk.client.aio.base import AsyncBaseWeChatClient
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTokenRefresher(TokenRefresher):
+    """
+    后台 access token 刷新 (asyncio task 版本)
+
+    需在事件循环中启动，停止时需 await
+    """
+
+    client: "AsyncBaseWeChatClient"
+
+    def __init__(self, client: "AsyncBaseWeChatClient", *args, **kwargs):
+        super().__init__(client, *args, **kwargs)
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """
+        启动后台刷新任务
+        """
+        if self.running:
+            return
+        self._task = asyncio.get_running_loop().create_task(
+            self._run(), name=f"zq_auth_token_refresher_{self.client.appid}"
+        )
+
+    async def stop(self, timeout: float | None = None):
+        """
+        停止后台刷新任务
+        """
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await asyncio.wait_for(task, timeout)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.next_delay())
+            if self.client.expire_time is None:
+                continue
+            try:
+                await self.refresh()
+            except Exception:  # noqa
+                logger.exception("Background access token refresh failed")
+                await asyncio.sleep(self.retry_interval)
+
+    async def refresh(self):
+        stale_token = self.client._stored_access_token()
+        await self.client.refresh_access_token(stale_token=stale_token)
+
+    def __enter__(self):
+        raise TypeError("Use 'async with' instead")
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
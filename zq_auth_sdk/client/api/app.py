@@ -1,13 +1,74 @@
 import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator
 
 from zq_auth_sdk.client.api.base import BaseZqAuthAPI
+from zq_auth_sdk.entities.info import AppInfo, UserInfo
 from zq_auth_sdk.entities.response import ZqAuthResponseType
+from zq_auth_sdk.entities.types import JSONVal
 from zq_auth_sdk.exceptions import (
+    CircuitOpenException,
     ThirdLoginFailedException,
     UserNotFoundException,
-    ZqAuthClientException,
 )
 
+# 批量请求默认并发数，与 requests 默认连接池大小一致
+DEFAULT_CONCURRENCY = 10
+
+# 接口 code -> 异常类型
+SSO_EXCEPTIONS = {
+    ZqAuthResponseType.ResourceNotFound.code: ThirdLoginFailedException
+}
+USER_INFO_EXCEPTIONS = {
+    ZqAuthResponseType.ResourceNotFound.code: UserNotFoundException
+}
+
+
+def normalize_union_id(union_id: uuid.UUID | str) -> str:
+    """
+    统一 union id 格式为 32 位 hex 字符串
+    :param union_id: 用户 union id
+    :return: 无法解析为 uuid 时原样返回
+    """
+    if isinstance(union_id, uuid.UUID):
+        return union_id.hex
+    try:
+        return uuid.UUID(union_id).hex
+    except ValueError:
+        return union_id
+
+
+def unique_union_ids(union_ids: Iterable[uuid.UUID | str]) -> Iterator[str]:
+    """
+    去重并统一格式，保持原有顺序
+    """
+    seen = set()
+    for union_id in union_ids:
+        union_id = normalize_union_id(union_id)
+        if union_id not in seen:
+            seen.add(union_id)
+            yield union_id
+
+
+def app_result(result: JSONVal, typed: bool) -> JSONVal | AppInfo:
+    """
+    typed_entities 时转为 AppInfo
+    """
+    return AppInfo.from_dict(result) if typed else result
+
+
+def user_result(
+    result: JSONVal | UserInfo, union_id: str, typed: bool
+) -> JSONVal | UserInfo:
+    """
+    按 typed_entities 转换用户信息，缓存中的结果可能由其他客户端写入
+    """
+    if typed:
+        if isinstance(result, UserInfo):
+            return result
+        return UserInfo.from_dict(result, union_id)
+    return result.to_dict() if isinstance(result, UserInfo) else result
+
 
 class ZqAuthApp(BaseZqAuthAPI):
     def test(self):
@@ -24,7 +85,7 @@ class ZqAuthApp(BaseZqAuthAPI):
 
         https://console-docs.apipost.cn/preview/7abdc86c0ce49501/bf92b4d8832fa312?target_id=b66a33e6-ae37-4841-a540-69c1c07c133d  # noqa
         """
-        return self._get(f"/apps/{self.id}/")
+        return app_result(self._get(f"/apps/{self.id}/"), self.typed_entities)
 
     def sso(self, code: str):
         """
@@ -36,15 +97,12 @@ class ZqAuthApp(BaseZqAuthAPI):
 
         :raise ThirdLoginFailedException: code 无效
         """
-        try:
-            return self._post(url="/sso/union-id/", data={"code": code})
-        except ZqAuthClientException as e:
-            if e.errcode == ZqAuthResponseType.ResourceNotFound.code:
-                raise ThirdLoginFailedException(
-                    e.errcode, e.errmsg, e.client, e.request, e.response
-                )
-            else:
-                raise e
+        return self._post(
+            url="/sso/union-id/",
+            data={"code": code},
+            idempotent=False,  # code 只能使用一次
+            exceptions=SSO_EXCEPTIONS,
+        )
 
     def user_info(self, union_id: uuid.UUID | str, detail: bool = True):
         """
@@ -55,17 +113,105 @@ class ZqAuthApp(BaseZqAuthAPI):
         :param union_id: 用户 union id
         :param detail: 是否返回详细信息
 
+        :return: 用户信息，typed_entities 时为 UserInfo
+
         :raise UserNotFountException: union-id 无效 (用户解除绑定)
+
+        启用 user_cache 时优先从缓存读取
         """
         if isinstance(union_id, uuid.UUID):
             union_id = union_id.hex
 
+        cache = self.user_cache
+        if cache is not None:
+            cache_key = normalize_union_id(union_id)
+            result = cache.get(cache_key, detail)
+            if result is not None:
+                return user_result(result, cache_key, self.typed_entities)
+
         try:
-            return self._get(f"/users/{union_id}/", params={"detail": detail})
-        except ZqAuthClientException as e:
-            if e.errcode == ZqAuthResponseType.ResourceNotFound.code:
-                raise UserNotFoundException(
-                    e.errcode, e.errmsg, e.client, e.request, e.response
-                )
-            else:
-                raise e
+            result = self._get(
+                f"/users/{union_id}/",
+                params={"detail": detail},
+                exceptions=USER_INFO_EXCEPTIONS,
+            )
+        except CircuitOpenException:
+            # 接口熔断时降级读取已过期的缓存
+            if cache is not None:
+                result = cache.get(cache_key, detail, stale=True)
+                if result is not None:
+                    return user_result(result, cache_key, self.typed_entities)
+            raise
+        except UserNotFoundException as e:
+            if cache is not None:
+                cache.set_not_found(cache_key, detail, e)
+            raise
+
+        result = user_result(result, union_id, self.typed_entities)
+        if cache is not None:
+            cache.set(cache_key, detail, result)
+        return result
+
+    def iter_user_info(
+        self,
+        union_ids: Iterable[uuid.UUID | str],
+        detail: bool = True,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[tuple[str, JSONVal | UserNotFoundException]]:
+        """
+        并发批量获取用户信息，按完成顺序逐个返回
+
+        同时进行的请求不超过 concurrency 个，输入按需读取，
+        适合处理大量 union id。
+
+        :param union_ids: 用户 union id 列表，重复项只请求一次
+        :param detail: 是否返回详细信息
+        :param concurrency: 最大并发请求数
+        :return: (union id hex, 用户信息或 UserNotFoundException) 迭代器
+
+        :raise ZqAuthClientException: 除用户不存在外的其他错误
+        """
+        union_ids = unique_union_ids(union_ids)
+        self.access_token  # 预先登录，避免各线程同时刷新 token
+
+        executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="zq_auth_user_info"
+        )
+        pending = {}
+        try:
+            while True:
+                for union_id in union_ids:
+                    future = executor.submit(self.user_info, union_id, detail)
+                    pending[future] = union_id
+                    if len(pending) >= concurrency:
+                        break
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    union_id = pending.pop(future)
+                    try:
+                        yield union_id, future.result()
+                    except UserNotFoundException as e:
+                        yield union_id, e
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def user_info_many(
+        self,
+        union_ids: Iterable[uuid.UUID | str],
+        detail: bool = True,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> dict[str, JSONVal | UserNotFoundException]:
+        """
+        并发批量获取用户信息
+
+        :param union_ids: 用户 union id 列表，重复项只请求一次
+        :param detail: 是否返回详细信息
+        :param concurrency: 最大并发请求数
+        :return: union id hex -> 用户信息，用户不存在时为 UserNotFoundException
+
+        :raise ZqAuthClientException: 除用户不存在外的其他错误
+        """
+        return dict(self.iter_user_info(union_ids, detail, concurrency))
@@ -6,16 +6,33 @@ if TYPE_CHECKING:
 
 
 class BaseZqAuthAPI:
-    """ZqAuth API base class"""
+    """
+    ZqAuth API base class
 
-    API_BASE_URL: str = "https://api.cas.ziqiang.net.cn"
+    在客户端类中声明为类属性 (如 `app = ZqAuthApp()`)，作为描述符使用：
+    首次通过客户端实例访问时创建绑定该实例的 API 对象，并缓存在实例上。
+    """
+
+    API_BASE_URL: str = ""  # 为空时使用客户端的 API_BASE_URL
     _client: "ZqAuthClient"
+    _name: str | None = None
 
     def __init__(self, client=None):
         self._client = client
         if self.API_BASE_URL and self.API_BASE_URL.endswith("/"):
             self.API_BASE_URL = self.API_BASE_URL[:-1]
 
+    def __set_name__(self, owner, name: str):
+        self._name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        api = type(self)(instance)
+        # 缓存在实例上，之后的访问不再经过描述符
+        instance.__dict__[self._name] = api
+        return api
+
     def _get(self, url: str, **kwargs):
         if getattr(self, "API_BASE_URL", None):
             kwargs["api_base_url"] = self.API_BASE_URL
@@ -54,6 +71,14 @@ class BaseZqAuthAPI:
     def storage(self):
         return self._client.storage
 
+    @property
+    def user_cache(self):
+        return self._client.user_cache
+
+    @property
+    def typed_entities(self) -> bool:
+        return self._client.typed_entities
+
     @property
     def appid(self) -> str:
         return self._client.appid
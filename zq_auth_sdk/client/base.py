@@ -1,27 +1,42 @@
-import inspect
 import logging
+import threading
+import time
+from contextlib import nullcontext
 from datetime import datetime, timedelta
-from typing import Callable
+from functools import partial
+from typing import TYPE_CHECKING, Callable
 
 import requests
 
-from zq_auth_sdk.client.api.base import BaseZqAuthAPI
-from zq_auth_sdk.entities.response import ZqAuthResponse, ZqAuthResponseType
+from zq_auth_sdk.client.breaker import CircuitBreaker
+from zq_auth_sdk.client.coalesce import RequestCoalescer, request_key
+from zq_auth_sdk.client.http import HTTPPool
+from zq_auth_sdk.client.ratelimit import RateLimiter
+from zq_auth_sdk.client.refresher import TokenRefresher
+from zq_auth_sdk.client.retry import RetryPolicy, RetryState
+from zq_auth_sdk.entities.response import (
+    SUCCESS_CODE,
+    THROTTLED_CODE,
+    TOKEN_INVALID_CODE,
+    ZqAuthResponse,
+    ZqAuthResponseType,
+)
 from zq_auth_sdk.entities.types import JSONVal
 from zq_auth_sdk.exceptions import (
-    APILimitedException,
     AppLoginFailedException,
+    CircuitOpenException,
     ZqAuthClientException,
 )
+from zq_auth_sdk.metrics import ClientMetrics, endpoint_key
 from zq_auth_sdk.storage import SessionStorage
 from zq_auth_sdk.storage.memorystorage import MemoryStorage
+from zq_auth_sdk.tracing import Tracer
 from zq_auth_sdk.utils import now
 
-logger = logging.getLogger(__name__)
-
+if TYPE_CHECKING:
+    from zq_auth_sdk.cache import UserInfoCache
 
-def _is_api_endpoint(obj):
-    return isinstance(obj, BaseZqAuthAPI)
+logger = logging.getLogger(__name__)
 
 
 class BaseWeChatClient:
@@ -30,20 +45,21 @@ class BaseWeChatClient:
     ACCESS_LIFETIME: timedelta | None = None  # access token的有效期
     REFRESH_LIFETIME: timedelta | None = None  # refresh token的有效期
 
+    REFRESH_LEASE_TTL: int = 30  # 跨进程刷新租约有效期
+    REFRESH_LEASE_WAIT: float = 10  # 等待其他进程刷新的最长时间
+    REFRESH_LEASE_POLL_INTERVAL: float = 0.1  # 等待时轮询存储的间隔
+
+    TOKEN_CACHE_TTL: float = 30  # 进程内 access token 缓存的最长复用时间
+    TOKEN_REFRESH_MARGIN = timedelta(seconds=60)  # 剩余有效期不足时刷新
+
     _http: requests.Session
+    http_pool: HTTPPool
     appid: str
     storage: SessionStorage
     timeout: int | None
     auto_retry: bool
-
-    def __new__(cls, *args, **kwargs):
-        self = super().__new__(cls)
-        api_endpoints = inspect.getmembers(self, _is_api_endpoint)
-        for name, api in api_endpoints:
-            api_cls = type(api)
-            api = api_cls(self)
-            setattr(self, name, api)
-        return self
+    user_cache: "UserInfoCache | None" = None
+    typed_entities: bool = False
 
     def __init__(
         self,
@@ -52,23 +68,255 @@ class BaseWeChatClient:
         storage: SessionStorage | None = None,
         timeout: int | None = None,
         auto_retry: bool = True,
+        token_cache_ttl: float | None = None,
+        session_record: bool = False,
+        http_pool: HTTPPool | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        coalesce_requests: bool = False,
+        metrics: ClientMetrics | None = None,
+        tracer: Tracer | None = None,
     ):
-        self._http = requests.Session()
+        # 仅关闭客户端自己创建的连接池，共享的连接池由调用方关闭
+        self._owns_http_pool = http_pool is None
+        self.http_pool = (
+            http_pool if http_pool is not None else self._create_http_pool()
+        )
+        self._http = self.http_pool.session
+        self.retry_policy = (
+            retry_policy if retry_policy is not None else RetryPolicy.disabled()
+        )
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.coalescer = self._create_coalescer() if coalesce_requests else None
+        self.metrics = metrics
+        self.tracer = tracer
+        self._refresh_lock = threading.RLock()
+        self._refresh_lease_held = False
+        self._token_refresher = None
         self.appid = appid
-        self.storage = storage or MemoryStorage()
+        self.storage = storage if storage is not None else MemoryStorage()
         self.timeout = timeout
         self.auto_retry = auto_retry
+        self.token_cache_ttl = (
+            self.TOKEN_CACHE_TTL if token_cache_ttl is None else token_cache_ttl
+        )
+        # 进程内热缓存 (access token, 失效的 monotonic 时间)
+        self._token_cache: tuple[str, float] | None = None
+        self.session_record = session_record
 
         if access_token:
-            self.storage.set(self.access_token_key, access_token)
+            self._session_set(access=access_token)
 
         if self.API_BASE_URL == "":
             raise Exception("API_BASE_URL is not defined")
         elif self.API_BASE_URL.endswith("/"):
             self.API_BASE_URL = self.API_BASE_URL[:-1]
 
+    def _create_http_pool(self) -> HTTPPool:
+        """
+        创建 http 连接池
+        """
+        return HTTPPool()
+
+    def _create_coalescer(self) -> RequestCoalescer:
+        """
+        创建请求合并器
+        """
+        return RequestCoalescer()
+
+    def stats(self) -> dict:
+        """
+        客户端运行统计快照
+        :return: requests (按接口的延迟直方图、code 计数、重试次数) /
+            auth (登录、刷新次数与耗时) / pool / user_cache / coalescer /
+            rate_limiter / circuit_breaker，未启用的部分不包含
+        """
+        snapshot = (
+            self.metrics.snapshot()
+            if self.metrics is not None
+            else {"requests": {}, "auth": {}}
+        )
+        snapshot["pool"] = self.http_pool.stats()
+        if self.user_cache is not None:
+            cache = self.user_cache.stats()
+            lookups = cache["hits"] + cache["misses"]
+            cache["hit_ratio"] = cache["hits"] / lookups if lookups else 0.0
+            snapshot["user_cache"] = cache
+        if self.coalescer is not None:
+            snapshot["coalescer"] = self.coalescer.stats()
+        if self.rate_limiter is not None:
+            snapshot["rate_limiter"] = self.rate_limiter.stats()
+        if self.circuit_breaker is not None:
+            snapshot["circuit_breaker"] = self.circuit_breaker.stats()
+        return snapshot
+
+    def flush_metrics(self):
+        """
+        推送 stats() 快照到指标 sink
+        """
+        if self.metrics is not None:
+            self.metrics.flush(self.stats())
+
+    def _time_auth(self, kind: str):
+        """
+        统计登录/刷新的上下文，未启用指标时为空操作
+        """
+        if self.metrics is None:
+            return nullcontext()
+        return self.metrics.time_auth(kind)
+
+    def _span(self, name: str, attributes: dict | None = None):
+        """
+        创建 span 的上下文，未设置 tracer 时为空操作
+        """
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.start_span(name, attributes)
+
+    def _request_span(self, method: str, url: str):
+        """
+        请求 span
+        """
+        return self.tracer.start_span(
+            "zqauth.request",
+            {
+                "http.method": method.upper(),
+                "http.url": url,
+                "zqauth.endpoint": endpoint_key(method, url),
+            },
+        )
+
+    @staticmethod
+    def _set_span_result(span, e: ZqAuthClientException | None = None):
+        """
+        记录请求结果 code
+        """
+        if e is None:
+            span.set_attribute("zqauth.code", SUCCESS_CODE)
+        else:
+            span.set_attribute("zqauth.code", str(e.errcode))
+
+    def close(self):
+        """
+        停止后台刷新，关闭客户端创建的 http 连接池
+        """
+        self.stop_token_refresher()
+        if self._owns_http_pool:
+            self.http_pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     # region storage
 
+    # region session
+    @property
+    def session_key(self) -> str:
+        """
+        session 记录缓存key (session_record 模式)
+        """
+        return f"{self.appid}_session"
+
+    def _session_field_keys(self) -> dict[str, str]:
+        """
+        key-per-field 模式下字段对应的缓存key
+        """
+        return {
+            "access": self.access_token_key,
+            "expire_time": self.access_token_expire_time_key,
+            "refresh": self.refresh_token_key,
+            "id": self.id_key,
+            "name": self.name_key,
+            "username": self.username_key,
+        }
+
+    def _session_get(self, *fields: str) -> dict:
+        """
+        读取 session 字段，一次读取存储后端
+        :param fields: 字段名 (access, expire_time, refresh, id, name, username)
+        :return: 字段名 -> 值
+        """
+        if self.session_record:
+            record = self.storage.get(self.session_key) or {}
+            return {field: record.get(field) for field in fields}
+
+        keys = self._session_field_keys()
+        values = self.storage.get_many([keys[field] for field in fields])
+        return {field: values[keys[field]] for field in fields}
+
+    def _session_set(self, **values):
+        """
+        写入 session 字段，值为 None 的字段会被删除
+
+        session_record 模式下整条记录一次写入并递增版本号，
+        其他进程不会读到写了一半的 session；
+        写入通过存储后端的比较并交换 (SessionStorage.update) 完成，
+        并发写入不会丢失字段或写入相同的版本号
+        """
+        if self.session_record:
+            self.storage.update(
+                self.session_key, partial(self._update_session_record, values)
+            )
+        else:
+            keys = self._session_field_keys()
+            self.storage.set_many(
+                {
+                    keys[field]: value
+                    for field, value in values.items()
+                    if value is not None
+                },
+                ttl={
+                    self.access_token_key: self.ACCESS_LIFETIME,
+                    self.refresh_token_key: self.REFRESH_LIFETIME,
+                },
+            )
+            deleted = [
+                keys[field] for field, value in values.items() if value is None
+            ]
+            if deleted:
+                self.storage.delete_many(deleted)
+
+        if "access" in values or "expire_time" in values:
+            self._token_cache = None
+
+    def _update_session_record(self, values: dict, record: dict | None):
+        """
+        合并 session 记录并递增版本号
+        :return: (新记录, 有效期)
+        """
+        record = {**(record or {}), **values}
+        record = {k: v for k, v in record.items() if v is not None}
+        record["version"] = record.get("version", 0) + 1
+        ttl = (
+            self.REFRESH_LIFETIME
+            if "refresh" in record
+            else self.ACCESS_LIFETIME
+        )
+        return record, ttl
+
+    @property
+    def session_version(self) -> int | None:
+        """
+        session 记录版本号 (session_record 模式)，每次写入递增
+        """
+        if not self.session_record:
+            return None
+        record = self.storage.get(self.session_key) or {}
+        return record.get("version")
+
+    def _stored_access_token(self) -> str | None:
+        """
+        存储后端中的 access token，不检查是否过期
+        """
+        return self._session_get("access")["access"]
+
+    # endregion
+
     # region access
     @property
     def access_token_key(self) -> str:
@@ -80,21 +328,74 @@ class BaseWeChatClient:
     @property
     def access_token(self):
         """ZqAuth access token"""
-        access_token = self.storage.get(self.access_token_key)
+        access_token = self._get_valid_access_token()
         if access_token:
-            if not self.expire_time:
-                # user provided access_token, just return it
-                return access_token
+            return access_token
 
-            if self.expire_time - now() > timedelta(seconds=60):
+        with self._refresh_lock:
+            # 等待期间可能已被其他线程刷新
+            access_token = self._get_valid_access_token()
+            if access_token:
                 return access_token
 
-        self.refresh_access_token()
-        return self.storage.get(self.access_token_key)
+            logger.info("Fetching access token")
+            stale_token = self._stored_access_token()
+            self._with_refresh_lease(
+                self._refresh, lambda: self._token_refreshed(stale_token)
+            )
+            return self._stored_access_token()
 
     @access_token.setter
     def access_token(self, value):
-        self.storage.set(self.access_token_key, value, self.ACCESS_LIFETIME)
+        if value is not None:
+            self._session_set(access=value)
+
+    def _get_valid_access_token(self, use_cache: bool = True) -> str | None:
+        """
+        获取未过期的 access token
+
+        优先读取进程内热缓存，缓存超过 token_cache_ttl 或 token 即将过期时
+        重新从存储后端读取
+
+        :param use_cache: 是否使用进程内缓存
+        :return: access token，不存在或即将过期时返回 None
+        """
+        if use_cache:
+            cached = self._token_cache
+            if cached is not None and time.monotonic() < cached[1]:
+                return cached[0]
+
+        values = self._session_get("access", "expire_time")
+        access_token = values["access"]
+        if not access_token:
+            return None
+
+        expire_time = self._parse_expire_time(values["expire_time"])
+        if not expire_time:
+            # user provided access_token, just return it
+            self._cache_token(access_token, self.token_cache_ttl)
+            return access_token
+
+        remaining = expire_time - now() - self.TOKEN_REFRESH_MARGIN
+        if remaining > timedelta(0):
+            self._cache_token(
+                access_token,
+                min(remaining.total_seconds(), self.token_cache_ttl),
+            )
+            return access_token
+
+        return None
+
+    def _cache_token(self, access_token: str, ttl: float):
+        if ttl > 0:
+            self._token_cache = (access_token, time.monotonic() + ttl)
+
+    def _token_refreshed(self, stale_token: str | None) -> bool:
+        """
+        存储后端中是否已有不同于 stale_token 的有效 access token
+        """
+        access_token = self._get_valid_access_token(use_cache=False)
+        return access_token is not None and access_token != stale_token
 
     # endregion
     # region expire_time
@@ -110,14 +411,18 @@ class BaseWeChatClient:
         """
         access token 过期时间
         """
-        iso_time = self.storage.get(self.access_token_expire_time_key, None)
+        iso_time = self._session_get("expire_time")["expire_time"]
+        return self._parse_expire_time(iso_time)
+
+    @staticmethod
+    def _parse_expire_time(iso_time: str | None) -> datetime | None:
         return (
             datetime.fromisoformat(iso_time) if iso_time is not None else None
         )
 
     @expire_time.setter
     def expire_time(self, value: datetime):
-        self.storage.set(self.access_token_expire_time_key, value.isoformat())
+        self._session_set(expire_time=value.isoformat())
 
     # endregion
     # region refresh
@@ -131,13 +436,11 @@ class BaseWeChatClient:
     @property
     def refresh_token(self) -> str | None:
         """ZqAuth refresh token"""
-        return self.storage.get(self.refresh_token_key, None)
+        return self._session_get("refresh")["refresh"]
 
     @refresh_token.setter
     def refresh_token(self, value: str | None):
-        if value is None:
-            self.storage.delete(self.refresh_token_key)
-        self.storage.set(self.refresh_token_key, value, self.REFRESH_LIFETIME)
+        self._session_set(refresh=value)
 
     # endregion
     # region id
@@ -151,14 +454,12 @@ class BaseWeChatClient:
     @property
     def id(self) -> int:
         """ZqAuth id"""
-        res = self.storage.get(self.id_key, None)
-        if res is None:
-            self._login()
-        return self.storage.get(self.id_key)
+        return self._get_or_login("id")
 
     @id.setter
     def id(self, value: int):
-        self.storage.set(self.id_key, value)
+        if value is not None:
+            self._session_set(id=value)
 
     # endregion
     # region name
@@ -172,14 +473,12 @@ class BaseWeChatClient:
     @property
     def name(self) -> str:
         """ZqAuth name"""
-        res = self.storage.get(self.name_key, None)
-        if res is None:
-            self._login()
-        return self.storage.get(self.name_key)
+        return self._get_or_login("name")
 
     @name.setter
     def name(self, value: str):
-        self.storage.set(self.name_key, value)
+        if value is not None:
+            self._session_set(name=value)
 
     # endregion
     # region username
@@ -193,16 +492,90 @@ class BaseWeChatClient:
     @property
     def username(self) -> str:
         """ZqAuth username"""
-        res = self.storage.get(self.username_key, None)
-        if res is None:
-            self._login()
-        return self.storage.get(self.username_key)
+        return self._get_or_login("username")
 
     @username.setter
     def username(self, value: str):
-        self.storage.set(self.username_key, value)
+        if value is not None:
+            self._session_set(username=value)
 
     # endregion
+
+    @property
+    def identity(self) -> dict:
+        """
+        APP 信息 (id, name, username)，一次读取，不存在时登录
+        """
+        values = self._session_get("id", "name", "username")
+        if any(value is None for value in values.values()):
+            self._get_or_login("id")
+            values = self._session_get("id", "name", "username")
+        return values
+
+    def _get_or_login(self, field: str):
+        """
+        读取 APP 信息，不存在时登录
+        :param field: 字段名 (id, name, username)
+        """
+        res = self._session_get(field)[field]
+        if res is None:
+            with self._refresh_lock:
+                res = self._session_get(field)[field]
+                if res is None:
+                    self._with_refresh_lease(
+                        self._login,
+                        lambda: self._session_get(field)[field] is not None,
+                    )
+                    res = self._session_get(field)[field]
+        return res
+
+    @property
+    def refresh_lease_key(self) -> str:
+        """
+        跨进程刷新租约 key
+        """
+        return f"{self.appid}_refresh_lease"
+
+    def _with_refresh_lease(
+        self, action: Callable[[], None], done: Callable[[], bool]
+    ):
+        """
+        跨进程单飞刷新
+
+        只有获取到存储后端租约的进程执行 action，
+        其余进程轮询存储直到 done() 成立，超时后自行执行 action
+
+        :param action: 刷新/登录操作
+        :param done: 判断其他进程是否已完成刷新
+        """
+        if self._refresh_lease_held:
+            # 调用方持有 _refresh_lock，租约已属于本客户端的当前线程
+            if not done():
+                action()
+            return
+
+        lease = self.storage.acquire_lease(
+            self.refresh_lease_key, self.REFRESH_LEASE_TTL
+        )
+        if lease is None:
+            logger.info("Another worker is refreshing access token, waiting")
+            deadline = time.monotonic() + self.REFRESH_LEASE_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(self.REFRESH_LEASE_POLL_INTERVAL)
+                if done():
+                    return
+            logger.warning("Waiting for refresh lease timed out, refresh now")
+            action()
+            return
+
+        self._refresh_lease_held = True
+        try:
+            if not done():
+                action()
+        finally:
+            self._refresh_lease_held = False
+            self.storage.release_lease(self.refresh_lease_key, lease)
+
     # endregion
 
     def _request(
@@ -215,6 +588,10 @@ class BaseWeChatClient:
         timeout: int | None = None,
         result_processor: Callable[[JSONVal], JSONVal] = None,
         auto_retry: bool | None = None,
+        retry_policy: RetryPolicy | None = None,
+        idempotent: bool | None = None,
+        exceptions: dict[str, type[ZqAuthClientException]] | None = None,
+        retry_state: RetryState | None = None,
         **kwargs,
     ) -> JSONVal:
         """
@@ -227,36 +604,107 @@ class BaseWeChatClient:
         :param timeout: 超时时长
         :param result_processor: 结果处理函数
         :param auto_retry: token过期是否自动重试
+        :param retry_policy: 该请求的重试策略，默认使用客户端的重试策略
+        :param idempotent: 请求是否可以安全重试，默认根据请求方法判断
+        :param exceptions: 该接口 code -> 异常类型，优先于默认映射
+        :param retry_state: 重试状态 (重试时内部传递)
         :param kwargs:
         :return: JSON 返回
         """
-        if not url_or_endpoint.startswith(
-            ("http://", "https://")
-        ):  # 传入 endpoint
-            api_base_url = kwargs.pop("api_base_url", self.API_BASE_URL)
-            if api_base_url.endswith("/"):
-                api_base_url = api_base_url[:-1]
-            url = f"{api_base_url}{url_or_endpoint}"  # base url 拼接到 endpoint 前
-        else:
-            url = url_or_endpoint
+        url = self._build_url(url_or_endpoint, kwargs)
+        self._build_kwargs(params, data, timeout, kwargs)
 
-        if not params:
-            params = {}
-        kwargs["params"] = params
-        kwargs["data"] = data
-        kwargs["timeout"] = timeout or self.timeout
+        if retry_state is None:
+            policy = (
+                retry_policy if retry_policy is not None else self.retry_policy
+            )
+            retry_state = policy.start(method, idempotent)
 
-        if auth:
-            if "headers" not in kwargs:
-                kwargs["headers"] = {}
-            kwargs["headers"]["Authorization"] = f"Bearer {self.access_token}"
+            coalesce = self.coalescer is not None and method.upper() == "GET"
+            if coalesce or self.tracer is not None:
+                send = partial(
+                    self._request,
+                    method=method,
+                    url_or_endpoint=url,
+                    auth=auth,
+                    result_processor=result_processor,
+                    auto_retry=auto_retry,
+                    retry_state=retry_state,
+                    exceptions=exceptions,
+                    **kwargs,
+                )
+                if coalesce:
+                    # 合并相同的进行中 GET 请求
+                    key = request_key(
+                        method, url, kwargs["params"], auth, result_processor
+                    )
+                    send = partial(self.coalescer.do, key, send)
+                if self.tracer is None:
+                    return send()
+                return self._traced_request(method, url, send)
 
-        response = self._http.request(method=method, url=url, **kwargs)  # 发起请求
+        # 熔断时快速失败，不占用限流令牌，也不触发登录/刷新
+        if self.circuit_breaker is not None:
+            try:
+                self.circuit_breaker.before(
+                    self.circuit_breaker.circuit_key(method, url)
+                )
+            except CircuitOpenException:
+                result = self._circuit_fallback(method, url, kwargs)
+                if result is None:
+                    raise
+                # 降级结果与接口 data 格式相同，同样经过 result_processor
+                return result_processor(result) if result_processor else result
+
+        self._prepare_send(method, url, auth, kwargs)
+
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        try:
+            response = self._http.request(
+                method=method, url=url, **kwargs
+            )  # 发起请求
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self._record_circuit(method, url, False)
+            delay = retry_state.retry_error()
+            if metrics is not None:
+                self._record_error_metrics(method, url, start, delay)
+            if delay is None:
+                raise
+            logger.warning(f"Request failed: {e!r}, retry in {delay:.2f}s")
+            with self._retry_span("connection_error", retry_state):
+                retry_state.policy.sleep(delay)
+                return self._request(
+                    method=method,
+                    url_or_endpoint=url,
+                    auth=auth,
+                    result_processor=result_processor,
+                    auto_retry=auto_retry,
+                    retry_state=retry_state,
+                    exceptions=exceptions,
+                    **kwargs,
+                )
+        except BaseException:
+            # 其他异常 (如响应解码失败) 也要记录，否则半开探测名额不会释放
+            self._record_circuit(method, url, False)
+            raise
 
+        if metrics is not None:
+            metrics.observe_request(
+                endpoint_key(method, url), time.perf_counter() - start
+            )
         logger.debug(f"Request: {method} {url}")
 
         return self._handle_result(
-            response, method, url, result_processor, auto_retry, **kwargs
+            response,
+            method,
+            url,
+            result_processor,
+            auto_retry,
+            retry_state,
+            exceptions,
+            **kwargs,
         )
 
     def _handle_result(
@@ -266,37 +714,252 @@ class BaseWeChatClient:
         url: str | None = None,
         result_processor: Callable[[JSONVal], JSONVal] = None,
         auto_retry: bool | None = None,
+        retry_state: RetryState | None = None,
+        exceptions: dict[str, type[ZqAuthClientException]] | None = None,
         **kwargs,
     ) -> JSONVal:
-        response = ZqAuthResponse(response, self)
-
-        if auto_retry is None:
-            auto_retry = self.auto_retry
+        try:
+            response = ZqAuthResponse(response, self)
+        except BaseException:
+            # 非 JSON 或缺少 code 的响应 (如网关错误页)，同时释放半开探测名额
+            self._record_circuit(method, url, False)
+            raise
+        code = response.code
+        if self.circuit_breaker is not None:
+            self._record_circuit(method, url, not code.startswith(("B", "C")))
+        if self.metrics is not None and url is not None:
+            self.metrics.observe_code(endpoint_key(method or "get", url), code)
+        if self.rate_limiter is not None:
+            self.rate_limiter.record(code == THROTTLED_CODE)
 
-        if response.code != ZqAuthResponseType.Success.code:
-            if auto_retry and response.code in [
-                ZqAuthResponseType.TokenInvalid.code,
-            ]:
+        if code != SUCCESS_CODE:
+            if auto_retry is None:
+                auto_retry = self.auto_retry
+            if auto_retry and code == TOKEN_INVALID_CODE:
                 logger.info(
                     "Access token expired, fetch a new one and retry request"
                 )
-                # 刷新 access token
-                self.refresh_access_token()
-                # 重试请求
-                return self._request(
-                    method=method,
-                    url_or_endpoint=url,
-                    result_processor=result_processor,
-                    auto_retry=False,
-                    **kwargs,
+                self._record_retry_metrics(method, url, "token")
+                with self._retry_span("token", retry_state):
+                    # 刷新 access token
+                    self.refresh_access_token(
+                        stale_token=self._get_request_token(kwargs)
+                    )
+                    # 重试请求
+                    return self._request(
+                        method=method,
+                        url_or_endpoint=url,
+                        result_processor=result_processor,
+                        auto_retry=False,
+                        retry_state=retry_state,
+                        exceptions=exceptions,
+                        **kwargs,
+                    )
+
+            delay = self._get_retry_delay(response, retry_state)
+            if delay is not None:
+                self._record_retry_metrics(method, url, code)
+                with self._retry_span(code, retry_state):
+                    retry_state.policy.sleep(delay)
+                    return self._request(
+                        method=method,
+                        url_or_endpoint=url,
+                        auth=self._get_request_token(kwargs) is not None,
+                        result_processor=result_processor,
+                        auto_retry=auto_retry,
+                        retry_state=retry_state,
+                        exceptions=exceptions,
+                        **kwargs,
+                    )
+
+            self._check_response(response, exceptions)
+
+        return self._process_result(response, result_processor)
+
+    def _record_circuit(
+        self, method: str | None, url: str | None, success: bool
+    ):
+        """
+        向熔断器记录请求结果
+        """
+        if self.circuit_breaker is None or url is None:
+            return
+        self.circuit_breaker.record(
+            self.circuit_breaker.circuit_key(method or "get", url), success
+        )
+
+    def _prepare_send(self, method: str, url: str, auth: bool, kwargs: dict):
+        """
+        获取限流令牌并准备请求头，失败时归还熔断器的半开探测名额
+        """
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            self._prepare_headers(auth, kwargs)
+        except BaseException:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.release(
+                    self.circuit_breaker.circuit_key(method, url)
                 )
+            raise
 
-            elif response.code == ZqAuthResponseType.APIThrottled.code:
-                # api freq out of limit
-                response.check_exception(APILimitedException)
-            else:
-                response.check_exception()
+    def _prepare_headers(self, auth: bool, kwargs: dict):
+        """
+        设置认证请求头，注入 trace context
+        """
+        headers = kwargs.setdefault("headers", {})
+        if self.tracer is None:
+            if auth:
+                headers["Authorization"] = f"Bearer {self.access_token}"
+            return
+
+        if auth:
+            # 包含读取存储与可能的刷新
+            with self.tracer.start_span("zqauth.access_token"):
+                access_token = self.access_token
+            headers["Authorization"] = f"Bearer {access_token}"
+        self.tracer.inject(headers)
 
+    def _traced_request(
+        self, method: str, url: str, send: Callable[[], JSONVal]
+    ) -> JSONVal:
+        """
+        在请求 span 内发起请求 (包括重试)
+        """
+        with self._request_span(method, url) as span:
+            try:
+                result = send()
+            except ZqAuthClientException as e:
+                self._set_span_result(span, e)
+                raise
+            self._set_span_result(span)
+            return result
+
+    def _retry_span(self, reason: str, retry_state: RetryState | None):
+        """
+        重试 span
+        """
+        if self.tracer is None:
+            return nullcontext()
+        attempts = retry_state.attempts if retry_state is not None else 0
+        return self.tracer.start_span(
+            "zqauth.retry",
+            {"zqauth.retry.reason": reason, "zqauth.retry.attempt": attempts},
+        )
+
+    def _record_error_metrics(
+        self, method: str, url: str, start: float, delay: float | None
+    ):
+        """
+        记录连接错误、超时的指标
+        """
+        endpoint = endpoint_key(method, url)
+        self.metrics.observe_request(endpoint, time.perf_counter() - start)
+        self.metrics.observe_code(endpoint, "connection_error")
+        if delay is not None:
+            self.metrics.observe_retry(endpoint, "connection_error")
+
+    def _record_retry_metrics(
+        self, method: str | None, url: str | None, reason: str
+    ):
+        """
+        记录重试指标
+        """
+        if self.metrics is not None and url is not None:
+            self.metrics.observe_retry(
+                endpoint_key(method or "get", url), reason
+            )
+
+    def _circuit_fallback(
+        self, method: str, url: str, kwargs: dict
+    ) -> JSONVal | None:
+        """
+        熔断打开时的降级结果，没有降级函数时返回 None
+        """
+        fallback = self.circuit_breaker.fallback
+        if fallback is None:
+            return None
+        logger.warning(f"Circuit open, serving fallback for {method} {url}")
+        return fallback(method, url, kwargs["params"])
+
+    @staticmethod
+    def _get_retry_delay(
+        response: ZqAuthResponse, retry_state: RetryState | None
+    ) -> float | None:
+        """
+        失败响应的重试等待时间，不重试时返回 None
+        """
+        if retry_state is None:
+            return None
+        delay = retry_state.retry_response(
+            response.code, response._response.headers.get("Retry-After")
+        )
+        if delay is not None:
+            logger.info(
+                f"Request failed with code {response.code}, "
+                f"retry in {delay:.2f}s (attempt {retry_state.attempts})"
+            )
+        return delay
+
+    @staticmethod
+    def _get_request_token(kwargs: dict) -> str | None:
+        """
+        获取请求使用的 access token
+        """
+        authorization = kwargs.get("headers", {}).get("Authorization")
+        if authorization and authorization.startswith("Bearer "):
+            return authorization[len("Bearer ") :]
+        return None
+
+    def _build_url(self, url_or_endpoint: str, kwargs: dict) -> str:
+        """
+        拼接请求地址
+        :param url_or_endpoint: 请求地址或 endpoint
+        :param kwargs: 请求参数，会弹出其中的 api_base_url
+        :return: 完整请求地址
+        """
+        if url_or_endpoint.startswith(("http://", "https://")):
+            return url_or_endpoint
+
+        # 传入 endpoint
+        api_base_url = kwargs.pop("api_base_url", self.API_BASE_URL)
+        if api_base_url.endswith("/"):
+            api_base_url = api_base_url[:-1]
+        return f"{api_base_url}{url_or_endpoint}"  # base url 拼接到 endpoint 前
+
+    def _build_kwargs(
+        self,
+        params: dict | None,
+        data: str | bytes | dict | None,
+        timeout: int | None,
+        kwargs: dict,
+    ) -> dict:
+        """
+        填充请求参数
+        """
+        kwargs["params"] = params or {}
+        kwargs["data"] = data
+        kwargs["timeout"] = timeout or self.timeout
+        return kwargs
+
+    @staticmethod
+    def _check_response(
+        response: ZqAuthResponse,
+        exceptions: dict[str, type[ZqAuthClientException]] | None = None,
+    ):
+        """
+        根据响应 code 抛出对应异常
+        :param response: API 响应
+        :param exceptions: 该接口 code -> 异常类型，优先于默认映射
+        """
+        response.check_exception(response.exception_class(exceptions))
+
+    @staticmethod
+    def _process_result(
+        response: ZqAuthResponse,
+        result_processor: Callable[[JSONVal], JSONVal] = None,
+    ) -> JSONVal:
         return (
             response.data
             if not result_processor
@@ -373,10 +1036,49 @@ class BaseWeChatClient:
             **kwargs,
         )
 
-    def refresh_access_token(self):
-        """fetch access token"""
-        logger.info("Fetching access token")
-        self._refresh()
+    def refresh_access_token(self, stale_token: str | None = None):
+        """
+        fetch access token
+
+        同一客户端内同时只有一个线程刷新，其余线程等待并复用新的 token；
+        存储后端支持租约时，多个进程间同时也只有一个进程刷新
+
+        :param stale_token: 已失效的 access token，
+            若等待期间 token 已被其他线程更新则不再重复刷新
+        """
+        with self._refresh_lock:
+            self._token_cache = None
+            if stale_token is None:
+                stale_token = self._stored_access_token()
+            elif self._token_refreshed(stale_token):
+                return
+
+            logger.info("Fetching access token")
+            self._with_refresh_lease(
+                self._refresh, lambda: self._token_refreshed(stale_token)
+            )
+
+    def start_token_refresher(
+        self, margin: float = 300, jitter: float = 60
+    ) -> TokenRefresher:
+        """
+        启动后台 token 刷新，在过期前主动刷新 access token
+        :param margin: 提前刷新时间 (秒)
+        :param jitter: 随机提前的最大时间 (秒)
+        :return: 后台刷新器
+        """
+        if self._token_refresher is None:
+            self._token_refresher = TokenRefresher(self, margin, jitter)
+        self._token_refresher.start()
+        return self._token_refresher
+
+    def stop_token_refresher(self):
+        """
+        停止后台 token 刷新
+        """
+        if self._token_refresher is not None:
+            self._token_refresher.stop()
+            self._token_refresher = None
 
     def login(self) -> JSONVal:
         """
@@ -391,23 +1093,58 @@ class BaseWeChatClient:
         :return:
         """
         logger.info("login using credentials")
-        try:
-            result = self.login()
-        except ZqAuthClientException as e:
-            if e.errcode == ZqAuthResponseType.LoginFailed.code:
-                logger.error("App login failed, please check your credentials")
-                raise AppLoginFailedException(
-                    e.errcode, e.errmsg, e.client, e.request, e.response
-                )
-            else:
-                raise e
+        with self._span("zqauth.login", {"zqauth.appid": self.appid}):
+            try:
+                with self._time_auth("login"):
+                    result = self.login()
+            except ZqAuthClientException as e:
+                self._raise_login_exception(e)
 
-        self.id = result.get("id")
-        self.name = result.get("name")
-        self.username = result.get("username")
-        self.access_token = result.get("access")
-        self.refresh_token = result.get("refresh", None)
-        self.expire_time = datetime.fromisoformat(result.get("expire_time"))
+            self._save_login_result(result)
+
+    @staticmethod
+    def _raise_login_exception(e: ZqAuthClientException):
+        """
+        转换登录异常
+        :param e: 登录请求产生的异常
+
+        :raise AppLoginFailedException: appid 与 secret 错误
+        """
+        if e.errcode == ZqAuthResponseType.LoginFailed.code:
+            logger.error("App login failed, please check your credentials")
+            raise AppLoginFailedException(
+                e.errcode, e.errmsg, e.client, e.request, e.response
+            )
+        else:
+            raise e
+
+    def _save_login_result(self, result: JSONVal):
+        """
+        保存登录结果
+        :param result: 登录接口返回数据
+        """
+        self._session_set(
+            id=result.get("id"),
+            name=result.get("name"),
+            username=result.get("username"),
+            access=result.get("access"),
+            refresh=result.get("refresh", None),
+            expire_time=datetime.fromisoformat(
+                result.get("expire_time")
+            ).isoformat(),
+        )
+
+    def _save_refresh_result(self, result: JSONVal):
+        """
+        保存刷新结果
+        :param result: 刷新接口返回数据
+        """
+        self._session_set(
+            access=result.get("access"),
+            expire_time=datetime.fromisoformat(
+                result.get("expire_time")
+            ).isoformat(),
+        )
 
     def refresh(self) -> JSONVal:
         """
@@ -417,19 +1154,20 @@ class BaseWeChatClient:
 
     def _refresh(self):
         logger.info("refresh access_token")
-        if self.refresh_token is None:
-            self._login()
-            return
-
-        try:
-            result = self.refresh()
-            self.access_token = result.get("access")
-            self.expire_time = datetime.fromisoformat(result.get("expire_time"))
-        except ZqAuthClientException as e:
-            if (
-                e.errcode == ZqAuthResponseType.RefreshTokenInvalid.code
-            ):  # refresh token 过期
-                self.refresh_token = None
+        with self._span("zqauth.refresh", {"zqauth.appid": self.appid}):
+            if self.refresh_token is None:
                 self._login()
-            else:
-                raise e
+                return
+
+            try:
+                with self._time_auth("refresh"):
+                    result = self.refresh()
+                self._save_refresh_result(result)
+            except ZqAuthClientException as e:
+                if (
+                    e.errcode == ZqAuthResponseType.RefreshTokenInvalid.code
+                ):  # refresh token 过期
+                    self.refresh_token = None
+                    self._login()
+                else:
+                    raise e
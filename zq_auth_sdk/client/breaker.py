@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import deque
+from typing import Callable
+from urllib.parse import urlsplit
+
+from zq_auth_sdk.entities.types import JSONVal
+from zq_auth_sdk.exceptions import CircuitOpenException
+from zq_auth_sdk.utils import path_template
+
+
+class _Circuit:
+    """单个接口的熔断状态"""
+
+    def __init__(self, window: int):
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0  # 连续失败次数
+        self.results: deque[bool] = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probes = 0  # 半开状态下进行中的探测请求数
+
+
+class CircuitBreaker:
+    """
+    熔断器
+
+    按 base url + 接口 (方法 + 路径模板) 分别统计。连续失败 failure_threshold 次，
+    或最近 window 次请求的失败率达到 error_rate 时打开熔断，
+    打开期间请求直接抛出 CircuitOpenException；recovery_timeout 秒后进入半开状态，
+    放行最多 half_open_max_calls 个探测请求，成功则关闭，失败则重新打开。
+
+    连接错误、超时与服务端错误 (B/C 开头的 code) 计为失败。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        error_rate: float | None = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        recovery_timeout: float = 30,
+        half_open_max_calls: int = 1,
+        fallback: Callable[[str, str, dict], JSONVal | None] | None = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param failure_threshold: 连续失败多少次后打开熔断
+        :param error_rate: 打开熔断的失败率，None 为只按连续失败次数判断
+        :param window: 统计失败率的最近请求数
+        :param min_calls: 统计失败率所需的最少请求数
+        :param recovery_timeout: 打开后多久进入半开状态 (秒)
+        :param half_open_max_calls: 半开状态下同时放行的探测请求数
+        :param fallback: 熔断打开时的降级函数 (method, url, params) -> 接口 data，
+            结果同样经过 result_processor 处理；返回 None 时仍抛出 CircuitOpenException
+        :param timer: 计时函数
+        """
+        self.failure_threshold = failure_threshold
+        self.error_rate = error_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.fallback = fallback
+        self.timer = timer
+
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def circuit_key(method: str, url: str) -> str:
+        """
+        熔断器 key: 方法 + base url + 路径模板
+        """
+        parts = urlsplit(url)
+        path = path_template(parts.path)
+        return f"{method.upper()} {parts.scheme}://{parts.netloc}{path}"
+
+    def _circuit(self, key: str) -> _Circuit:
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = _Circuit(self.window)
+        return circuit
+
+    def before(self, key: str):
+        """
+        请求前检查熔断状态
+        :param key: 熔断器 key
+
+        :raise CircuitOpenException: 熔断打开
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == self.CLOSED:
+                return
+            if circuit.state == self.OPEN:
+                if self.timer() - circuit.opened_at < self.recovery_timeout:
+                    raise self._open_exception(key)
+                circuit.state = self.HALF_OPEN
+                circuit.probes = 0
+            if circuit.probes >= self.half_open_max_calls:
+                raise self._open_exception(key)
+            circuit.probes += 1
+
+    def record(self, key: str, success: bool):
+        """
+        记录请求结果
+        :param key: 熔断器 key
+        :param success: 是否成功
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == self.HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+                if success:
+                    self._close(circuit)
+                else:
+                    self._open(circuit)
+                return
+
+            circuit.results.append(success)
+            if success:
+                circuit.failures = 0
+                return
+            circuit.failures += 1
+            if circuit.state == self.CLOSED and self._should_open(circuit):
+                self._open(circuit)
+
+    def release(self, key: str):
+        """
+        请求未发出 (如限流或登录失败) 时归还半开探测名额，不记录结果
+        :param key: 熔断器 key
+        """
+        with self._lock:
+            circuit = self._circuit(key)
+            if circuit.state == self.HALF_OPEN:
+                circuit.probes = max(0, circuit.probes - 1)
+
+    def _should_open(self, circuit: _Circuit) -> bool:
+        if circuit.failures >= self.failure_threshold:
+            return True
+        if self.error_rate is None or len(circuit.results) < self.min_calls:
+            return False
+        failures = circuit.results.count(False)
+        return failures / len(circuit.results) >= self.error_rate
+
+    def _open(self, circuit: _Circuit):
+        circuit.state = self.OPEN
+        circuit.opened_at = self.timer()
+
+    @staticmethod
+    def _close(circuit: _Circuit):
+        circuit.state = CircuitBreaker.CLOSED
+        circuit.failures = 0
+        circuit.results.clear()
+
+    def _open_exception(self, key: str) -> CircuitOpenException:
+        return CircuitOpenException(
+            errcode=-1, errmsg=f"Circuit open for {key}"
+        )
+
+    def state(self, key: str) -> str:
+        """
+        熔断状态 closed / open / half_open
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            return self.CLOSED if circuit is None else circuit.state
+
+    def stats(self) -> dict[str, str]:
+        """
+        熔断状态统计
+        :return: 熔断器 key -> 状态
+        """
+        with self._lock:
+            return {key: c.state for key, c in self._circuits.items()}
+
+    def reset(self):
+        """
+        关闭所有熔断器
+        """
+        with self._lock:
+            self._circuits.clear()
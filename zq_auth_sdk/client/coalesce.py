@@ -0,0 +1,91 @@
+import copy
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable
+
+from zq_auth_sdk.entities.types import JSONVal
+
+# 发起方被中断 (取消/KeyboardInterrupt) 时交给等待方的标记，等待方重新发起请求
+_RETRY = object()
+
+
+def request_key(
+    method: str,
+    url: str,
+    params: dict | None,
+    *extra: Hashable,
+) -> tuple:
+    """
+    请求合并的 key: 方法 + 地址 + query 参数
+    """
+    items = tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+    return (method.upper(), url, items) + extra
+
+
+class RequestCoalescer:
+    """
+    合并相同的进行中请求 (多线程)
+
+    相同 key 的请求同时进行时只有第一个线程真正发出请求，
+    其余线程等待并共享其结果或异常。仅应用于幂等请求。
+    发起方被中断时由一个等待方接替重新发起请求。
+    """
+
+    def __init__(self):
+        self._calls: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+        self.requests = 0  # 实际发出的请求数
+        self.saved = 0  # 被合并而未发出的请求数
+
+    def do(self, key: tuple, func: Callable[[], JSONVal]) -> JSONVal:
+        """
+        执行请求，相同 key 的请求进行中时等待其结果
+        :param key: 请求 key
+        :param func: 发出请求的函数
+        :return: 请求结果 (合并的请求得到结果的副本)
+        """
+        while True:
+            with self._lock:
+                future = self._calls.get(key)
+                if future is None:
+                    future = self._calls[key] = Future()
+                    self.requests += 1
+                    break
+                self.saved += 1
+
+            result = future.result()
+            if result is not _RETRY:
+                return copy.deepcopy(result)
+            with self._lock:
+                self.saved -= 1  # 由其中一个等待方接替发起请求
+
+        try:
+            result = func()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            # 发起方被中断不代表请求失败，不把中断传给等待方
+            future.set_result(_RETRY)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict[str, int]:
+        """
+        合并统计
+        :return: requests / saved / in_flight
+        """
+        return {
+            "requests": self.requests,
+            "saved": self.saved,
+            "in_flight": self.in_flight,
+        }
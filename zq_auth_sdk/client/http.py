@@ -0,0 +1,122 @@
+import socket
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+
+def _keepalive_socket_options(idle: int, interval: int, count: int) -> list:
+    """
+    TCP keep-alive socket 选项，忽略当前平台不支持的选项
+    """
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    for name, value in (
+        ("TCP_KEEPIDLE", idle),
+        ("TCP_KEEPALIVE", idle),  # macOS
+        ("TCP_KEEPINTVL", interval),
+        ("TCP_KEEPCNT", count),
+    ):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """开启 TCP keep-alive 的 HTTPAdapter"""
+
+    def __init__(self, socket_options: list | None = None, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class HTTPPool:
+    """
+    HTTP 连接池
+
+    基于 requests.Session，可在多个客户端间共享。
+    requests.Session 本身不保证线程安全：连接池只在创建时挂载 adapter，
+    之后不修改 session 的 headers / auth 等配置，底层 urllib3 连接池可多线程复用；
+    但 cookie 仍保存在共享的 session 中，不要依赖 cookie 区分客户端。
+    由客户端创建的连接池在客户端 close 时关闭；
+    传入客户端的共享连接池需由调用方关闭。
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        tcp_keepalive: bool = True,
+        keepalive_idle: int = 60,
+        keepalive_interval: int = 10,
+        keepalive_count: int = 6,
+    ):
+        """
+        :param pool_connections: 缓存的连接池数量 (按 host 区分)
+        :param pool_maxsize: 每个 host 的最大连接数
+        :param pool_block: 连接耗尽时是否阻塞等待，否则新建不复用的连接
+        :param tcp_keepalive: 是否开启 TCP keep-alive
+        :param keepalive_idle: 空闲多久后开始发送 keep-alive 探测 (秒)
+        :param keepalive_interval: keep-alive 探测间隔 (秒)
+        :param keepalive_count: keep-alive 探测失败多少次后断开
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+
+        socket_options = None
+        if tcp_keepalive:
+            socket_options = HTTPConnection.default_socket_options + (
+                _keepalive_socket_options(
+                    keepalive_idle, keepalive_interval, keepalive_count
+                )
+            )
+
+        self.session = requests.Session()
+        self.adapter = KeepAliveAdapter(
+            socket_options=socket_options,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.closed = False
+
+    def stats(self) -> dict[str, int]:
+        """
+        连接池统计
+        :return: hosts (host 连接池数) / connections (累计新建连接数) /
+            in_use (使用中的连接数) / requests (累计请求数)
+        """
+        pools = self.adapter.poolmanager.pools
+        host_pools = [pools[key] for key in pools.keys() if key in pools]
+        return {
+            "hosts": len(host_pools),
+            "connections": sum(p.num_connections for p in host_pools),
+            "in_use": sum(
+                p.pool.maxsize - p.pool.qsize()
+                for p in host_pools
+                if p.pool is not None
+            ),
+            "requests": sum(p.num_requests for p in host_pools),
+        }
+
+    def close(self):
+        """
+        关闭连接池，释放所有连接
+        """
+        if not self.closed:
+            self.session.close()
+            self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,260 @@
+import asyncio
+import threading
+import time
+from typing import Callable
+
+from zq_auth_sdk.entities.response import ZqAuthResponseType
+from zq_auth_sdk.exceptions import RateLimitExceededException
+
+
+class RateLimiter:
+    """
+    自适应令牌桶限流 (进程内)
+
+    请求前从令牌桶中取令牌，令牌不足时最多等待 max_wait 秒，否则在本地直接拒绝。
+    令牌生成速率按 AIMD 调整：收到限流响应 (A0512) 时乘以 decrease，
+    成功时增加 increase，速率范围为 [min_rate, max_rate]。
+    """
+
+    def __init__(
+        self,
+        rate: float = 10,
+        burst: float | None = None,
+        min_rate: float = 0.5,
+        max_rate: float | None = None,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        decrease_interval: float = 1,
+        max_wait: float = 1,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param rate: 初始速率 (请求/秒)
+        :param burst: 令牌桶容量，默认与 rate 相同
+        :param min_rate: 最低速率
+        :param max_rate: 最高速率，默认为 rate
+        :param increase: 每次成功响应增加的速率
+        :param decrease: 限流响应时速率的缩减比例
+        :param decrease_interval: 两次缩减的最小间隔 (秒)，避免同一批请求重复缩减
+        :param max_wait: 取令牌的最长等待时间 (秒)，超过则本地拒绝
+        :param timer: 计时函数
+        """
+        self.burst = max(1.0, rate if burst is None else burst)
+        self.min_rate = min_rate
+        self.max_rate = rate if max_rate is None else max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.decrease_interval = decrease_interval
+        self.max_wait = max_wait
+        self.timer = timer
+
+        self._initial_rate = rate
+        self._lock = threading.Lock()
+        self._state = self._initial_state(timer())
+        self._waiting = 0
+        self.rejected = 0
+
+    def _initial_state(self, now: float) -> dict:
+        return {
+            "tokens": self.burst,
+            "ts": now,
+            "rate": self._initial_rate,
+            "cut_at": float("-inf"),
+        }
+
+    # region state
+    def _transact(self, func: Callable[[dict, float], float | None]):
+        """
+        原子地读取、修改令牌桶状态
+        :param func: 修改状态的函数 (state, now) -> 返回值
+        """
+        with self._lock:
+            return func(self._state, self.timer())
+
+    def _take(self, max_wait: float) -> Callable[[dict, float], float | None]:
+        def take(state: dict, now: float) -> float | None:
+            rate = state["rate"]
+            elapsed = max(0.0, now - state["ts"])
+            tokens = min(self.burst, state["tokens"] + elapsed * rate)
+            state["ts"] = now
+            if tokens >= 1:
+                state["tokens"] = tokens - 1
+                return 0.0
+            # 令牌可以为负，表示已被排队的请求预订
+            delay = (1 - tokens) / rate
+            if delay > max_wait:
+                state["tokens"] = tokens
+                return None
+            state["tokens"] = tokens - 1
+            return delay
+
+        return take
+
+    def _throttled(self, state: dict, now: float):
+        if now - state["cut_at"] < self.decrease_interval:
+            return
+        state["rate"] = max(self.min_rate, state["rate"] * self.decrease)
+        state["tokens"] = min(state["tokens"], 0.0)
+        state["cut_at"] = now
+
+    def _succeeded(self, state: dict, now: float):
+        state["rate"] = min(self.max_rate, state["rate"] + self.increase)
+
+    # endregion
+
+    def reserve(self, max_wait: float | None = None) -> float | None:
+        """
+        预订一个令牌
+        :param max_wait: 最长等待时间 (秒)，默认为 self.max_wait
+        :return: 需要等待的时间 (秒)，超过 max_wait 时返回 None
+        """
+        if max_wait is None:
+            max_wait = self.max_wait
+        delay = self._transact(self._take(max_wait))
+        if delay is None:
+            with self._lock:
+                self.rejected += 1
+        return delay
+
+    def _rejected(self) -> RateLimitExceededException:
+        return RateLimitExceededException(
+            errcode=ZqAuthResponseType.APIThrottled.code,
+            errmsg=f"Client-side rate limit exceeded ({self.rate:.2f}/s)",
+        )
+
+    def acquire(self, max_wait: float | None = None):
+        """
+        取令牌，必要时阻塞等待
+        :param max_wait: 最长等待时间 (秒)，默认为 self.max_wait
+
+        :raise RateLimitExceededException: 无法在 max_wait 内取得令牌
+        """
+        delay = self.reserve(max_wait)
+        if delay is None:
+            raise self._rejected()
+        if delay > 0:
+            self._add_waiting(1)
+            try:
+                time.sleep(delay)
+            finally:
+                self._add_waiting(-1)
+
+    async def acquire_async(self, max_wait: float | None = None):
+        """
+        取令牌，必要时异步等待
+        :param max_wait: 最长等待时间 (秒)，默认为 self.max_wait
+
+        :raise RateLimitExceededException: 无法在 max_wait 内取得令牌
+        """
+        delay = self.reserve(max_wait)
+        if delay is None:
+            raise self._rejected()
+        if delay > 0:
+            self._add_waiting(1)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._add_waiting(-1)
+
+    def _add_waiting(self, n: int):
+        with self._lock:
+            self._waiting += n
+
+    def record(self, throttled: bool):
+        """
+        根据响应调整速率
+        :param throttled: 是否为限流响应
+        """
+        if throttled:
+            self._transact(self._throttled)
+        elif self.rate < self.max_rate:
+            self._transact(self._succeeded)
+
+    @property
+    def rate(self) -> float:
+        """当前速率 (请求/秒)"""
+        return self._state["rate"]
+
+    @property
+    def queue_depth(self) -> int:
+        """本进程中正在等待令牌的请求数"""
+        return self._waiting
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+        }
+
+
+class RedisRateLimiter(RateLimiter):
+    """
+    自适应令牌桶限流 (多进程共享)
+
+    令牌桶状态保存在 redis hash 中，通过 WATCH 事务原子更新，
+    所有 worker 共享同一速率。queue_depth 仍为本进程的等待数。
+    """
+
+    def __init__(
+        self,
+        redis,
+        key: str = "zqauth:ratelimit",
+        rate: float = 10,
+        ttl: int = 3600,
+        **kwargs,
+    ):
+        """
+        :param redis: redis 客户端
+        :param key: 令牌桶状态 key，共享限流的 worker 使用相同的 key
+        :param rate: 初始速率 (请求/秒)
+        :param ttl: 状态过期时间 (秒)，长时间无请求后恢复初始速率
+        :param kwargs: 其他参数同 RateLimiter
+        """
+        kwargs.setdefault("timer", time.time)  # 跨进程需使用墙上时间
+        self.redis = redis
+        self.key = key
+        self.ttl = ttl
+        super().__init__(rate=rate, **kwargs)
+        self._state = None
+        self._last_rate = rate
+
+    @staticmethod
+    def _load_state(raw: dict) -> dict:
+        return {
+            (key.decode() if isinstance(key, bytes) else key): float(value)
+            for key, value in raw.items()
+        }
+
+    def _transact(self, func: Callable[[dict, float], float | None]):
+        from redis.exceptions import WatchError
+
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(self.key)
+                    now = self.timer()
+                    raw = pipe.hgetall(self.key)
+                    state = (
+                        self._load_state(raw)
+                        if raw
+                        else self._initial_state(now)
+                    )
+                    result = func(state, now)
+                    self._last_rate = state["rate"]
+                    pipe.multi()
+                    pipe.hset(
+                        self.key,
+                        mapping={k: repr(v) for k, v in state.items()},
+                    )
+                    pipe.expire(self.key, self.ttl)
+                    pipe.execute()
+                    return result
+                except WatchError:
+                    # 其他 worker 同时修改了状态，重试
+                    continue
+
+    @property
+    def rate(self) -> float:
+        """最近一次读取到的共享速率 (请求/秒)"""
+        return self._last_rate
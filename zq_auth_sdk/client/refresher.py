@@ -0,0 +1,110 @@
+import logging
+import random
+import threading
+from typing import TYPE_CHECKING
+
+from zq_auth_sdk.utils import now
+
+if TYPE_CHECKING:
+    from zq_auth_sdk.client.base import BaseWeChatClient
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRefresher:
+    """
+    后台 access token 刷新
+
+    在 access token 过期前 margin 秒 (再随机提前 0~jitter 秒) 于后台线程刷新，
+    请求线程读取 token 时不会因刷新而阻塞。
+    """
+
+    def __init__(
+        self,
+        client: "BaseWeChatClient",
+        margin: float = 300,
+        jitter: float = 60,
+        retry_interval: float = 10,
+        idle_interval: float = 60,
+    ):
+        """
+        :param client: 客户端
+        :param margin: 提前刷新时间 (秒)
+        :param jitter: 随机提前的最大时间 (秒)，避免多个 worker 同时刷新
+        :param retry_interval: 刷新失败后的重试间隔 (秒)
+        :param idle_interval: 无过期时间时重新检查的间隔 (秒)
+        """
+        self.client = client
+        self.margin = margin
+        self.jitter = jitter
+        self.retry_interval = retry_interval
+        self.idle_interval = idle_interval
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def next_delay(self) -> float:
+        """
+        距下次刷新的时间 (秒)
+        """
+        expire_time = self.client.expire_time
+        if expire_time is None:
+            # 用户提供的 access token，没有过期时间
+            return self.idle_interval
+        remaining = (expire_time - now()).total_seconds()
+        # token 有效期短于 margin 时最多提前一半，避免连续刷新
+        lead = min(self.margin + random.uniform(0, self.jitter), remaining / 2)
+        # 但不晚于请求线程认为 token 已过期的时间
+        margin = self.client.TOKEN_REFRESH_MARGIN.total_seconds()
+        lead = max(lead, margin)
+        return max(remaining - lead, 0)
+
+    def start(self):
+        """
+        启动后台刷新线程
+        """
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            name=f"zq_auth_token_refresher_{self.client.appid}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None):
+        """
+        停止后台刷新线程
+        :param timeout: 等待线程退出的最长时间
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.next_delay()):
+            if self.client.expire_time is None:
+                continue
+            try:
+                self.refresh()
+            except Exception:  # noqa
+                logger.exception("Background access token refresh failed")
+                if self._stop.wait(self.retry_interval):
+                    break
+
+    def refresh(self):
+        stale_token = self.client._stored_access_token()
+        self.client.refresh_access_token(stale_token=stale_token)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
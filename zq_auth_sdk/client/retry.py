@@ -0,0 +1,182 @@
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterable
+
+from zq_auth_sdk.entities.response import ZqAuthResponseType
+
+
+class RetryPolicy:
+    """
+    请求重试策略
+
+    指数退避 + full jitter：第 n 次重试前等待 uniform(0, min(cap, base * 2 ** (n - 1))) 秒，
+    响应带有 Retry-After 时以其为准。超过最大尝试次数或总时间预算后不再重试。
+
+    限流响应 (A0512) 说明请求未被执行，任何请求都会重试；
+    服务端错误与连接错误仅对幂等请求重试。
+    """
+
+    # 请求未被执行，总是可以重试
+    THROTTLED_CODES = frozenset({ZqAuthResponseType.APIThrottled.code})
+    # 请求可能已被执行，仅幂等请求重试
+    SERVER_ERROR_CODES = frozenset(
+        {
+            ZqAuthResponseType.ServerError.code,
+            ZqAuthResponseType.ServerTimeout.code,
+        }
+    )
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10,
+        total_timeout: float | None = 30,
+        respect_retry_after: bool = True,
+        retry_codes: Iterable[str] | None = None,
+        idempotent_methods: Iterable[str] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param max_attempts: 最大尝试次数 (包含首次请求)，1 为不重试
+        :param backoff_base: 退避基础时间 (秒)
+        :param backoff_max: 单次退避的最长时间 (秒)
+        :param total_timeout: 重试总时间预算 (秒)，None 为不限制
+        :param respect_retry_after: 是否遵循响应头 Retry-After
+        :param retry_codes: 幂等请求可重试的响应 code，默认为服务端错误
+        :param idempotent_methods: 默认视为幂等的请求方法
+        :param sleep: 同步客户端的等待函数
+        :param timer: 计时函数
+        """
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.total_timeout = total_timeout
+        self.respect_retry_after = respect_retry_after
+        self.retry_codes = frozenset(
+            self.SERVER_ERROR_CODES if retry_codes is None else retry_codes
+        )
+        self.idempotent_methods = frozenset(
+            method.upper()
+            for method in (
+                self.IDEMPOTENT_METHODS
+                if idempotent_methods is None
+                else idempotent_methods
+            )
+        )
+        self.sleep = sleep
+        self.timer = timer
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        """
+        不重试的策略
+        """
+        return cls(max_attempts=1)
+
+    def is_idempotent(self, method: str) -> bool:
+        return method.upper() in self.idempotent_methods
+
+    def is_retryable_code(self, code: str, idempotent: bool) -> bool:
+        """
+        响应 code 是否可以重试
+        """
+        if code in self.THROTTLED_CODES:
+            return True
+        return idempotent and code in self.retry_codes
+
+    def backoff(self, attempt: int) -> float:
+        """
+        第 attempt 次请求失败后的等待时间 (full jitter)
+        """
+        cap = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
+    @staticmethod
+    def parse_retry_after(value: str | None) -> float | None:
+        """
+        解析 Retry-After 响应头 (秒数或 HTTP 日期)
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def start(
+        self, method: str, idempotent: bool | None = None
+    ) -> "RetryState":
+        """
+        开始一次请求的重试计数
+        :param method: 请求方法
+        :param idempotent: 请求是否可以安全重试，None 时根据请求方法判断
+        """
+        if idempotent is None:
+            idempotent = self.is_idempotent(method)
+        return RetryState(self, idempotent)
+
+
+class RetryState:
+    """
+    单次请求 (包含重试) 的重试状态
+    """
+
+    def __init__(self, policy: RetryPolicy, idempotent: bool):
+        self.policy = policy
+        self.idempotent = idempotent
+        self.attempts = 1
+        self.started = policy.timer()
+
+    def next_delay(self, retry_after: str | None = None) -> float | None:
+        """
+        计算下次重试前的等待时间，并计入一次尝试
+        :param retry_after: 响应头 Retry-After
+        :return: 等待时间 (秒)，不再重试时返回 None
+        """
+        policy = self.policy
+        if self.attempts >= policy.max_attempts:
+            return None
+
+        delay = None
+        if policy.respect_retry_after:
+            delay = policy.parse_retry_after(retry_after)
+        if delay is None:
+            delay = policy.backoff(self.attempts)
+
+        if policy.total_timeout is not None:
+            elapsed = policy.timer() - self.started
+            if elapsed + delay > policy.total_timeout:
+                return None
+
+        self.attempts += 1
+        return delay
+
+    def retry_response(
+        self, code: str, retry_after: str | None
+    ) -> float | None:
+        """
+        响应失败时的重试等待时间，不可重试时返回 None
+        """
+        if not self.policy.is_retryable_code(code, self.idempotent):
+            return None
+        return self.next_delay(retry_after)
+
+    def retry_error(self) -> float | None:
+        """
+        连接错误时的重试等待时间，不可重试时返回 None
+        """
+        if not self.idempotent:
+            return None
+        return self.next_delay()
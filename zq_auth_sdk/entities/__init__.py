@@ -0,0 +1 @@
+from zq_auth_sdk.entities.info import AppInfo, UserInfo  # noqa
@@ -0,0 +1,162 @@
+import uuid
+from datetime import datetime
+from typing import Iterable, NamedTuple
+
+from zq_auth_sdk.entities.types import JSONVal
+
+
+def union_id_bytes(union_id: uuid.UUID | str) -> bytes | str:
+    """
+    union id 转为 16 字节表示
+    :param union_id: 用户 union id
+    :return: 无法解析为 uuid 时原样返回
+    """
+    if isinstance(union_id, uuid.UUID):
+        return union_id.bytes
+    try:
+        return uuid.UUID(union_id).bytes
+    except ValueError:
+        return union_id
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
+
+
+_USER_FIELDS = frozenset(
+    (
+        "name",
+        "student_id",
+        "phone",
+        "is_certified",
+        "certify_time",
+        "update_time",
+    )
+)
+# 响应中的 key 元组，相同结构的响应共享同一个元组
+_payload_keys: dict[tuple, tuple] = {}
+
+
+def _intern_keys(keys: tuple) -> tuple:
+    return _payload_keys.setdefault(keys, keys)
+
+
+class UserInfo(NamedTuple):
+    """
+    用户信息
+
+    字段名保存在类上，实例不重复保存 key；union id 以 16 字节保存，
+    时间字段保持原始字符串，访问 certified_at / updated_at 时才解析。
+    不可修改，可在缓存与线程间共享。
+
+    payload_keys 记录响应中出现的 key (相同结构的响应共享)，
+    未知字段保存在 extra 中，to_dict 可还原原始响应 (包括值为 None 的字段)。
+    detail=False 时接口只返回 certify_time，其余字段为 None。
+    """
+
+    union_id_bytes: bytes | str
+    name: str | None = None
+    student_id: str | None = None
+    phone: str | None = None
+    is_certified: bool | None = None
+    certify_time: str | None = None
+    update_time: str | None = None
+    payload_keys: tuple[str, ...] = ()
+    extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict, union_id: uuid.UUID | str) -> "UserInfo":
+        """
+        :param data: user_info 接口返回数据
+        :param union_id: 用户 union id
+        """
+        get = data.get
+        keys = _intern_keys(tuple(data))
+        extra = None
+        if not _USER_FIELDS.issuperset(keys):
+            extra = {k: v for k, v in data.items() if k not in _USER_FIELDS}
+        return cls(
+            union_id_bytes(union_id),
+            get("name"),
+            get("student_id"),
+            get("phone"),
+            get("is_certified"),
+            get("certify_time"),
+            get("update_time"),
+            keys,
+            extra,
+        )
+
+    @property
+    def union_id(self) -> str:
+        """32 位 hex 格式的 union id"""
+        raw = self.union_id_bytes
+        return uuid.UUID(bytes=raw).hex if isinstance(raw, bytes) else raw
+
+    @property
+    def uuid(self) -> uuid.UUID | None:
+        raw = self.union_id_bytes
+        return uuid.UUID(bytes=raw) if isinstance(raw, bytes) else None
+
+    @property
+    def certified_at(self) -> datetime | None:
+        """认证时间"""
+        return _parse_time(self.certify_time)
+
+    @property
+    def updated_at(self) -> datetime | None:
+        """更新时间"""
+        return _parse_time(self.update_time)
+
+    def brief(self, fields: Iterable[str]) -> "UserInfo":
+        """
+        只保留指定字段 (detail=False 的结果)
+        :param fields: 保留的字段名
+        """
+        fields = set(fields)
+        extra = self.extra
+        if extra is not None:
+            extra = {k: v for k, v in extra.items() if k in fields} or None
+        return self._replace(
+            **{name: None for name in _USER_FIELDS if name not in fields},
+            payload_keys=_intern_keys(
+                tuple(k for k in self.payload_keys if k in fields)
+            ),
+            extra=extra,
+        )
+
+    def to_dict(self) -> JSONVal:
+        """
+        转为接口返回格式 (与原始响应相同的 key)，不包含 union id
+        """
+        extra = self.extra
+        return {
+            key: getattr(self, key) if key in _USER_FIELDS else extra[key]
+            for key in self.payload_keys
+        }
+
+
+class AppInfo(NamedTuple):
+    """
+    app 信息
+    """
+
+    id: int
+    username: str
+    name: str
+    is_active: bool
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AppInfo":
+        """
+        :param data: app_info 接口返回数据
+        """
+        return cls(
+            data["id"], data["username"], data["name"], data["is_active"]
+        )
+
+    def to_dict(self) -> JSONVal:
+        """
+        转为接口返回格式
+        """
+        return self._asdict()
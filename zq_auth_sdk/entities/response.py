@@ -1,12 +1,12 @@
-from dataclasses import dataclass
+import json
 from enum import Enum, unique
 from typing import TYPE_CHECKING, Type
 
-from requests import Response
-
-from zq_auth_sdk.exceptions import ZqAuthClientException
+from zq_auth_sdk.exceptions import APILimitedException, ZqAuthClientException
 
 if TYPE_CHECKING:
+    from requests import Response
+
     from zq_auth_sdk.entities.types import JSONVal
 
 
@@ -95,60 +95,120 @@ class ZqAuthResponseType(ZqAuthResponseTypeEnum):
 # endregion
 
 
-@dataclass
+# 热路径使用的 code，避免每次访问枚举属性
+SUCCESS_CODE = ZqAuthResponseType.Success.code
+TOKEN_INVALID_CODE = (
+    ZqAuthResponseType.TokenInvalid.code
+)  # 与 RefreshTokenInvalid 相同
+THROTTLED_CODE = ZqAuthResponseType.APIThrottled.code
+
+# code -> 状态类型，code 重复时 (A0221) 取先定义的 TokenInvalid
+CODE_TYPES: dict[str, ZqAuthResponseType] = {
+    response_type.code: response_type
+    for response_type in reversed(ZqAuthResponseType)
+}
+
+# code -> 默认异常类型，未列出的 code 使用 ZqAuthClientException
+CODE_EXCEPTIONS: dict[str, Type[ZqAuthClientException]] = {
+    THROTTLED_CODE: APILimitedException,
+}
+
+
 class ZqAuthResponse:
     """API响应数据结构"""
 
-    code: str
-    detail: str
-    msg: str
-    data: "JSONVal"
-
-    _response = None
-    _client = None
+    __slots__ = ("code", "_result", "_response", "_client")
 
     def __init__(
         self,
-        response: Response,
+        response: "Response",
         client=None,
         raise_exception: bool = False,
     ):
         """
         Api 响应
+
+        构造时只解析一次 JSON 并读取 code，其余字段在访问时读取
+
         :param response: 响应
         :param raise_exception: 是否对非正常code报错
         :param client: 当前客户端
 
         :raise ZqAuthClientException: 非正常响应异常
+        :raise ValueError: 响应不是 JSON
         """
         self._response = response
         self._client = client
 
-        result = response.json()
-
-        self.code = result["code"]
-        self.msg = result["msg"]
-        self.detail = result["detail"]
-        self.data = result["data"]
+        # bytes 直接解析，省去 requests 的文本解码
+        self._result = json.loads(response.content)
+        self.code: str = self._result["code"]
 
         if raise_exception:
             self.check_exception()
 
+    @property
+    def msg(self) -> str:
+        return self._result["msg"]
+
+    @property
+    def detail(self) -> str:
+        return self._result["detail"]
+
+    @property
+    def data(self) -> "JSONVal":
+        return self._result["data"]
+
+    @property
+    def type(self) -> ZqAuthResponseType | None:
+        """
+        响应状态类型，A0221 对应 TokenInvalid
+        """
+        return CODE_TYPES.get(self.code)
+
+    def __eq__(self, other):
+        if not isinstance(other, ZqAuthResponse):
+            return NotImplemented
+        return (self.code, self.detail, self.msg, self.data) == (
+            other.code,
+            other.detail,
+            other.msg,
+            other.data,
+        )
+
+    __hash__ = None
+
     def __str__(self) -> str:
         return f"code: {self.code}, detail: {self.detail}, msg: {self.msg}, data: {self.data}"
 
     def __repr__(self):
-        return self.data
+        return f"ZqAuthResponse(code={self.code!r}, msg={self.msg!r})"
+
+    def exception_class(
+        self,
+        exceptions: dict[str, Type[ZqAuthClientException]] | None = None,
+    ) -> Type[ZqAuthClientException]:
+        """
+        code 对应的异常类型
+        :param exceptions: 接口自定义的 code -> 异常类型，优先于默认映射
+        """
+        if exceptions is not None:
+            exception = exceptions.get(self.code)
+            if exception is not None:
+                return exception
+        return CODE_EXCEPTIONS.get(self.code, ZqAuthClientException)
 
     def check_exception(
-        self, exception: Type[ZqAuthClientException] = ZqAuthClientException
+        self, exception: Type[ZqAuthClientException] | None = None
     ):
         """
         检测 code 并 raise 异常
-        :param exception: 产生的异常
+        :param exception: 产生的异常，默认根据 code 选择
         :return:
         """
-        if self.code != ZqAuthResponseType.Success.code:
+        if self.code != SUCCESS_CODE:
+            if exception is None:
+                exception = self.exception_class()
             raise exception(
                 errcode=self.code,
                 errmsg=self.msg,
@@ -76,3 +76,23 @@ class APILimitedException(ZqAuthClientException):
     """WeChat API call limited exception class"""
 
     pass
+
+
+class RateLimitExceededException(APILimitedException):
+    """Request rejected by the client-side rate limiter"""
+
+    pass
+
+
+class CircuitOpenException(ZqAuthClientException):
+    """ZqAuth API circuit breaker is open, request not sent"""
+
+    def __init__(
+        self,
+        errcode=-1,
+        errmsg="Circuit breaker is open",
+        client=None,
+        request=None,
+        response=None,
+    ):
+        super().__init__(errcode, errmsg, client, request, response)
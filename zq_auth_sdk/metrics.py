@@ -0,0 +1,396 @@
+"""
+    zq_auth_sdk.metrics
+    ~~~~~~~~~~~~~~~~~~~
+
+    客户端运行指标：请求延迟直方图、响应 code 计数、登录/刷新次数与耗时、重试次数，
+    可通过 client.stats() 读取快照，或推送到 MetricsSink (Prometheus / statsd / 回调)。
+"""
+import bisect
+import os
+import socket
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Iterable
+from urllib.parse import urlsplit
+
+from zq_auth_sdk.utils import path_template
+
+# 请求延迟直方图桶上限 (秒)
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def endpoint_key(method: str, url: str) -> str:
+    """
+    指标使用的接口名: 方法 + 路径模板，如 `GET /users/:id/`
+    """
+    return f"{method.upper()} {path_template(urlsplit(url).path)}"
+
+
+class Histogram:
+    """累积直方图 (与 Prometheus histogram 语义一致)"""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)  # 非累积，snapshot 时累加
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        cumulative, total = {}, 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            cumulative[bound] = total
+        return {"count": self.count, "sum": self.sum, "buckets": cumulative}
+
+
+class MetricsSink:
+    """
+    指标推送目标
+
+    increment / timing 在每次事件发生时调用，flush 时接收完整快照。
+    子类按需实现。
+    """
+
+    def increment(self, name: str, value: int = 1, tags: dict | None = None):
+        pass
+
+    def timing(self, name: str, seconds: float, tags: dict | None = None):
+        pass
+
+    def flush(self, snapshot: dict):
+        pass
+
+
+class CallbackSink(MetricsSink):
+    """
+    回调
+
+    callback(kind, name, value, tags)，kind 为 increment / timing
+    """
+
+    def __init__(self, callback: Callable[[str, str, float, dict], None]):
+        self.callback = callback
+
+    def increment(self, name: str, value: int = 1, tags: dict | None = None):
+        self.callback("increment", name, value, tags or {})
+
+    def timing(self, name: str, seconds: float, tags: dict | None = None):
+        self.callback("timing", name, seconds, tags or {})
+
+
+class StatsdSink(MetricsSink):
+    """
+    statsd (UDP)，tags 使用 DogStatsD 格式 `|#key:value`
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8125,
+        prefix: str = "zqauth",
+        tags: bool = True,
+    ):
+        """
+        :param host: statsd 地址
+        :param port: statsd 端口
+        :param prefix: 指标名前缀
+        :param tags: 是否发送 tags (原生 statsd 不支持时关闭)
+        """
+        self.address = (host, port)
+        self.prefix = prefix
+        self.tags = tags
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _send(self, name: str, value: str, tags: dict | None):
+        line = f"{self.prefix}.{name}:{value}"
+        if self.tags and tags:
+            line += "|#" + ",".join(f"{k}:{v}" for k, v in tags.items())
+        try:
+            self._socket.sendto(line.encode(), self.address)
+        except OSError:
+            pass  # 指标发送失败不影响请求
+
+    def increment(self, name: str, value: int = 1, tags: dict | None = None):
+        self._send(name, f"{value}|c", tags)
+
+    def timing(self, name: str, seconds: float, tags: dict | None = None):
+        self._send(name, f"{seconds * 1000:.3f}|ms", tags)
+
+    def close(self):
+        self._socket.close()
+
+
+def _labels(**labels) -> str:
+    pairs = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in labels.items()
+    )
+    return "{" + pairs + "}" if pairs else ""
+
+
+# 只增不减的统计项，按 counter 导出
+_COUNTERS = {
+    "pool": {"connections", "requests"},
+    "user_cache": {"hits", "misses", "evictions"},
+    "coalescer": {"requests", "saved"},
+    "rate_limiter": {"rejected"},
+}
+
+
+def render_prometheus(snapshot: dict, prefix: str = "zqauth") -> str:
+    """
+    将 client.stats() 快照渲染为 Prometheus 文本格式
+    """
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+    requests = snapshot.get("requests", {})
+    if requests:
+        metric("request_duration_seconds", "histogram", "Request latency")
+        for endpoint, data in requests.items():
+            method, _, path = endpoint.partition(" ")
+            latency = data["latency"]
+            for bound, count in latency["buckets"].items():
+                labels = _labels(method=method, endpoint=path, le=bound)
+                lines.append(
+                    f"{prefix}_request_duration_seconds_bucket{labels} {count}"
+                )
+            labels = _labels(method=method, endpoint=path, le="+Inf")
+            lines.append(
+                f"{prefix}_request_duration_seconds_bucket{labels} "
+                f"{latency['count']}"
+            )
+            labels = _labels(method=method, endpoint=path)
+            lines.append(
+                f"{prefix}_request_duration_seconds_sum{labels} "
+                f"{latency['sum']}"
+            )
+            lines.append(
+                f"{prefix}_request_duration_seconds_count{labels} "
+                f"{latency['count']}"
+            )
+
+        metric("responses_total", "counter", "Responses by code")
+        for endpoint, data in requests.items():
+            method, _, path = endpoint.partition(" ")
+            for code, count in data["codes"].items():
+                labels = _labels(method=method, endpoint=path, code=code)
+                lines.append(f"{prefix}_responses_total{labels} {count}")
+
+        metric("retries_total", "counter", "Request retries")
+        for endpoint, data in requests.items():
+            method, _, path = endpoint.partition(" ")
+            for reason, count in data["retries"].items():
+                labels = _labels(method=method, endpoint=path, reason=reason)
+                lines.append(f"{prefix}_retries_total{labels} {count}")
+
+    auth = snapshot.get("auth", {})
+    if auth:
+        metric("auth_total", "counter", "Login and token refresh calls")
+        for kind, data in auth.items():
+            for result in ("success", "failure"):
+                labels = _labels(kind=kind, result=result)
+                lines.append(f"{prefix}_auth_total{labels} {data[result]}")
+        metric(
+            "auth_duration_seconds", "summary", "Login and token refresh time"
+        )
+        for kind, data in auth.items():
+            labels = _labels(kind=kind)
+            lines.append(
+                f"{prefix}_auth_duration_seconds_sum{labels} {data['duration']}"
+            )
+            lines.append(
+                f"{prefix}_auth_duration_seconds_count{labels} "
+                f"{data['success'] + data['failure']}"
+            )
+
+    for section in ("pool", "user_cache", "coalescer", "rate_limiter"):
+        values = snapshot.get(section)
+        if not values:
+            continue
+        for key, value in values.items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            if key in _COUNTERS[section]:
+                name, kind = f"{section}_{key}_total", "counter"
+            else:
+                name, kind = f"{section}_{key}", "gauge"
+            metric(name, kind, f"{section} {key}")
+            lines.append(f"{prefix}_{name} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusSink(MetricsSink):
+    """
+    Prometheus 文本格式
+
+    flush 时渲染快照，可通过 text 属性对外暴露，
+    或写入文件供 node_exporter textfile collector 采集。
+    """
+
+    def __init__(self, path: str | None = None, prefix: str = "zqauth"):
+        """
+        :param path: 写入的文件路径 (可选)
+        :param prefix: 指标名前缀
+        """
+        self.path = path
+        self.prefix = prefix
+        self.text = ""
+
+    def flush(self, snapshot: dict):
+        self.text = render_prometheus(snapshot, self.prefix)
+        if self.path:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.text)
+            os.replace(tmp_path, self.path)  # 原子替换，避免读到半个文件
+
+
+class _EndpointMetrics:
+    __slots__ = ("latency", "codes", "retries")
+
+    def __init__(self, buckets: Iterable[float]):
+        self.latency = Histogram(buckets)
+        self.codes: Counter = Counter()
+        self.retries: Counter = Counter()
+
+
+class ClientMetrics:
+    """
+    客户端指标收集
+
+    线程安全，可在多个客户端间共享。未设置时客户端不做任何统计。
+    """
+
+    def __init__(
+        self,
+        sinks: Iterable[MetricsSink] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        :param sinks: 事件推送目标
+        :param buckets: 请求延迟直方图桶上限 (秒)
+        """
+        self.sinks = list(sinks)
+        self.buckets = tuple(buckets)
+        self._endpoints: dict[str, _EndpointMetrics] = {}
+        self._auth: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> _EndpointMetrics:
+        metrics = self._endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self._endpoints[endpoint] = _EndpointMetrics(self.buckets)
+        return metrics
+
+    def observe_request(self, endpoint: str, seconds: float):
+        """
+        记录请求延迟
+        :param endpoint: 接口 (方法 + 路径模板)
+        :param seconds: 耗时 (秒)
+        """
+        with self._lock:
+            self._endpoint(endpoint).latency.observe(seconds)
+        for sink in self.sinks:
+            sink.timing("request", seconds, {"endpoint": endpoint})
+
+    def observe_code(self, endpoint: str, code: str):
+        """
+        记录响应 code (连接错误记为 connection_error)
+        """
+        with self._lock:
+            self._endpoint(endpoint).codes[code] += 1
+        for sink in self.sinks:
+            sink.increment("response", 1, {"endpoint": endpoint, "code": code})
+
+    def observe_retry(self, endpoint: str, reason: str):
+        """
+        记录重试
+        :param reason: 重试原因 (token / 响应 code / connection_error)
+        """
+        with self._lock:
+            self._endpoint(endpoint).retries[reason] += 1
+        for sink in self.sinks:
+            sink.increment("retry", 1, {"endpoint": endpoint, "reason": reason})
+
+    def observe_auth(self, kind: str, seconds: float, success: bool):
+        """
+        记录登录/刷新
+        :param kind: login / refresh
+        """
+        with self._lock:
+            data = self._auth.setdefault(
+                kind, {"success": 0, "failure": 0, "duration": 0.0}
+            )
+            data["success" if success else "failure"] += 1
+            data["duration"] += seconds
+        for sink in self.sinks:
+            sink.timing(kind, seconds, {"success": success})
+
+    @contextmanager
+    def time_auth(self, kind: str):
+        """
+        统计登录/刷新耗时与结果
+        """
+        start = time.perf_counter()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self.observe_auth(kind, time.perf_counter() - start, success)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": {
+                    endpoint: {
+                        "latency": metrics.latency.snapshot(),
+                        "codes": dict(metrics.codes),
+                        "retries": dict(metrics.retries),
+                    }
+                    for endpoint, metrics in self._endpoints.items()
+                },
+                "auth": {kind: dict(data) for kind, data in self._auth.items()},
+            }
+
+    def flush(self, snapshot: dict | None = None):
+        """
+        推送快照到所有 sink
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.flush(snapshot)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._auth.clear()
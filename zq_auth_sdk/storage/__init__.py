@@ -1,3 +1,6 @@
+import uuid
+
+
 class SessionStorage:
     def get(self, key, default=None):
         raise NotImplementedError()
@@ -8,6 +11,77 @@ class SessionStorage:
     def delete(self, key):
         raise NotImplementedError()
 
+    def get_many(self, keys, default=None) -> dict:
+        """
+        批量读取
+        :param keys: key 列表
+        :param default: 不存在时的默认值
+        :return: key -> value
+        """
+        return {key: self.get(key, default) for key in keys}
+
+    def set_many(self, mapping, ttl=None):
+        """
+        批量写入，value 为 None 的项会被忽略
+        :param mapping: key -> value
+        :param ttl: 有效期，可传入 dict 为每个 key 单独指定
+        """
+        for key, value in mapping.items():
+            self.set(key, value, _ttl_of(ttl, key))
+
+    def delete_many(self, keys):
+        """
+        批量删除
+        """
+        for key in keys:
+            self.delete(key)
+
+    def add(self, key, value, ttl=None) -> bool:
+        """
+        key 不存在时写入
+        :return: 是否写入成功
+        """
+        raise NotImplementedError()
+
+    def update(self, key, func):
+        """
+        读取-修改-写入
+        :param key: key
+        :param func: 旧值 (不存在时为 None) -> (新值, 有效期)，冲突重试时会被多次调用
+        :return: 写入的值
+
+        默认实现不是原子的，并发写入时后写入的覆盖先写入的，
+        支持比较并交换 (CAS) 的存储后端会覆盖此方法
+        """
+        value, ttl = func(self.get(key))
+        self.set(key, value, ttl)
+        return value
+
+    def acquire_lease(self, key, ttl) -> str | None:
+        """
+        获取租约 (跨进程锁)，到期自动释放
+        :param key: 租约 key
+        :param ttl: 租约有效期 (秒)
+        :return: 租约 token，已被占用时返回 None
+
+        不支持原子写入 (add) 的存储后端总能获取租约
+        """
+        token = uuid.uuid4().hex
+        try:
+            return token if self.add(key, token, ttl) else None
+        except NotImplementedError:
+            return token
+
+    def release_lease(self, key, token):
+        """
+        释放租约，只删除 token 匹配的租约
+
+        默认实现先读取再删除，两步之间租约过期并被其他进程获取时
+        会误删其他进程的租约；存储后端应使用原子的比较并删除覆盖此方法
+        """
+        if self.get(key) == token:
+            self.delete(key)
+
     def __getitem__(self, key):
         self.get(key)
 
@@ -16,3 +90,12 @@ class SessionStorage:
 
     def __delitem__(self, key):
         self.delete(key)
+
+
+def _ttl_of(ttl, key):
+    """
+    取出 key 对应的有效期
+    """
+    if isinstance(ttl, dict):
+        return ttl.get(key)
+    return ttl
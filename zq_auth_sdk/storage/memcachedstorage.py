@@ -1,16 +1,22 @@
 # -*- coding: utf-8 -*-
-import json
-
-from zq_auth_sdk.storage import SessionStorage
-from zq_auth_sdk.utils import to_text
+from zq_auth_sdk.storage import SessionStorage, _ttl_of
+from zq_auth_sdk.storage.serializers import JSONSerializer, Serializer
 
 
 class MemcachedStorage(SessionStorage):
-    def __init__(self, mc, prefix="zqauth"):
+    def __init__(
+        self, mc, prefix="zqauth", serializer: Serializer | None = None
+    ):
+        """
+        :param mc: memcached 客户端
+        :param prefix: key 前缀
+        :param serializer: 值序列化器，默认为标准库 json
+        """
         for method_name in ("get", "set", "delete"):
             assert hasattr(mc, method_name)
         self.mc = mc
         self.prefix = prefix
+        self.serializer = serializer or JSONSerializer()
 
     def key_name(self, key):
         return f"{self.prefix}:{key}"
@@ -20,15 +26,82 @@ class MemcachedStorage(SessionStorage):
         value = self.mc.get(key)
         if value is None:
             return default
-        return json.loads(to_text(value))
+        return self.serializer.decode(value)
 
     def set(self, key, value, ttl=0):
         if value is None:
             return
         key = self.key_name(key)
-        value = json.dumps(value)
+        value = self.serializer.encode(value)
         self.mc.set(key, value, ttl)
 
     def delete(self, key):
         key = self.key_name(key)
         self.mc.delete(key)
+
+    def get_many(self, keys, default=None) -> dict:
+        keys = list(keys)
+        values = self.mc.get_many([self.key_name(key) for key in keys])
+        result = {}
+        for key in keys:
+            value = values.get(self.key_name(key))
+            result[key] = (
+                default if value is None else self.serializer.decode(value)
+            )
+        return result
+
+    def set_many(self, mapping, ttl=0):
+        # memcached 的 set_many 只支持统一的过期时间，按过期时间分组写入
+        groups = {}
+        for key, value in mapping.items():
+            if value is None:
+                continue
+            expire = _ttl_of(ttl, key) or 0
+            groups.setdefault(expire, {})[
+                self.key_name(key)
+            ] = self.serializer.encode(value)
+        for expire, values in groups.items():
+            self.mc.set_many(values, expire)
+
+    def delete_many(self, keys):
+        keys = [self.key_name(key) for key in keys]
+        if keys:
+            self.mc.delete_many(keys)
+
+    def add(self, key, value, ttl=0) -> bool:
+        if value is None:
+            return False
+        key = self.key_name(key)
+        value = self.serializer.encode(value)
+        return bool(self.mc.add(key, value, ttl or 0, noreply=False))
+
+    def update(self, key, func):
+        """
+        通过 gets/cas 实现，需要客户端支持 CAS
+        """
+        name = self.key_name(key)
+        while True:
+            old, cas = self.mc.gets(name)
+            value, ttl = func(
+                None if old is None else self.serializer.decode(old)
+            )
+            encoded = self.serializer.encode(value)
+            if old is None:
+                stored = self.mc.add(name, encoded, ttl or 0, noreply=False)
+            else:
+                stored = self.mc.cas(
+                    name, encoded, cas, ttl or 0, noreply=False
+                )
+            if stored:
+                return value
+
+    def release_lease(self, key, token):
+        """
+        通过 gets/cas 只删除 token 匹配的租约：
+        以立即过期的值覆盖，期间租约被其他进程获取时 cas 失败
+        """
+        name = self.key_name(key)
+        value, cas = self.mc.gets(name)
+        if value is None or self.serializer.decode(value) != token:
+            return
+        self.mc.cas(name, b"", cas, -1, noreply=False)
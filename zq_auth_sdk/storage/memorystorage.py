@@ -1,17 +1,149 @@
-from zq_auth_sdk.storage import SessionStorage
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from zq_auth_sdk.storage import SessionStorage, _ttl_of
 
 
 class MemoryStorage(SessionStorage):
-    def __init__(self):
-        self._data = {}
+    """
+    进程内存储
+
+    线程安全，支持 ttl 过期 (读取时惰性删除，并定期按过期堆批量清理)，
+    可设置最大条目数，超出时淘汰最久未使用的条目
+    """
+
+    def __init__(self, max_entries=None, sweep_interval=60):
+        """
+        :param max_entries: 最大条目数，None 为不限制
+        :param sweep_interval: 批量清理过期条目的最小间隔 (秒)
+        """
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+
+        # key -> (value, 过期的 monotonic 时间或 None)
+        self._data = OrderedDict()
+        # (过期时间, key) 小顶堆，可能包含已被覆盖或删除的过期项
+        self._expiry_heap = []
+        self._next_sweep = time.monotonic() + sweep_interval
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    @staticmethod
+    def _expires_at(ttl, now):
+        if not ttl:
+            return None
+        if isinstance(ttl, timedelta):
+            ttl = ttl.total_seconds()
+        return now + ttl
+
+    def _get(self, key, default, now):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= now:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def _set(self, key, value, ttl, now):
+        expires_at = self._expires_at(ttl, now)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        if expires_at is not None:
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+        if self.max_entries is not None:
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def _maybe_sweep(self, now):
+        if now >= self._next_sweep:
+            self._sweep(now)
+
+    def _sweep(self, now):
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._data.get(key)
+            # 只删除仍是该过期时间的条目，已覆盖的条目忽略
+            if entry is not None and entry[1] == expires_at:
+                del self._data[key]
+        if len(heap) > 2 * len(self._data) + 64:
+            # 清理被覆盖或删除条目残留在堆中的记录
+            self._expiry_heap = [
+                (entry[1], key)
+                for key, entry in self._data.items()
+                if entry[1] is not None
+            ]
+            heapq.heapify(self._expiry_heap)
+        self._next_sweep = now + self.sweep_interval
+
+    def sweep(self):
+        """
+        立即清理所有过期条目
+        """
+        with self._lock:
+            self._sweep(time.monotonic())
 
     def get(self, key, default=None):
-        return self._data.get(key, default)
+        with self._lock:
+            return self._get(key, default, time.monotonic())
 
     def set(self, key, value, ttl=None):
         if value is None:
             return
-        self._data[key] = value
+        now = time.monotonic()
+        with self._lock:
+            self._set(key, value, ttl, now)
+            self._maybe_sweep(now)
 
     def delete(self, key):
-        self._data.pop(key, None)
+        with self._lock:
+            self._data.pop(key, None)
+
+    def get_many(self, keys, default=None) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {key: self._get(key, default, now) for key in keys}
+
+    def set_many(self, mapping, ttl=None):
+        now = time.monotonic()
+        with self._lock:
+            for key, value in mapping.items():
+                if value is not None:
+                    self._set(key, value, _ttl_of(ttl, key), now)
+            self._maybe_sweep(now)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def update(self, key, func):
+        now = time.monotonic()
+        with self._lock:
+            value, ttl = func(self._get(key, None, now))
+            self._set(key, value, ttl, now)
+            return value
+
+    def add(self, key, value, ttl=None) -> bool:
+        if value is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if self._get(key, None, now) is not None:
+                return False
+            self._set(key, value, ttl, now)
+            return True
+
+    def release_lease(self, key, token):
+        with self._lock:
+            if self._get(key, None, time.monotonic()) == token:
+                self._data.pop(key, None)
@@ -1,15 +1,21 @@
-import json
-
-from zq_auth_sdk.storage import SessionStorage
-from zq_auth_sdk.utils import to_text
+from zq_auth_sdk.storage import SessionStorage, _ttl_of
+from zq_auth_sdk.storage.serializers import JSONSerializer, Serializer
 
 
 class RedisStorage(SessionStorage):
-    def __init__(self, redis, prefix="wechatpy"):
+    def __init__(
+        self, redis, prefix="wechatpy", serializer: Serializer | None = None
+    ):
+        """
+        :param redis: redis 客户端
+        :param prefix: key 前缀
+        :param serializer: 值序列化器，默认为标准库 json
+        """
         for method_name in ("get", "set", "delete"):
             assert hasattr(redis, method_name)
         self.redis = redis
         self.prefix = prefix
+        self.serializer = serializer or JSONSerializer()
 
     def key_name(self, key):
         return f"{self.prefix}:{key}"
@@ -19,15 +25,86 @@ class RedisStorage(SessionStorage):
         value = self.redis.get(key)
         if value is None:
             return default
-        return json.loads(to_text(value))
+        return self.serializer.decode(value)
 
     def set(self, key, value, ttl=None):
         if value is None:
             return
         key = self.key_name(key)
-        value = json.dumps(value)
+        value = self.serializer.encode(value)
         self.redis.set(key, value, ex=ttl)
 
     def delete(self, key):
         key = self.key_name(key)
         self.redis.delete(key)
+
+    def get_many(self, keys, default=None) -> dict:
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.redis.mget([self.key_name(key) for key in keys])
+        return {
+            key: default if value is None else self.serializer.decode(value)
+            for key, value in zip(keys, values)
+        }
+
+    def set_many(self, mapping, ttl=None):
+        with self.redis.pipeline() as pipe:
+            for key, value in mapping.items():
+                if value is None:
+                    continue
+                pipe.set(
+                    self.key_name(key),
+                    self.serializer.encode(value),
+                    ex=_ttl_of(ttl, key),
+                )
+            pipe.execute()
+
+    def delete_many(self, keys):
+        keys = [self.key_name(key) for key in keys]
+        if keys:
+            self.redis.delete(*keys)
+
+    def add(self, key, value, ttl=None) -> bool:
+        if value is None:
+            return False
+        key = self.key_name(key)
+        value = self.serializer.encode(value)
+        return bool(self.redis.set(key, value, ex=ttl, nx=True))
+
+    def update(self, key, func):
+        from redis.exceptions import WatchError
+
+        name = self.key_name(key)
+        with self.redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(name)
+                    old = pipe.get(name)
+                    value, ttl = func(
+                        None if old is None else self.serializer.decode(old)
+                    )
+                    pipe.multi()
+                    pipe.set(name, self.serializer.encode(value), ex=ttl)
+                    pipe.execute()
+                    return value
+                except WatchError:
+                    # 读取后被其他进程修改，重新读取
+                    continue
+
+    def release_lease(self, key, token):
+        from redis.exceptions import WatchError
+
+        key = self.key_name(key)
+        with self.redis.pipeline() as pipe:
+            try:
+                pipe.watch(key)
+                value = pipe.get(key)
+                if value is None or self.serializer.decode(value) != token:
+                    return
+                pipe.multi()
+                pipe.delete(key)
+                pipe.execute()
+            except WatchError:
+                # 租约已过期并被其他进程获取
+                pass
@@ -0,0 +1,113 @@
+"""
+    zq_auth_sdk.storage.serializers
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    存储后端的值序列化
+
+    JSON 类格式 (json / orjson) 直接写入 JSON 文本，与旧版本写入的值兼容；
+    二进制格式写入时带有 b"\\x00" + 1 字节格式标记。
+    读取时根据标记选择解码器，因此切换序列化器无需清空存储。
+"""
+import json
+
+FORMAT_MARKER = b"\x00"
+
+
+class Serializer:
+    """序列化器基类"""
+
+    #: 二进制格式标记，JSON 类格式为 None
+    tag: bytes | None = None
+
+    def dumps(self, value) -> bytes | str:
+        raise NotImplementedError()
+
+    def loads(self, data: bytes):
+        raise NotImplementedError()
+
+    def encode(self, value) -> bytes | str:
+        """
+        序列化并添加格式标记
+        """
+        data = self.dumps(value)
+        if self.tag is None:
+            return data
+        return FORMAT_MARKER + self.tag + data
+
+    def decode(self, data: bytes | str):
+        """
+        根据格式标记反序列化
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        if data[:1] == FORMAT_MARKER:
+            tag = data[1:2]
+            serializer = self if tag == self.tag else get_serializer(tag)
+            return serializer.loads(data[2:])
+        serializer = self if self.tag is None else _default_serializer
+        return serializer.loads(data)
+
+
+class JSONSerializer(Serializer):
+    """标准库 json"""
+
+    def dumps(self, value) -> str:
+        return json.dumps(value)
+
+    def loads(self, data: bytes):
+        return json.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    """orjson，需要安装 orjson"""
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def dumps(self, value) -> bytes:
+        return self._orjson.dumps(value)
+
+    def loads(self, data: bytes):
+        return self._orjson.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    """msgpack，需要安装 msgpack"""
+
+    tag = b"m"
+
+    def __init__(self):
+        import msgpack
+
+        self._msgpack = msgpack
+
+    def dumps(self, value) -> bytes:
+        return self._msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes):
+        return self._msgpack.unpackb(data, raw=False)
+
+
+_default_serializer = JSONSerializer()
+
+_serializer_classes = {
+    MsgpackSerializer.tag: MsgpackSerializer,
+}
+_serializers = {}
+
+
+def get_serializer(tag: bytes) -> Serializer:
+    """
+    根据格式标记获取序列化器
+    :raise ValueError: 未知格式
+    """
+    serializer = _serializers.get(tag)
+    if serializer is None:
+        try:
+            serializer_class = _serializer_classes[tag]
+        except KeyError:
+            raise ValueError(f"Unknown serialization format: {tag!r}")
+        serializer = _serializers[tag] = serializer_class()
+    return serializer
@@ -0,0 +1,7 @@
+"""
+    zq_auth_sdk.testing
+    ~~~~~~~~~~~~~~~~~~~
+
+    测试工具：本地 ZqAuth 模拟服务器
+"""
+from zq_auth_sdk.testing.server import ZqAuthStandInServer  # noqa
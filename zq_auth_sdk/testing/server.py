@@ -0,0 +1,468 @@
+"""
+    zq_auth_sdk.testing.server
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    本地 ZqAuth 模拟服务器，用于压测与集成测试，不依赖网络。
+    实现 /auth/apps/、/auth/refresh/、/sso/union-id/、/users/{id}/、/apps/{id}/，
+    响应结构与线上一致 (code / msg / detail / data)，
+    支持延迟分布、token 有效期、限流 (A0512) 与错误注入。
+
+    python -m zq_auth_sdk.testing.server --port 8000 --latency lognormal:0.05,0.5
+"""
+import argparse
+import json
+import math
+import random
+import re
+import secrets
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+from zq_auth_sdk.entities.response import ZqAuthResponseType
+
+Latency = Callable[[], float]
+
+
+# region latency
+def constant(seconds: float) -> Latency:
+    """固定延迟"""
+    return lambda: seconds
+
+
+def uniform(low: float, high: float) -> Latency:
+    """均匀分布延迟"""
+    return lambda: random.uniform(low, high)
+
+
+def exponential(mean: float) -> Latency:
+    """指数分布延迟"""
+    return lambda: random.expovariate(1 / mean) if mean > 0 else 0.0
+
+
+def lognormal(median: float, sigma: float) -> Latency:
+    """对数正态分布延迟 (长尾)"""
+    mu = math.log(median)
+    return lambda: random.lognormvariate(mu, sigma)
+
+
+_LATENCY_FACTORIES = {
+    "constant": constant,
+    "uniform": uniform,
+    "exponential": exponential,
+    "lognormal": lognormal,
+}
+
+
+def parse_latency(spec: str) -> Latency:
+    """
+    解析延迟分布，如 `constant:0.01`、`uniform:0.01,0.05`、`lognormal:0.05,0.5`
+    """
+    name, _, args = spec.partition(":")
+    factory = _LATENCY_FACTORIES.get(name)
+    if factory is None:
+        raise ValueError(f"Unknown latency distribution: {name}")
+    return factory(*(float(arg) for arg in args.split(",") if arg))
+
+
+# endregion
+
+
+def _iso(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class _ApiError(Exception):
+    def __init__(
+        self, response_type: ZqAuthResponseType, headers: dict | None = None
+    ):
+        self.response_type = response_type
+        self.headers = headers or {}
+
+
+class ZqAuthStandInServer:
+    """
+    本地 ZqAuth 模拟服务器
+
+    在后台线程运行 ThreadingHTTPServer，支持 HTTP/1.1 keep-alive。
+
+        with ZqAuthStandInServer(apps={"key": "secret"}) as server:
+            client = ZqAuthClient("key", "secret", api_base_url=server.url)
+    """
+
+    _USER_PATH = re.compile(r"^/users/([^/]+)/$")
+    _APP_PATH = re.compile(r"^/apps/(\d+)/$")
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        apps: dict[str, str] | None = None,
+        users: dict[str, dict] | None = None,
+        access_lifetime: float = 24 * 60 * 60,
+        refresh_lifetime: float = 10 * 24 * 60 * 60,
+        latency: Latency | None = None,
+        rate_limit: float | None = None,
+        burst: float | None = None,
+        error_rate: float = 0.0,
+        error_code: ZqAuthResponseType = ZqAuthResponseType.ServerError,
+        reset_rate: float = 0.0,
+    ):
+        """
+        :param host: 监听地址
+        :param port: 监听端口，0 为随机端口
+        :param apps: app_key -> app_secret，默认为 {"123": "123"}
+        :param users: union id -> 用户信息，默认为任意合法 union id 生成用户
+        :param access_lifetime: access token 有效期 (秒)
+        :param refresh_lifetime: refresh token 有效期 (秒)
+        :param latency: 延迟分布，返回每个请求的延迟 (秒)
+        :param rate_limit: 限流速率 (请求/秒)，超出返回 A0512
+        :param burst: 限流令牌桶容量，默认与 rate_limit 相同
+        :param error_rate: 注入错误响应的概率
+        :param error_code: 注入的错误类型，默认为 B0000
+        :param reset_rate: 不返回响应直接断开连接的概率
+        """
+        self.apps = apps if apps is not None else {"123": "123"}
+        self.users = users
+        self.access_lifetime = access_lifetime
+        self.refresh_lifetime = refresh_lifetime
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.burst = burst if burst is not None else (rate_limit or 0)
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.reset_rate = reset_rate
+
+        self._lock = threading.Lock()
+        self._app_ids = {key: i + 1 for i, key in enumerate(self.apps)}
+        self._access_tokens: dict[str, tuple[str, float]] = {}
+        self._refresh_tokens: dict[str, tuple[str, float]] = {}
+        self._used_codes: set[str] = set()
+        self._tokens = self.burst
+        self._tokens_at = time.monotonic()
+        self.stats: Counter = Counter()
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    # region lifecycle
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ZqAuthStandInServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever,
+                kwargs={"poll_interval": 0.05},  # 加快 stop
+                name="zq-auth-stand-in-server",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # endregion
+
+    # region state
+    def _count(self, key: str):
+        """请求处理线程并发运行，统计需要加锁"""
+        with self._lock:
+            self.stats[key] += 1
+
+    def expire_access_tokens(self):
+        """使所有 access token 立即过期"""
+        with self._lock:
+            self._access_tokens = {
+                token: (app_key, 0.0)
+                for token, (app_key, _) in self._access_tokens.items()
+            }
+
+    def _issue_access(self, app_key: str) -> dict:
+        token = secrets.token_urlsafe(24)
+        expire_at = time.time() + self.access_lifetime
+        self._access_tokens[token] = (app_key, expire_at)
+        return {
+            "access": token,
+            "expire_time": _iso(
+                datetime.now(timezone.utc)
+                + timedelta(seconds=self.access_lifetime)
+            ),
+        }
+
+    def _take_token(self) -> float | None:
+        """
+        限流令牌桶，返回需要等待的时间，未限流时返回 None
+        """
+        if not self.rate_limit:
+            return None
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._tokens_at) * self.rate_limit
+        )
+        self._tokens_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return None
+        return (1 - self._tokens) / self.rate_limit
+
+    # endregion
+
+    # region endpoints
+    def _authenticate(self, headers) -> str:
+        authorization = headers.get("Authorization", "")
+        token = authorization[len("Bearer ") :]
+        entry = self._access_tokens.get(token)
+        if entry is None or entry[1] <= time.time():
+            raise _ApiError(ZqAuthResponseType.TokenInvalid)
+        return entry[0]
+
+    def _login(self, data: dict) -> dict:
+        app_key = data.get("app_key")
+        if app_key not in self.apps or self.apps[app_key] != data.get(
+            "app_secret"
+        ):
+            raise _ApiError(ZqAuthResponseType.LoginFailed)
+        refresh = secrets.token_urlsafe(24)
+        self._refresh_tokens[refresh] = (
+            app_key,
+            time.time() + self.refresh_lifetime,
+        )
+        return {
+            **self._app_info(app_key),
+            **self._issue_access(app_key),
+            "refresh": refresh,
+        }
+
+    def _refresh(self, data: dict) -> dict:
+        entry = self._refresh_tokens.get(data.get("refresh"))
+        if entry is None or entry[1] <= time.time():
+            raise _ApiError(ZqAuthResponseType.RefreshTokenInvalid)
+        return self._issue_access(entry[0])
+
+    def _app_info(self, app_key: str) -> dict:
+        app_id = self._app_ids[app_key]
+        return {
+            "id": app_id,
+            "username": f"app_{app_id}",
+            "name": f"测试项目 {app_id}",
+        }
+
+    def _sso(self, data: dict) -> dict:
+        code = data.get("code")
+        # code 只能使用一次
+        if not code or code in self._used_codes:
+            raise _ApiError(ZqAuthResponseType.ResourceNotFound)
+        self._used_codes.add(code)
+        return {"union_id": uuid.uuid5(uuid.NAMESPACE_OID, code).hex}
+
+    def _user_info(self, union_id: str, detail: bool) -> dict:
+        if self.users is not None:
+            user = self.users.get(union_id)
+        else:
+            try:
+                seed = uuid.UUID(union_id).int
+            except ValueError:
+                user = None
+            else:
+                user = {
+                    "name": f"用户{seed % 10000:04d}",
+                    "student_id": f"{2020300000000 + seed % 10**9}",
+                    "phone": f"183{seed % 10**8:08d}",
+                    "is_certified": True,
+                    "certify_time": "2023-03-04T20:42:00+08:00",
+                    "update_time": "2023-03-06T10:49:07.976501+08:00",
+                }
+        if user is None:
+            raise _ApiError(ZqAuthResponseType.ResourceNotFound)
+        if not detail:
+            return {"certify_time": user.get("certify_time")}
+        return dict(user)
+
+    def dispatch(
+        self, method: str, path: str, query: dict, data: dict, headers
+    ):
+        """
+        处理请求
+        :return: 响应 data
+        :raise _ApiError: 错误响应
+        """
+        with self._lock:
+            wait = self._take_token()
+            if wait is not None:
+                raise _ApiError(
+                    ZqAuthResponseType.APIThrottled,
+                    {"Retry-After": str(math.ceil(wait))},
+                )
+            if self.error_rate and random.random() < self.error_rate:
+                raise _ApiError(self.error_code)
+
+            if method == "POST" and path == "/auth/apps/":
+                return self._login(data)
+            if method == "POST" and path == "/auth/refresh/":
+                return self._refresh(data)
+
+            app_key = self._authenticate(headers)
+            if method == "GET" and path == "/":
+                return None
+            if method == "POST" and path == "/sso/union-id/":
+                return self._sso(data)
+            if method == "GET":
+                match = self._USER_PATH.match(path)
+                if match:
+                    detail = query.get("detail", "True").lower() != "false"
+                    return self._user_info(match.group(1), detail)
+                match = self._APP_PATH.match(path)
+                if match:
+                    if int(match.group(1)) != self._app_ids[app_key]:
+                        raise _ApiError(ZqAuthResponseType.PermissionDenied)
+                    return {**self._app_info(app_key), "is_active": True}
+            raise _ApiError(ZqAuthResponseType.APINotFound)
+
+    # endregion
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # 支持 keep-alive
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def _read_data(self) -> dict:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode() if length else ""
+                if not body:
+                    return {}
+                if "json" in self.headers.get("Content-Type", ""):
+                    return json.loads(body)
+                return {k: v[0] for k, v in parse_qs(body).items()}
+
+            def _handle(self, method: str):
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                data = self._read_data()
+
+                if server.latency is not None:
+                    time.sleep(max(0.0, server.latency()))
+                if server.reset_rate and random.random() < server.reset_rate:
+                    server._count("reset")
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+
+                headers = {}
+                try:
+                    result = server.dispatch(
+                        method, parts.path, query, data, self.headers
+                    )
+                    response_type = ZqAuthResponseType.Success
+                except _ApiError as e:
+                    response_type = e.response_type
+                    headers = e.headers
+                    result = {
+                        "eid": None,
+                        "time": _iso(datetime.now()),
+                        "details": None,
+                    }
+
+                server._count(response_type.code)
+                detail = response_type.detail
+                self._send(
+                    response_type.status_code,
+                    {
+                        "code": response_type.code,
+                        "detail": detail,
+                        "msg": detail,
+                        "data": result,
+                    },
+                    headers,
+                )
+
+            def _send(self, status: int, payload: dict, headers: dict):
+                body = json.dumps(payload, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="本地 ZqAuth 模拟服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--app",
+        action="append",
+        metavar="KEY:SECRET",
+        help="app 凭证，可多次指定，默认为 123:123",
+    )
+    parser.add_argument(
+        "--latency", type=parse_latency, help="延迟分布，如 lognormal:0.05,0.5"
+    )
+    parser.add_argument("--access-lifetime", type=float, default=24 * 60 * 60)
+    parser.add_argument(
+        "--refresh-lifetime", type=float, default=10 * 24 * 60 * 60
+    )
+    parser.add_argument("--rate-limit", type=float, help="限流速率 (请求/秒)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--reset-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    apps = None
+    if args.app:
+        apps = dict(app.split(":", 1) for app in args.app)
+
+    server = ZqAuthStandInServer(
+        host=args.host,
+        port=args.port,
+        apps=apps,
+        access_lifetime=args.access_lifetime,
+        refresh_lifetime=args.refresh_lifetime,
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        error_rate=args.error_rate,
+        reset_rate=args.reset_rate,
+    )
+    print(f"ZqAuth stand-in server listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
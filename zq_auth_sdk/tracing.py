@@ -0,0 +1,81 @@
+"""
+    zq_auth_sdk.tracing
+    ~~~~~~~~~~~~~~~~~~~
+
+    链路追踪：为请求、登录、刷新与重试创建 span，并向请求头注入 trace context。
+    未设置 tracer 时客户端不创建任何 span。
+"""
+from contextlib import contextmanager
+from typing import ContextManager, Iterator
+
+
+class Span:
+    """
+    span 接口
+
+    OpenTelemetry 的 Span 已实现以下方法，可直接使用
+    """
+
+    def set_attribute(self, key: str, value):
+        pass
+
+    def record_exception(self, exception: BaseException):
+        pass
+
+
+class Tracer:
+    """
+    tracer 接口
+
+    start_span 返回的上下文管理器负责计时、维护父子关系，
+    并记录上下文中抛出的异常。
+    """
+
+    def start_span(
+        self, name: str, attributes: dict | None = None
+    ) -> ContextManager[Span]:
+        """
+        创建 span，在上下文内创建的 span 为其子 span
+        :param name: span 名称
+        :param attributes: 初始属性
+        """
+        raise NotImplementedError()
+
+    def inject(self, headers: dict):
+        """
+        向请求头注入 trace context (如 W3C traceparent)
+        :param headers: 请求头，原地修改
+        """
+        pass
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    OpenTelemetry 适配，需要安装 opentelemetry-api
+
+    span 使用 CLIENT 类型并设为当前 span，trace context 使用全局 propagator 注入
+    """
+
+    def __init__(self, tracer=None):
+        """
+        :param tracer: opentelemetry Tracer，默认使用全局 TracerProvider 创建
+        """
+        from opentelemetry import propagate, trace
+
+        self._propagate = propagate
+        self._kind = trace.SpanKind.CLIENT
+        self._tracer = (
+            tracer if tracer is not None else trace.get_tracer("zq_auth_sdk")
+        )
+
+    @contextmanager
+    def start_span(
+        self, name: str, attributes: dict | None = None
+    ) -> Iterator[Span]:
+        with self._tracer.start_as_current_span(
+            name, kind=self._kind, attributes=attributes
+        ) as span:
+            yield span
+
+    def inject(self, headers: dict):
+        self._propagate.inject(headers)
@@ -11,6 +11,7 @@ import hashlib
 import hmac
 import logging
 import random
+import re
 import string
 
 logger = logging.getLogger(__name__)
@@ -84,6 +85,22 @@ def check_request_signature(session_key, raw_data, client_signature):
         raise InvalidSignatureException()
 
 
+# 路径中的 id 类片段 (数字 id、union id)
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,})$")
+
+
+def path_template(path):
+    """将路径中的 id 类片段替换为 `:id`，同一接口的不同资源归为一类
+
+    :param path: url 路径，如 ``/users/123/``
+    :return: 路径模板，如 ``/users/:id/``
+    """
+    return "/".join(
+        ":id" if _ID_SEGMENT.match(segment) else segment
+        for segment in path.split("/")
+    )
+
+
 def to_text(value, encoding="utf-8"):
     """Convert value to unicode, default encoding is utf-8
 